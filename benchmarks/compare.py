@@ -0,0 +1,76 @@
+"""
+Compare two benchmark result files written by run.py.
+
+Usage:
+    python benchmarks/compare.py baseline.json candidate.json --threshold 0.1
+
+Exits with status 1 when any measurement got slower, or allocated more, by more
+than the threshold, so it can gate a CI job.
+"""
+import argparse
+import json
+import sys
+
+
+def compare(baseline, candidate, threshold, min_seconds=0.005):
+    """
+    Find measurements that regressed between two reports.
+
+    :param baseline: report dict of the reference run
+    :param candidate: report dict of the run to check
+    :param threshold: relative increase tolerated, e.g. 0.1 for 10%
+    :param min_seconds: wall times below this in both runs are treated as noise
+    :return: list of (table, measurement, metric, old, new) tuples for every regression
+    """
+    regressions = []
+    for table, candidate_table in candidate["tables"].items():
+        baseline_table = baseline["tables"].get(table)
+        if baseline_table is None:
+            continue
+        for measurement, new in candidate_table["results"].items():
+            old = baseline_table["results"].get(measurement)
+            if old is None:
+                continue
+            for metric in ("wall_seconds", "peak_bytes"):
+                if metric == "wall_seconds" and max(old[metric], new[metric]) < min_seconds:
+                    continue
+                if old[metric] > 0 and new[metric] > old[metric] * (1 + threshold):
+                    regressions.append((table, measurement, metric, old[metric], new[metric]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two prossa benchmark result files.")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="relative slowdown or memory growth tolerated (default: 0.1)")
+    parser.add_argument("--min-seconds", type=float, default=0.005,
+                        help="ignore timings shorter than this in both runs (default: 0.005)")
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.candidate) as file:
+        candidate = json.load(file)
+
+    for table, candidate_table in candidate["tables"].items():
+        baseline_table = baseline["tables"].get(table, {"results": {}})
+        print(f"{table}:")
+        for measurement, new in candidate_table["results"].items():
+            old = baseline_table["results"].get(measurement)
+            if old is None:
+                print(f"  {measurement:<24} new")
+                continue
+            ratio = new["wall_seconds"] / old["wall_seconds"] if old["wall_seconds"] else float("nan")
+            print(f"  {measurement:<24} {old['wall_seconds'] * 1000:9.1f} -> {new['wall_seconds'] * 1000:9.1f} ms "
+                  f"({ratio:5.2f}x)  {old['peak_bytes'] / 2 ** 20:8.1f} -> {new['peak_bytes'] / 2 ** 20:8.1f} MiB")
+
+    regressions = compare(baseline, candidate, args.threshold, args.min_seconds)
+    for table, measurement, metric, old, new in regressions:
+        print(f"REGRESSION {table}/{measurement} {metric}: {old:.4g} -> {new:.4g}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Synthetic table generators for the analyzer benchmarks.
+
+Every generator takes a row/column scale and a seed and returns a pandas DataFrame,
+so the same table can be rebuilt on any machine without downloading data.
+"""
+import numpy as np
+import pandas as pd
+
+
+def tall_narrow(rows=1_000_000, columns=8, seed=0):
+    """
+    Many rows, few numeric columns with a sprinkling of outliers.
+    """
+    rng = np.random.default_rng(seed)
+    data = {f"num{i}": rng.normal(size=rows) for i in range(columns)}
+    data["num0"][rng.integers(0, rows, rows // 1000)] *= 50
+    return pd.DataFrame(data)
+
+
+def short_wide(rows=2_000, columns=2_000, seed=0):
+    """
+    Few rows, thousands of mixed numeric and low-cardinality string columns.
+    """
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i in range(columns):
+        if i % 4 == 3:
+            data[f"cat{i}"] = rng.choice(["a", "b", "c", "d"], rows)
+        else:
+            data[f"num{i}"] = rng.normal(size=rows)
+    return pd.DataFrame(data)
+
+
+def high_cardinality(rows=500_000, columns=4, seed=0):
+    """
+    String columns that are nearly unique, such as IDs and URLs.
+    """
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i in range(columns):
+        ids = rng.integers(0, rows * 10, rows)
+        data[f"id{i}"] = pd.Series(ids).map(lambda value: f"https://example.com/item/{value}")
+    return pd.DataFrame(data)
+
+
+def heavy_null(rows=1_000_000, columns=16, null_fraction=0.6, seed=0):
+    """
+    Numeric and string columns where most values are missing.
+    """
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i in range(columns):
+        mask = rng.random(rows) < null_fraction
+        if i % 2:
+            data[f"cat{i}"] = pd.Series(rng.choice(["x", "y", "z"], rows)).mask(mask)
+        else:
+            data[f"num{i}"] = np.where(mask, np.nan, rng.normal(size=rows))
+    return pd.DataFrame(data)
+
+
+def mixed_dtypes(rows=500_000, seed=0):
+    """
+    One column of each dtype the checks distinguish, including constant columns.
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "int": rng.integers(0, 1_000, rows),
+        "float": rng.standard_cauchy(rows),
+        "nullable_int": pd.array(np.where(rng.random(rows) < 0.1, None, rng.integers(0, 9, rows)), dtype="Int64"),
+        "bool": rng.random(rows) < 0.5,
+        "datetime": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 10 ** 6, rows), unit="s"),
+        "timedelta": pd.to_timedelta(rng.integers(0, 10 ** 6, rows), unit="s"),
+        "category": pd.Categorical(rng.choice(["low", "mid", "high"], rows)),
+        "object": rng.choice([f"label{i}" for i in range(50)], rows),
+        "constant": np.zeros(rows),
+        "constant_text": ["same"] * rows,
+    })
+
+
+GENERATORS = {
+    "tall_narrow": tall_narrow,
+    "short_wide": short_wide,
+    "high_cardinality": high_cardinality,
+    "heavy_null": heavy_null,
+    "mixed_dtypes": mixed_dtypes,
+}
+
+BASE_ROWS = {
+    "tall_narrow": 1_000_000,
+    "high_cardinality": 500_000,
+    "heavy_null": 1_000_000,
+    "mixed_dtypes": 500_000,
+}
+
+SCALES = {
+    "small": 0.01,
+    "medium": 0.1,
+    "large": 1.0,
+}
+
+
+def generate(name, scale="medium", seed=0):
+    """
+    Build a benchmark table, scaling its row count (and width for short_wide).
+
+    :param name: key of GENERATORS
+    :param scale: key of SCALES
+    :param seed: random seed
+    :return: pandas DataFrame
+    """
+    factor = SCALES[scale]
+    if name == "short_wide":
+        side = max(10, int(2_000 * factor ** 0.5))
+        return short_wide(rows=side, columns=side, seed=seed)
+    return GENERATORS[name](rows=max(100, int(BASE_ROWS[name] * factor)), seed=seed)
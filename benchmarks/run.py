@@ -0,0 +1,142 @@
+"""
+Benchmark DatasetAnalyzer checks on synthetic tables.
+
+Records wall time and peak traced memory for profiling, for each check on a
+warm profile, and for a cold end-to-end ``analyze()``, and writes the results
+to a JSON file that compare.py can diff against another run.
+
+Usage:
+    python benchmarks/run.py --scale small
+    python benchmarks/run.py --tables tall_narrow heavy_null --repeat 5 --output results.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import numpy as np
+import pandas as pd
+from generators import GENERATORS, SCALES, generate
+from prossa.analyzer import DatasetAnalyzer
+
+CHECKS = [
+    "check_missing_values",
+    "check_outliers",
+    "check_data_types",
+    "check_scaling_encoding",
+    "check_categorical_data",
+    "check_constant_columns",
+    "check_imputation",
+    "check_correlations",
+]
+
+
+def measure(func, repeat):
+    """
+    Run a callable several times and keep the fastest wall time and the largest peak allocation.
+
+    :param func: zero-argument callable; called once more per repeat with tracing enabled
+    :param repeat: number of timed runs
+    :return: dict with wall_seconds and peak_bytes
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"wall_seconds": best, "peak_bytes": peak}
+
+
+def benchmark_table(dataset, repeat, analyzer_kwargs):
+    """
+    Benchmark profiling, every check and a full analysis on one table.
+
+    :param dataset: pandas DataFrame to analyze
+    :param repeat: number of timed runs per measurement
+    :param analyzer_kwargs: keyword arguments passed to DatasetAnalyzer
+    :return: dict mapping measurement name to its timings
+    """
+    results = {}
+    results["profile"] = measure(lambda: DatasetAnalyzer(dataset, **analyzer_kwargs).profile, repeat)
+
+    warm = DatasetAnalyzer(dataset, **analyzer_kwargs)
+    warm.profile
+    for check in CHECKS:
+        results[check] = measure(getattr(warm, check), repeat)
+
+    def analyze():
+        DatasetAnalyzer(dataset, **analyzer_kwargs).analyze()
+
+    results["analyze"] = measure(analyze, repeat)
+    return results
+
+
+def environment():
+    """
+    Describe the software and hardware the benchmark ran on.
+    """
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                  cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        "revision": revision,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark prossa checks on synthetic tables.")
+    parser.add_argument("--tables", nargs="+", choices=sorted(GENERATORS), default=sorted(GENERATORS))
+    parser.add_argument("--scale", choices=sorted(SCALES), default="medium")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--distinct-error", type=float, default=None)
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--output", default=None,
+                        help="results file (default: benchmarks/results/<revision>-<scale>.json)")
+    args = parser.parse_args(argv)
+
+    analyzer_kwargs = {"distinct_error": args.distinct_error, "n_jobs": args.jobs}
+    report = {"environment": environment(), "scale": args.scale, "settings": analyzer_kwargs, "tables": {}}
+    for name in args.tables:
+        dataset = generate(name, args.scale, seed=args.seed)
+        print(f"{name}: {dataset.shape[0]} rows x {dataset.shape[1]} columns", flush=True)
+        results = benchmark_table(dataset, args.repeat, analyzer_kwargs)
+        report["tables"][name] = {"shape": list(dataset.shape), "results": results}
+        for measurement, timing in results.items():
+            print(f"  {measurement:<24} {timing['wall_seconds'] * 1000:10.1f} ms {timing['peak_bytes'] / 2 ** 20:10.1f} MiB")
+
+    output = args.output
+    if output is None:
+        directory = Path(__file__).resolve().parent / "results"
+        directory.mkdir(exist_ok=True)
+        output = directory / f"{report['environment']['revision'] or 'local'}-{args.scale}.json"
+    with open(output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark how long prossa takes to start.
+
+Times fresh interpreters for ``import prossa``, ``prossa --help`` and the analysis of
+a small CSV file, and counts the modules each one loads, so that a heavy import
+sneaking back into the package import or the command line is noticed.
+
+Usage:
+    python benchmarks/startup.py
+    python benchmarks/startup.py --repeat 20 --budget 0.5 --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+# Printed by every measured command, so the number of loaded modules can be read back.
+REPORT = "import sys; print(len(sys.modules), 'pandas' in sys.modules)"
+
+COMMANDS = {
+    "python": "pass",
+    "import prossa": "import prossa",
+    "prossa --help": "from prossa.__main__ import main\ntry:\n    main(['--help'])\nexcept SystemExit:\n    pass",
+    "import prossa.analyzer": "import prossa.analyzer",
+    "prossa small.csv": "from prossa.__main__ import main\nmain([{path!r}])",
+}
+
+
+def write_small_csv(directory, rows=100):
+    """
+    Write a small mixed-type CSV file to analyze.
+
+    :param directory: directory to write the file to
+    :param rows: number of rows
+    :return: path of the file
+    """
+    path = os.path.join(directory, "small.csv")
+    with open(path, "w") as file:
+        file.write("id,value,category,flag\n")
+        for row in range(rows):
+            file.write(f"{row},{(row * 37) % 101 / 7:.3f},{'abc'[row % 3]},{row % 2 == 0}\n")
+    return path
+
+
+def run(code, repeat):
+    """
+    Run code in fresh interpreters and time each run.
+
+    :param code: Python source executed with ``python -c``
+    :param repeat: number of timed runs
+    :return: dict with the fastest and median wall time, the number of loaded modules and whether pandas was loaded
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(SRC), os.environ.get("PYTHONPATH")])))
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", f"{code}\n{REPORT}"], capture_output=True, text=True, env=env,
+                                check=True)
+        times.append(time.perf_counter() - start)
+    modules, pandas = result.stdout.split()[-2:]
+    return {"best_seconds": min(times), "median_seconds": statistics.median(times), "modules": int(modules),
+            "pandas": pandas == "True"}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the startup time of prossa.")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--budget", type=float, default=None, metavar="SECONDS",
+                        help="exit with status 1 if 'import prossa' or 'prossa --help' takes longer than this "
+                             "beyond a bare interpreter")
+    parser.add_argument("--output", default=None, help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_small_csv(directory)
+        for name, code in COMMANDS.items():
+            results[name] = run(code.format(path=path), args.repeat)
+            timing = results[name]
+            print(f"{name:<24} {timing['best_seconds'] * 1000:8.1f} ms best {timing['median_seconds'] * 1000:8.1f} ms median "
+                  f"{timing['modules']:6d} modules{'  (pandas loaded)' if timing['pandas'] else ''}", flush=True)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"python": sys.version, "repeat": args.repeat, "results": results}, file, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.budget is not None:
+        baseline = results["python"]["best_seconds"]
+        slow = [name for name in ("import prossa", "prossa --help")
+                if results[name]["best_seconds"] - baseline > args.budget]
+        if slow:
+            print(f"Over the {args.budget} s budget: {', '.join(slow)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,45 @@
-from .analyzer import DatasetAnalyzer, analyze_dataset
-from .utils import (
-    check_missing_values,
-    check_outliers,
-    check_data_types,
-    check_scaling_encoding,
-    check_categorical_data,
-    check_constant_columns,
-    check_imputation,
-)
+import importlib
 
-__all__ = [
-    "DatasetAnalyzer",
-    "analyze_dataset",
-    "check_missing_values",
-    "check_outliers",
-    "check_data_types",
-    "check_scaling_encoding",
-    "check_categorical_data",
-    "check_constant_columns",
-    "check_imputation",
-]
\ No newline at end of file
+# Public names and the submodules defining them. The submodules import pandas and
+# numpy, so they are only loaded when one of their names is first used; this keeps
+# ``import prossa`` and ``prossa --help`` fast.
+_EXPORTS = {
+    "DatasetAnalyzer": "analyzer",
+    "analyze_dataset": "analyzer",
+    "ChunkedDatasetAnalyzer": "streaming",
+    "analyze_csv": "streaming",
+    "ColumnarDatasetAnalyzer": "columnar",
+    "analyze_columnar": "columnar",
+    "PartitionedDatasetAnalyzer": "partitions",
+    "analyze_partitions": "partitions",
+    "EngineDatasetAnalyzer": "engines",
+    "analyze_engine": "engines",
+    "AnalysisPool": "aio",
+    "analyze_dataset_async": "aio",
+    "DatasetSnapshot": "drift",
+    "compare_snapshots": "drift",
+    "Instrumentation": "instrument",
+    "register_check": "analyzer",
+    "check_missing_values": "utils",
+    "check_outliers": "utils",
+    "check_data_types": "utils",
+    "check_scaling_encoding": "utils",
+    "check_categorical_data": "utils",
+    "check_constant_columns": "utils",
+    "check_imputation": "utils",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
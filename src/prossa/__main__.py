@@ -1,19 +1,176 @@
+import argparse
 import sys
-import pandas as pd
-from .analyzer import analyze_dataset
 
-def main():
-    if len(sys.argv) != 2:
-        print("Usage: python -m prossa <path_to_csv>")
+def compare(argv):
+    parser = argparse.ArgumentParser(prog="prossa compare",
+                                     description="Compare two versions of a dataset from their snapshots.")
+    parser.add_argument("baseline", help="snapshot (.json) written with --snapshot, or a data file, directory or "
+                                         "glob pattern to summarize first")
+    parser.add_argument("current", help="snapshot or data path of the version to compare with the baseline")
+    parser.add_argument("--psi-threshold", type=float, default=None, metavar="PSI",
+                        help="population stability index above which a column drifted (default: 0.2)")
+    parser.add_argument("--ks-threshold", type=float, default=None, metavar="D",
+                        help="Kolmogorov-Smirnov statistic above which a numeric column drifted (default: 0.1)")
+    parser.add_argument("--output", default=None, metavar="PATH", help="also write all drift metrics to this JSON file")
+    args = parser.parse_args(argv)
+
+    from .analyzer import DatasetAnalyzer
+    from .drift import PSI_THRESHOLD, KS_THRESHOLD, DatasetSnapshot, compare_snapshots
+    from .findings import render, to_json
+
+    try:
+        snapshots = [
+            DatasetSnapshot.load(path) if path.lower().endswith('.json') else DatasetAnalyzer.from_file(path).snapshot()
+            for path in (args.baseline, args.current)
+        ]
+        findings = compare_snapshots(*snapshots,
+                                     psi_threshold=PSI_THRESHOLD if args.psi_threshold is None else args.psi_threshold,
+                                     ks_threshold=KS_THRESHOLD if args.ks_threshold is None else args.ks_threshold)
+        print("\nDRIFT:")
+        for item in render('Drift', findings):
+            print(f"- {item}")
+        if args.output:
+            to_json({'Drift': findings}, args.output)
+    except Exception as e:
+        print(f"Error: {e}")
         sys.exit(1)
 
-    csv_path = sys.argv[1]
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv[:1] == ["compare"]:
+        return compare(argv[1:])
+    parser = argparse.ArgumentParser(prog="prossa", description="Check which preprocessing techniques apply to a dataset.",
+                                     epilog="Run 'prossa compare --help' to compare two versions of a dataset.")
+    parser.add_argument("csv_path", metavar="path",
+                        help="path to the CSV, Parquet (.parquet) or Arrow IPC/Feather (.arrow, .feather) file to analyze, "
+                             "or a directory or quoted glob pattern of such files")
+    parser.add_argument("--columns", default=None, metavar="A,B,...",
+                        help="analyze only these comma-separated columns; other Parquet/Arrow columns are never read")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="stream the file in chunks of this many rows instead of loading it whole")
+    parser.add_argument("--distinct-error", type=float, default=None,
+                        help="count distinct categories approximately within this relative error (default: exact, "
+                             "or 0.01 when streaming)")
+    parser.add_argument("--sample", type=int, default=None, metavar="N",
+                        help="analyze a random sample of N rows, streaming the file instead of loading it")
+    parser.add_argument("--stratify", default=None, metavar="COLUMN", help="stratify the sample on this column")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for sampling")
+    parser.add_argument("--jobs", type=int, default=1, metavar="N",
+                        help="number of workers the columns are split across (-1 for all cores)")
+    parser.add_argument("--backend", choices=["thread", "process"], default="thread",
+                        help="worker pool used with --jobs")
+    parser.add_argument("--cache", default=None, metavar="DIR",
+                        help="reuse statistics of unchanged columns from this cache directory across runs")
+    parser.add_argument("--follow", action="store_true",
+                        help="keep reading rows appended to the file and re-print the recommendations after each batch")
+    parser.add_argument("--poll-interval", type=float, default=1.0, metavar="SECONDS",
+                        help="how often to check for appended rows with --follow")
+    parser.add_argument("--outliers", choices=["zscore", "iqr", "mad", "isolation"], default="zscore",
+                        help="outlier detection method (default: zscore)")
+    parser.add_argument("--correlation", choices=["pearson", "spearman"], default="pearson",
+                        help="correlation of numeric columns used to find redundant features (default: pearson)")
+    parser.add_argument("--partitions", action="store_true",
+                        help="with a directory or glob, also print per-partition null counts, dtypes and outliers")
+    parser.add_argument("--engine", choices=["polars", "duckdb"], default=None,
+                        help="push the statistics down as aggregate queries to Polars or DuckDB, which scan the "
+                             "file out of core on all cores (requires the engine)")
+    parser.add_argument("--checks", default=None, metavar="NAME,...",
+                        help="comma-separated checks to run, e.g. missing_values,outliers (default: all); "
+                             "only the statistics they need are computed")
+    parser.add_argument("--snapshot", default=None, metavar="PATH",
+                        help="write a compact snapshot of the dataset to this JSON file for 'prossa compare'")
+    parser.add_argument("--timings", action="store_true",
+                        help="print the time, CPU time and peak memory of each check to stderr")
+    args = parser.parse_args(argv)
+    if args.snapshot and args.follow:
+        parser.error("--snapshot cannot be combined with --follow")
+    if args.checks and args.follow:
+        parser.error("--checks cannot be combined with --follow")
+    if args.engine and args.follow:
+        parser.error("--engine cannot be combined with --follow")
+    if args.stratify and not args.sample:
+        parser.error("--stratify needs --sample")
+    for option in ("--engine", "--follow"):
+        if args.sample and getattr(args, option[2:]):
+            parser.error(f"--sample cannot be combined with {option}")
+    for option in ("--engine", "--follow", "--sample", "--chunksize"):
+        if args.cache and getattr(args, option[2:]):
+            parser.error(f"--cache cannot be combined with {option}")
+    # The engines scan the file on their own threads, in one pass
+    for option in ("--chunksize", "--partitions", "--jobs", "--backend"):
+        if args.engine and getattr(args, option[2:]) != parser.get_default(option[2:]):
+            parser.error(f"{option} cannot be combined with --engine")
+
+    # Imported only once the arguments are valid, so that --help and usage errors do not load pandas.
+    import pandas as pd
+    from .analyzer import DatasetAnalyzer, analyze_dataset
+    from .streaming import analyze_csv, tail_csv
+    from .instrument import Instrumentation
+    from .columnar import PARQUET_SUFFIXES, ARROW_SUFFIXES, analyze_columnar
+    from .partitions import is_partitioned, analyze_partitions
+    from .engines import analyze_engine
+
+    # Directories, glob patterns and Parquet/Arrow files are analyzed whole, without sampling or the cache
+    if is_partitioned(args.csv_path) or args.csv_path.lower().endswith(PARQUET_SUFFIXES + ARROW_SUFFIXES):
+        for option in ("--sample", "--cache", "--chunksize"):
+            if getattr(args, option[2:]):
+                parser.error(f"{option} cannot be combined with a directory, glob pattern or Parquet/Arrow file")
+    if args.partitions and not is_partitioned(args.csv_path):
+        parser.error("--partitions needs a directory or glob pattern")
+
+    instrument = Instrumentation(trace_memory=True) if args.timings else None
+    columns = args.columns.split(",") if args.columns else None
+    checks = args.checks.split(",") if args.checks else None
+
     try:
-        dataset = pd.read_csv(csv_path)
-        analyze_dataset(dataset)
+        if args.engine:
+            analyzer = analyze_engine(args.csv_path, engine=args.engine, columns=columns,
+                                      distinct_error=args.distinct_error, instrument=instrument,
+                                      outlier_method=args.outliers, correlation_method=args.correlation, checks=checks)
+        elif is_partitioned(args.csv_path):
+            analyzer = analyze_partitions(args.csv_path, distinct_error=args.distinct_error or 0.01, columns=columns,
+                                          n_jobs=args.jobs, backend=args.backend, instrument=instrument,
+                                          outlier_method=args.outliers, correlation_method=args.correlation,
+                                          checks=checks)
+            if args.partitions:
+                print("\nPARTITIONS:")
+                print(pd.DataFrame(analyzer.partition_records()).to_string(index=False))
+        elif args.csv_path.lower().endswith(PARQUET_SUFFIXES + ARROW_SUFFIXES):
+            analyzer = analyze_columnar(args.csv_path, columns=columns, distinct_error=args.distinct_error,
+                                        n_jobs=args.jobs, backend=args.backend, instrument=instrument,
+                                        outlier_method=args.outliers, correlation_method=args.correlation,
+                                        checks=checks)
+        elif args.follow:
+            analyzer = DatasetAnalyzer(None, distinct_error=args.distinct_error, n_jobs=args.jobs, backend=args.backend,
+                                       instrument=instrument, outlier_method=args.outliers,
+                                       correlation_method=args.correlation)
+            for batch in tail_csv(args.csv_path, poll_interval=args.poll_interval, usecols=columns):
+                analyzer.update(batch)
+                analyzer.print_recommendations()
+        elif args.sample:
+            analyzer = analyze_csv(args.csv_path, chunksize=args.chunksize or 100000,
+                                   distinct_error=args.distinct_error, sample_size=args.sample, stratify=args.stratify,
+                                   random_state=args.seed, n_jobs=args.jobs, backend=args.backend,
+                                   instrument=instrument, outlier_method=args.outliers,
+                                   correlation_method=args.correlation, checks=checks, usecols=columns)
+        elif args.chunksize:
+            analyzer = analyze_csv(args.csv_path, chunksize=args.chunksize, distinct_error=args.distinct_error or 0.01,
+                                   n_jobs=args.jobs, backend=args.backend, instrument=instrument,
+                                   outlier_method=args.outliers, correlation_method=args.correlation, checks=checks,
+                                   usecols=columns)
+        else:
+            dataset = pd.read_csv(args.csv_path, usecols=columns)
+            analyzer = analyze_dataset(dataset, distinct_error=args.distinct_error, n_jobs=args.jobs,
+                                       backend=args.backend, cache=args.cache, instrument=instrument,
+                                       outlier_method=args.outliers, correlation_method=args.correlation,
+                                       checks=checks)
+        if args.snapshot:
+            analyzer.snapshot(args.snapshot)
+        if instrument is not None:
+            print(instrument.summary(), file=sys.stderr)
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,209 @@
+import asyncio
+import functools
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from .analyzer import DatasetAnalyzer
+from .streaming import ChunkedDatasetAnalyzer
+from .columnar import PARQUET_SUFFIXES, ARROW_SUFFIXES, ColumnarDatasetAnalyzer, open_source
+from .partitions import expand_paths, is_partitioned, read_partition
+from .parallel import prefetch
+
+
+class CheckTimeout(asyncio.TimeoutError):
+    """
+    Raised when one step of an asynchronous analysis takes longer than its timeout.
+
+    The analyzer keeps the findings of the checks that completed before it.
+    """
+
+    def __init__(self, check, timeout, analyzer):
+        """
+        :param check: name of the step that timed out, 'profile' or a check method name
+        :param timeout: timeout in seconds
+        :param analyzer: the analyzer, holding the findings of the completed checks
+        """
+        super().__init__(f"{check} did not finish within {timeout} seconds")
+        self.check = check
+        self.timeout = timeout
+        self.analyzer = analyzer
+
+
+class _Cancellation:
+    """
+    The cancellation event of the step being run; passes over chunks started by a step stop when it is set.
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+
+    def cancel(self):
+        self.event.set()
+        self.event = threading.Event()
+
+    def prefetch(self, chunks):
+        return prefetch(chunks, cancel=self.event)
+
+
+class _PrefetchedSource:
+    """
+    A ParquetSource or ArrowSource whose chunks are read ahead in a background thread.
+    """
+
+    def __init__(self, source, cancellation):
+        self.source = source
+        self.cancellation = cancellation
+
+    def __getattr__(self, name):
+        return getattr(self.source, name)
+
+    def chunks(self, columns):
+        return self.cancellation.prefetch(self.source.chunks(columns))
+
+
+def open_analyzer(source, cancellation, columns=None, chunksize=100000, **kwargs):
+    """
+    Create the analyzer for a source, reading its chunks or partitions ahead of the computation.
+
+    :param source: pandas DataFrame; callable returning a fresh iterable of DataFrames; path of a CSV,
+        Parquet or Arrow IPC/Feather file; or directory or glob pattern of such files
+    :param cancellation: _Cancellation stopping passes over chunks
+    :param columns: names of the columns to analyze, or None for all
+    :param chunksize: number of rows per chunk of a CSV file
+    :param kwargs: other keyword arguments of the analyzer
+    :return: DatasetAnalyzer instance
+    """
+    if isinstance(source, pd.DataFrame):
+        return DatasetAnalyzer(source if columns is None else source[columns], **kwargs)
+    if callable(source):
+        return ChunkedDatasetAnalyzer(lambda: cancellation.prefetch(source()), **kwargs)
+    if is_partitioned(source):
+        paths = expand_paths(source)
+        chunks = lambda: (read_partition(path, columns) for path in paths)
+    elif os.path.splitext(os.fspath(source))[1].lower() in PARQUET_SUFFIXES + ARROW_SUFFIXES:
+        return ColumnarDatasetAnalyzer(_PrefetchedSource(open_source(source, columns), cancellation), **kwargs)
+    else:
+        chunks = lambda: pd.read_csv(source, chunksize=chunksize, usecols=columns)
+    return ChunkedDatasetAnalyzer(lambda: cancellation.prefetch(chunks()), **kwargs)
+
+
+class AnalysisPool:
+    """
+    Runs analyses for an asyncio application on a shared pool of worker threads.
+
+    Building the profile and every check run in the pool, one step at a time, so
+    the event loop is never blocked and the steps of concurrent analyses interleave
+    instead of queueing behind one another. Streamed sources read their next chunk
+    or partition in a background thread while the current one is being processed.
+    """
+
+    def __init__(self, max_workers=None, max_concurrent=None):
+        """
+        Initialize the pool.
+
+        :param max_workers: number of worker threads, see concurrent.futures.ThreadPoolExecutor
+        :param max_concurrent: largest number of analyses running at once in an event loop, others wait for a slot;
+            None for no limit
+        """
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix='prossa')
+        self.max_concurrent = max_concurrent
+        # One semaphore per event loop, created inside it: before Python 3.10 a semaphore binds to the
+        # loop current when it is created, and the pool may be shared by successive asyncio.run() calls
+        self._slots = weakref.WeakKeyDictionary()
+
+    async def analyze(self, source, columns=None, chunksize=100000, check_timeout=None, checks=None, **kwargs):
+        """
+        Analyze a dataset without blocking the event loop.
+
+        A step that exceeds ``check_timeout``, or a cancelled analysis, stops passes
+        over streamed chunks at the next chunk. Steps working on a DataFrame in memory
+        cannot be interrupted and finish in their worker thread, but their results are
+        no longer waited for.
+
+        :param source: DataFrame, chunk factory, file path, directory or glob pattern, see open_analyzer
+        :param columns: names of the columns to analyze, or None for all
+        :param chunksize: number of rows per chunk of a CSV file
+        :param check_timeout: seconds allowed for building the profile and for each check, or None
+        :param checks: names of the registered checks to run, or None for all, see DatasetAnalyzer.analyze
+        :param kwargs: other keyword arguments of the analyzer, e.g. distinct_error or outlier_method
+        :return: DatasetAnalyzer instance with completed analysis; nothing is printed
+        :raises CheckTimeout: when a step takes longer than ``check_timeout``
+        """
+        if self.max_concurrent is None:
+            return await self._analyze(source, columns, chunksize, check_timeout, checks, kwargs)
+        loop = asyncio.get_running_loop()
+        if loop not in self._slots:
+            self._slots[loop] = asyncio.Semaphore(self.max_concurrent)
+        async with self._slots[loop]:
+            return await self._analyze(source, columns, chunksize, check_timeout, checks, kwargs)
+
+    async def _analyze(self, source, columns, chunksize, check_timeout, checks, kwargs):
+        loop = asyncio.get_running_loop()
+        cancellation = _Cancellation()
+        analyzer = await loop.run_in_executor(
+            self.executor, lambda: open_analyzer(source, cancellation, columns, chunksize, **kwargs))
+
+        async def run(name, step):
+            try:
+                return await asyncio.wait_for(loop.run_in_executor(self.executor, step), check_timeout)
+            except asyncio.TimeoutError:
+                cancellation.cancel()
+                raise CheckTimeout(name, check_timeout, analyzer) from None
+            except asyncio.CancelledError:
+                cancellation.cancel()
+                raise
+
+        for name in await run('profile', lambda: analyzer.prepare(checks)):
+            await run(name, functools.partial(analyzer.run_check, name))
+        return analyzer
+
+    def close(self, wait=True):
+        """
+        Shut the worker threads down.
+
+        :param wait: wait for running steps to finish
+        """
+        self.executor.shutdown(wait=wait)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close(wait=False)
+
+
+_default_pool = None
+_default_lock = threading.Lock()
+
+
+def default_pool():
+    """
+    The AnalysisPool shared by analyze_dataset_async calls that do not pass their own.
+    """
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None:
+            _default_pool = AnalysisPool()
+        return _default_pool
+
+
+async def analyze_dataset_async(source, pool=None, columns=None, chunksize=100000, check_timeout=None, checks=None,
+                                **kwargs):
+    """
+    Analyze a dataset from asyncio code, without blocking the event loop or printing anything.
+
+    :param source: pandas DataFrame; callable returning a fresh iterable of DataFrames; path of a CSV,
+        Parquet or Arrow IPC/Feather file; or directory or glob pattern of such files
+    :param pool: AnalysisPool to run on; a pool shared by all callers by default
+    :param columns: names of the columns to analyze, or None for all
+    :param chunksize: number of rows per chunk of a CSV file
+    :param check_timeout: seconds allowed for building the profile and for each check, or None
+    :param checks: names of the registered checks to run, or None for all
+    :param kwargs: other keyword arguments of the analyzer, e.g. distinct_error or outlier_method
+    :return: DatasetAnalyzer instance with completed analysis
+    :raises CheckTimeout: when a step takes longer than ``check_timeout``
+    """
+    return await (pool or default_pool()).analyze(source, columns=columns, chunksize=chunksize,
+                                                  check_timeout=check_timeout, checks=checks, **kwargs)
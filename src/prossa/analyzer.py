@@ -1,32 +1,476 @@
+import functools
+import inspect
+import math
+import os
+from contextlib import nullcontext
 import pandas as pd
 import numpy as np
-from scipy import stats
+from .profile import STATISTICS, DatasetProfile, NUMERIC, CATEGORICAL
+from .outliers import OUTLIER_METHODS, DEFAULT_THRESHOLDS, count_profiled_outliers, count_method_outliers, make_detector
+from .sketches import HyperLogLog
+from .sampling import sample_frame, proportion_interval
+from .cache import ProfileCache, combine_fingerprints
+from .findings import HIGH_CARDINALITY_THRESHOLD, Finding, Recommendations, to_records, to_json, to_arrow
+from .instrument import Instrumentation, instrumented
+from .downcast import advise_downcast, downcast
+from .correlation import (CORRELATION_METHODS, CORRELATION_THRESHOLD, DUPLICATE_THRESHOLD, CORRELATION_SAMPLE_ROWS,
+                          MAX_CATEGORIES, CorrelationAccumulator)
+from .inference import INFERENCE_SAMPLE_ROWS, infer_types
+from .drift import DatasetSnapshot, SnapshotAccumulator
+from .categories import summarize_categories, grouping_advice
+from .checks import register_check, resolve_checks, schedule
+
+def _check_options(analyzer_class, options):
+    """
+    Reject DatasetAnalyzer options that another analyzer class does not support, rather than failing
+    with a TypeError or passing them on to pandas.read_csv.
+    """
+    accepted = inspect.signature(analyzer_class.__init__).parameters
+    known = inspect.signature(DatasetAnalyzer.__init__).parameters
+    unsupported = [name for name in options if name not in accepted and (name in known or 'read_csv_kwargs' not in accepted)]
+    if unsupported:
+        raise ValueError(f"{analyzer_class.__name__} does not support {', '.join(map(repr, unsupported))}")
+
+
+# Statistics advise_downcast reads: min/max of numeric columns and distinct counts of categorical ones
+DOWNCAST_NEEDS = {'moments': (NUMERIC,), 'distinct': (CATEGORICAL,)}
+
 
 class DatasetAnalyzer:
     """
     A class for analyzing datasets and providing recommendations for data preprocessing.
     """
 
-    def __init__(self, dataset):
+    # Built-in checks, in the order analyze() runs them; checks added with register_check run after them
+    CHECKS = ('check_missing_values', 'check_outliers', 'check_data_types', 'check_scaling_encoding',
+              'check_categorical_data', 'check_constant_columns', 'check_imputation', 'check_correlations')
+
+    def __init__(self, dataset, distinct_error=None, sample_size=None, stratify=None, random_state=None,
+                 confidence=0.95, n_jobs=1, backend='thread', cache=None, stamps=None, instrument=None,
+                 downcast=True, outlier_method='zscore', correlation_method='pearson',
+                 correlation_sample=CORRELATION_SAMPLE_ROWS, infer_types=True):
         """
         Initialize the DatasetAnalyzer with a dataset.
 
         :param dataset: pandas DataFrame to be analyzed
+        :param distinct_error: relative standard error allowed for approximate distinct counts
+            of categorical columns (HyperLogLog), or None for exact counts
+        :param sample_size: analyze a random sample of this many rows instead of the whole dataset
+        :param stratify: column label to stratify the sample on, or None for a uniform sample
+        :param random_state: seed or numpy Generator used for sampling
+        :param confidence: confidence level of the intervals reported for sampled estimates
+        :param n_jobs: number of workers the columns are split across; -1 uses all cores
+        :param backend: 'thread' or 'process'; process workers read numeric columns from shared memory
+        :param cache: ProfileCache, or a directory path for one, reusing statistics of unchanged columns across runs
+        :param stamps: optional dict mapping column labels to values that change whenever the column does
+            (e.g. a partition modification time), used by the cache instead of hashing the column
+        :param instrument: True, or an Instrumentation instance (for memory tracing and hooks), to record
+            the time, CPU time and memory of building the profile and of each check in ``instrumentation``
+        :param downcast: whether check_data_types measures the memory saved by storing columns with smaller
+            dtypes; needs the data in memory, so analyzers reading from files or chunks skip it
+        :param outlier_method: how check_outliers flags values: 'zscore' (|z| > 3), 'iqr' (outside 1.5 x IQR
+            fences), 'mad' (modified z-score > 3.5 from the median and MAD) or 'isolation' (isolation score > 0.75)
+        :param correlation_method: how check_correlations relates numeric columns: 'pearson' or 'spearman'
+            (rank correlation); categorical columns are always compared with Cramér's V
+        :param correlation_sample: check_correlations uses a random sample of at most this many rows,
+            or all rows if None
+        :param infer_types: whether check_data_types finds object columns holding numbers, booleans or dates
+            stored as text, from a sample of at most 10,000 rows
         """
+        if outlier_method not in OUTLIER_METHODS:
+            raise ValueError(f"Unknown outlier method '{outlier_method}', expected one of {OUTLIER_METHODS}")
+        if correlation_method not in CORRELATION_METHODS:
+            raise ValueError(f"Unknown correlation method '{correlation_method}', expected one of {CORRELATION_METHODS}")
+        self.population_rows = None
+        if sample_size is not None and sample_size < len(dataset):
+            self.population_rows = len(dataset)
+            dataset = sample_frame(dataset, sample_size, stratify=stratify, random_state=random_state)
         self.dataset = dataset
-        self.recommendations = {}
+        self.distinct_error = distinct_error
+        self.confidence = confidence
+        self.n_jobs = n_jobs
+        self.backend = backend
+        self.cache = ProfileCache(cache) if isinstance(cache, (str, os.PathLike)) else cache
+        self.stamps = stamps
+        if instrument is True:
+            instrument = Instrumentation()
+        self.instrumentation = instrument or None
+        self.downcast = downcast
+        self.outlier_method = outlier_method
+        self.correlation_method = correlation_method
+        self.correlation_sample = correlation_sample
+        self.infer_types = infer_types
+        self._downcast_advice = None
+        self._running_detector = None
+        self.findings = {}
+        self.recommendations = Recommendations(self.findings)
+        self._profile = None
+        self._fingerprints = None
+        self._running_outliers = None
+        self._running_categories = None
+
+    @classmethod
+    def from_sample(cls, sample, population_rows, **kwargs):
+        """
+        Create a DatasetAnalyzer for a sample drawn elsewhere, e.g. while streaming a file.
+
+        :param sample: pandas DataFrame holding the sampled rows
+        :param population_rows: number of rows the sample was drawn from
+        :param kwargs: other keyword arguments of DatasetAnalyzer
+        :return: DatasetAnalyzer instance reporting estimates for the whole population
+        """
+        analyzer = cls(sample, **kwargs)
+        if population_rows > len(sample):
+            analyzer.population_rows = population_rows
+        return analyzer
+
+    @classmethod
+    def from_file(cls, path, columns=None, **kwargs):
+        """
+        Create an analyzer for a CSV, Parquet or Arrow IPC/Feather file, chosen by its suffix.
+
+        Parquet and Arrow files get a ColumnarDatasetAnalyzer, which answers what it can
+        from the file metadata and reads only the columns the checks need. Directories
+        and glob patterns get a PartitionedDatasetAnalyzer over all their files.
+
+        :param path: path to the file, or a directory or glob pattern of partition files
+        :param columns: names of the columns to analyze, or None for all
+        :param kwargs: other keyword arguments of the analyzer
+        :return: DatasetAnalyzer instance
+        :raises ValueError: when an option is not supported by the analyzer the file gets
+        """
+        from .columnar import PARQUET_SUFFIXES, ARROW_SUFFIXES, ColumnarDatasetAnalyzer, open_source
+        from .partitions import PartitionedDatasetAnalyzer, is_partitioned
+
+        if is_partitioned(path):
+            _check_options(PartitionedDatasetAnalyzer, kwargs)
+            return PartitionedDatasetAnalyzer(path, columns=columns, **kwargs)
+        if os.path.splitext(os.fspath(path))[1].lower() in PARQUET_SUFFIXES + ARROW_SUFFIXES:
+            _check_options(ColumnarDatasetAnalyzer, kwargs)
+            return ColumnarDatasetAnalyzer(open_source(path, columns), **kwargs)
+        return cls(pd.read_csv(path, usecols=columns), **kwargs)
+
+    def _estimate(self, count):
+        """
+        Scale a count observed in the sample to the population, with its confidence interval.
+
+        :param count: number of sampled rows with some property
+        :return: tuple (estimated count, lower bound, upper bound) for the whole population
+        """
+        n_rows = self.profile.n_rows
+        low, high = proportion_interval(count, n_rows, self.population_rows, self.confidence)
+        scale = self.population_rows
+        return round(count / n_rows * scale), math.floor(low * scale), math.ceil(high * scale)
+
+    @property
+    def profile(self):
+        """
+        Per-column statistics of the dataset, computed on first access and shared by all checks.
+
+        After analyze() with a selection of checks it may hold only the statistics they needed.
+        """
+        if self._profile is None:
+            with self._stage('profile') as metrics:
+                self._profile = self._build_profile(on_column=metrics and metrics.add_column)
+                if metrics is not None:
+                    metrics.rows, metrics.columns = self._profile.n_rows, len(self._profile)
+        return self._profile
+
+    def _stage(self, name):
+        """
+        Context manager measuring a stage when instrumentation is enabled, yielding its StageMetrics or None.
+        """
+        if self.instrumentation is None:
+            return nullcontext()
+        return self.instrumentation.stage(name)
+
+    def _column_timer(self):
+        """
+        Per-column timing callback of the stage being measured, or None when instrumentation is disabled.
+        """
+        metrics = self.instrumentation and self.instrumentation.current
+        return metrics.add_column if metrics else None
+
+    def _build_profile(self, on_column=None):
+        """
+        Compute the dataset profile used by the checks.
+
+        :param on_column: optional per-column timing callback, see DatasetProfile.from_frame
+        :return: DatasetProfile instance
+        """
+        if self.cache is not None:
+            profile, self._fingerprints = self.cache.profile_frame(
+                self.dataset, stamps=self.stamps, sketch_precision=self._sketch_precision(),
+                n_jobs=self.n_jobs, backend=self.backend, on_column=on_column)
+            return profile
+        return DatasetProfile.from_frame(self.dataset, sketch_precision=self._sketch_precision(),
+                                         n_jobs=self.n_jobs, backend=self.backend, on_column=on_column)
+
+    def _sketch_precision(self):
+        """
+        HyperLogLog precision matching ``distinct_error``, or None for exact counts.
+        """
+        if self.distinct_error is None:
+            return None
+        return HyperLogLog.precision_for_error(self.distinct_error)
+
+    def _skeleton_profile(self):
+        """
+        A profile of the dataset without statistics, for analyses running only some checks.
+
+        :return: DatasetProfile instance, or None when the profile is always built whole (cached analyzers,
+            and analyzers not holding their rows in memory)
+        """
+        if self.dataset is None or self.cache is not None:
+            return None
+        return DatasetProfile.skeleton(self.dataset)
+
+    def _require(self, columns, *statistics):
+        """
+        Make sure profiled columns carry statistics computed from their values.
+
+        A profile built whole always does; a profile built for some checks only, and
+        analyzers that start from file metadata, compute them for these columns only
+        when a check asks for them.
+
+        :param columns: ColumnProfile instances of ``self.profile``
+        :param statistics: names of the statistics needed, see profile.STATISTICS; all of them if none given
+        :return: the same columns
+        """
+        statistics = statistics or STATISTICS
+        pending = [column for column in columns if not all(column.has(statistic) for statistic in statistics)]
+        if pending and self.dataset is not None:
+            self._profile.compute(self.dataset, pending, statistics, sketch_precision=self._sketch_precision(),
+                                  n_jobs=self.n_jobs, backend=self.backend, on_column=self._column_timer())
+        return columns
+
+    def require(self, *needs):
+        """
+        Compute the statistics some checks need, each once and only for the columns that lack it.
+
+        :param needs: dicts mapping statistic names to dtype classes or None, see checks.register_check
+        :return: the profile
+        """
+        profile = self.profile
+        for statistic, columns in schedule(needs, list(profile)):
+            self._require(columns, statistic)
+        return profile
+
+    def _column_keys(self, columns):
+        """
+        Cache fingerprints of profiled columns, or None when the analyzer has no cache.
+        """
+        if self._fingerprints is None:
+            return None
+        positions = {id(column): position for position, column in enumerate(self.profile)}
+        return [self._fingerprints[positions[id(column)]] for column in columns]
+
+    def _cached(self, columns, name, compute):
+        """
+        Per-column results of a computation, reusing the results cached for unchanged columns.
+
+        :param columns: ColumnProfile instances of ``self.profile``
+        :param name: name the results are cached under, see ProfileCache.result
+        :param compute: function taking a list of ColumnProfile instances and returning one result per column
+        :return: list of results, one per column
+        """
+        keys = self._column_keys(columns)
+        if keys is None:
+            return compute(columns)
+        results = [self.cache.result(key, name) for key in keys]
+        missing = [position for position, result in enumerate(results) if result is None]
+        if missing:
+            computed = compute([columns[position] for position in missing])
+            if computed is None:
+                return None
+            for position, result in zip(missing, computed):
+                results[position] = result
+                self.cache.put_result(keys[position], name, result)
+        return results
+
+    def _count_outliers(self, columns):
+        """
+        Count the values of each column with an absolute z-score above 3.
+
+        :param columns: numeric ColumnProfile instances with a non-zero standard deviation
+        :return: list of outlier counts, one per column
+        """
+        return self._cached(columns, 'outliers', lambda pending: count_profiled_outliers(
+            self.dataset, pending, n_jobs=self.n_jobs, backend=self.backend))
+
+    def _count_method_outliers(self, columns):
+        """
+        Count the outliers of each column with the robust ``outlier_method``.
+
+        :param columns: numeric ColumnProfile instances with a non-zero standard deviation
+        :return: list of outlier counts, one per column
+        """
+        return count_method_outliers(self.dataset, [column.name for column in columns], self.outlier_method,
+                                     n_jobs=self.n_jobs, backend=self.backend)
+
+    def _inference_rows(self, names):
+        """
+        A bounded sample of rows of some columns, to infer the types of their values from.
+
+        :param names: column labels
+        :return: pandas DataFrame with at most INFERENCE_SAMPLE_ROWS rows, or None when the rows are no longer held
+        """
+        if self.dataset is None:
+            return None
+        return sample_frame(self.dataset[names], INFERENCE_SAMPLE_ROWS, random_state=0)
+
+    def _summarize_categories(self, columns):
+        """
+        Build heavy-hitter summaries of the values of categorical columns.
+
+        :param columns: categorical ColumnProfile instances
+        :return: list of SpaceSaving instances, one per column
+        """
+        if self._running_categories is not None:
+            return [self._running_categories[column.name] for column in columns]
+        return self._cached(columns, 'categories', lambda pending: summarize_categories(
+            self.dataset, [column.name for column in pending], on_column=self._column_timer()))
+
+    def _correlate(self, numeric, categorical):
+        """
+        Accumulate the correlations of columns over the rows of the dataset, or of a sample of them.
 
-    def analyze(self):
+        :param numeric: numeric ColumnProfile instances with a non-zero standard deviation
+        :param categorical: categorical ColumnProfile instances
+        :return: tuple (CorrelationAccumulator, number of rows used), or None when the rows are no longer
+            held, as after update()
+        """
+        if self.dataset is None:
+            return None
+        keys = self._column_keys(numeric + categorical)
+        if keys is not None:
+            key = combine_fingerprints(keys, method=self.correlation_method, sample=self.correlation_sample,
+                                       numeric=len(numeric))
+            result = self.cache.result(key, 'correlations')
+            if result is not None:
+                return result
+        frame = self.dataset
+        if self.correlation_sample is not None and self.correlation_sample < len(frame):
+            frame = sample_frame(frame, self.correlation_sample, random_state=0)
+        accumulator = CorrelationAccumulator.from_profiles(numeric, categorical, self.correlation_method)
+        result = accumulator.update(frame), len(frame)
+        if keys is not None:
+            self.cache.put_result(key, 'correlations', result)
+        return result
+
+    def _accumulate_snapshot(self, accumulator):
+        """
+        Add the rows of the dataset to the sketches of a snapshot.
+
+        :param accumulator: empty SnapshotAccumulator over the profiled columns
+        :return: the filled accumulator
+        """
+        if self.dataset is None:
+            raise ValueError("snapshot() needs the rows of the dataset, which are no longer held after update()")
+        return accumulator.update(self.dataset)
+
+    def prepare(self, checks=None):
+        """
+        Build the profile for an analysis running some registered checks.
+
+        With every check the whole profile is built as usual. With a selection, an
+        in-memory analyzer computes only the statistics the selected checks declare,
+        for the columns they need them for, so e.g. checking missing values only
+        counts nulls; the profile then holds only those statistics.
+
+        :param checks: names of registered checks, with or without their 'check_' prefix, or None for all
+        :return: names of the checks to run, in order
+        """
+        selected = resolve_checks(checks)
+        skeleton = self._skeleton_profile() if checks is not None and self._profile is None else None
+        if skeleton is None:
+            self.profile
+        else:
+            with self._stage('profile') as metrics:
+                self._profile = skeleton
+                self.require(*[check.needs for check in selected])
+                if metrics is not None:
+                    metrics.rows, metrics.columns = skeleton.n_rows, len(skeleton)
+        return [check.name for check in selected]
+
+    def run_check(self, name):
+        """
+        Run one registered check, storing its findings.
+
+        :param name: name of the check, see prepare
+        """
+        method = getattr(self, name, None)
+        if method is None:
+            check = resolve_checks([name])[0]
+            method = functools.partial(instrumented()(check.function), self)
+        method()
+
+    def analyze(self, checks=None):
         """
         Perform a comprehensive analysis of the dataset, checking various aspects and generating recommendations.
+
+        :param checks: names of the registered checks to run, or None for all of them
+        """
+        for name in self.prepare(checks):
+            self.run_check(name)
+
+    def update(self, batch):
         """
-        self.check_missing_values()
-        self.check_outliers()
-        self.check_data_types()
-        self.check_scaling_encoding()
-        self.check_categorical_data()
-        self.check_constant_columns()
-        self.check_imputation()
+        Fold newly arrived rows into running statistics and regenerate the recommendations.
+
+        The first call turns the profile of the rows seen so far into a mergeable one
+        (HyperLogLog sketches and first values) and drops the reference to them; later
+        calls only profile the batch, so each update costs time proportional to the
+        batch. Outliers of a batch are counted against the mean and standard deviation
+        of all rows seen up to and including that batch, which approximates counting
+        every row against the final moments.
+
+        :param batch: pandas DataFrame of new rows with the same columns
+        :return: the analyzer itself
+        """
+        if self.population_rows is not None:
+            raise ValueError("update() is not supported on a sampled DatasetAnalyzer")
+        precision = self._sketch_precision() or HyperLogLog.precision_for_error(0.01)
+
+        if self._running_outliers is None:
+            self._running_outliers = {}
+            self._profile = None
+            if self.dataset is not None and len(self.dataset) > 0:
+                self._fold(self.dataset, precision)
+            self.dataset = None
+            self._fingerprints = None
+        with self._stage('update') as metrics:
+            self._fold(batch, precision, on_column=metrics and metrics.add_column)
+            if metrics is not None:
+                metrics.rows, metrics.columns = len(batch), batch.shape[1]
+
+        self.analyze()
+        return self
+
+    def _fold(self, batch, precision, on_column=None):
+        """
+        Merge the profile of a batch into the running profile and count its outliers.
+        """
+        batch_profile = DatasetProfile.from_frame(batch, sketch_precision=precision, mergeable=True,
+                                                  n_jobs=self.n_jobs, backend=self.backend, on_column=on_column)
+        self._profile = batch_profile if self._profile is None else self._profile.merge(batch_profile)
+        if self._running_categories is None:
+            self._running_categories = {}
+        names = [column.name for column in self._profile.of_kind(CATEGORICAL)]
+        for name, summary in zip(names, summarize_categories(batch, names)):
+            running = self._running_categories.get(name)
+            self._running_categories[name] = summary if running is None else running.merge(summary)
+        if self.outlier_method != 'zscore':
+            if self._running_detector is None:
+                self._running_detector = make_detector(self.outlier_method,
+                                                       [column.name for column in self._profile.of_kind(NUMERIC)])
+            self._running_detector.update(batch).fit().update_counts(batch)
+            self._running_outliers = dict(zip(self._running_detector.names, self._running_detector.counts()))
+            return
+        numeric_columns = [column for column in self._profile.of_kind(NUMERIC) if column.std]
+        counts = count_profiled_outliers(batch, numeric_columns, n_jobs=self.n_jobs, backend=self.backend)
+        for column, count in zip(numeric_columns, counts):
+            self._running_outliers[column.name] = self._running_outliers.get(column.name, 0) + count
 
     def print_recommendations(self):
         """
@@ -37,155 +481,285 @@ class DatasetAnalyzer:
             for item in items:
                 print(f"- {item}")
 
+    @instrumented()
+    @register_check('Missing Values', needs={'null_count': None})
     def check_missing_values(self):
         """
         Check for missing values in the dataset and provide recommendations for handling them.
         """
-        recommendations = []
-        missing_values = self.dataset.isnull().sum()
-        
-        if missing_values.sum() > 0:
-            recommendations.append("Dataset contains missing values.")
-            for column, count in missing_values[missing_values > 0].items():
-                percentage = (count / len(self.dataset)) * 100
-                recommendations.append(f"Column '{column}' has {count} ({percentage:.2f}%) missing values.")
-            
-            recommendations.append("Consider the following techniques:")
-            recommendations.append("- Remove rows with missing values using dropna()")
-            recommendations.append("- Impute missing values using fillna() or more advanced techniques")
-            recommendations.append("- Use algorithms that handle missing values (e.g., some tree-based models)")
-        else:
-            recommendations.append("No missing values found in the dataset.")
-        
-        self.recommendations['Missing Values'] = recommendations
-
+        findings = []
+        profile = self.profile
+
+        if self.population_rows is not None:
+            max_fraction = proportion_interval(0, profile.n_rows, self.population_rows, self.confidence)[1]
+            findings.append(Finding('Missing Values', None, 'sample_rows', profile.n_rows, {
+                'population_rows': self.population_rows,
+                'confidence': self.confidence,
+                'max_fraction': max_fraction,
+            }))
+        for column in profile:
+            if column.null_count > 0:
+                detail = {'fraction': column.null_count / profile.n_rows}
+                if self.population_rows is not None:
+                    detail['low'], detail['high'] = proportion_interval(column.null_count, profile.n_rows,
+                                                                        self.population_rows, self.confidence)
+                    detail['estimate'] = round(detail['fraction'] * self.population_rows)
+                findings.append(Finding('Missing Values', column.name, 'null_count', column.null_count, detail))
+
+        self.findings['Missing Values'] = findings
+
+    @instrumented(NUMERIC)
+    @register_check('Outliers', needs={'moments': (NUMERIC,)})
     def check_outliers(self):
         """
-        Check for outliers in numeric columns using the z-score method and provide recommendations.
+        Check for outliers in numeric columns using ``outlier_method`` (z-score by default) and provide recommendations.
         """
-        recommendations = []
-        numeric_columns = self.dataset.select_dtypes(include=[np.number]).columns
+        findings = []
+        method = self.outlier_method
+        if method != 'zscore':
+            findings.append(Finding('Outliers', None, 'method', method, {'threshold': DEFAULT_THRESHOLDS[method]}))
+        numeric_columns = [column for column in self.profile.of_kind(NUMERIC) if column.std]
+        if self._running_outliers is not None:
+            counts = [self._running_outliers.get(column.name, 0) for column in numeric_columns]
+        elif method == 'zscore':
+            counts = self._count_outliers(numeric_columns)
+        else:
+            counts = self._count_method_outliers(numeric_columns)
 
-        for column in numeric_columns:
-            z_scores = np.abs(stats.zscore(self.dataset[column].dropna()))
-            outliers = np.sum(z_scores > 3)
+        for column, outliers in zip(numeric_columns, counts):
             if outliers > 0:
-                recommendations.append(f"Column '{column}' has {outliers} potential outliers (using z-score > 3).")
+                detail = None
+                if self.population_rows is not None:
+                    estimate, low, high = self._estimate(outliers)
+                    detail = {'estimate': estimate, 'low': low, 'high': high, 'sample_rows': self.profile.n_rows}
+                findings.append(Finding('Outliers', column.name, f"{method}_outliers", outliers, detail))
 
-        if recommendations:
-            recommendations.append("Consider the following techniques:")
-            recommendations.append("- Investigate and potentially remove outliers")
-            recommendations.append("- Use robust scaling methods (e.g., RobustScaler)")
-            recommendations.append("- Apply transformations (e.g., log transformation) to reduce the impact of outliers")
-        else:
-            recommendations.append("No significant outliers detected using the z-score method.")
-
-        self.recommendations['Outliers'] = recommendations
+        self.findings['Outliers'] = findings
 
+    @instrumented()
+    @register_check('Data Types', needs={'null_count': None})
     def check_data_types(self):
         """
         Check the data types of all columns and provide recommendations for appropriate type conversions.
         """
-        recommendations = []
-        dtypes = self.dataset.dtypes
-
-        for column, dtype in dtypes.items():
-            recommendations.append(f"Column '{column}' has data type: {dtype}")
+        findings = [Finding('Data Types', column.name, 'dtype', str(column.dtype)) for column in self.profile]
+        if self.downcast and self.dataset is not None:
+            self._downcast_advice = self._advise_downcast()
+            for name, target, before, after in self._downcast_advice:
+                detail = {'from': str(self.dataset[name].dtype), 'bytes': before, 'saved_bytes': before - after}
+                if self.population_rows is not None:
+                    detail['estimate'] = round((before - after) * self.population_rows / len(self.dataset))
+                findings.append(Finding('Data Types', name, 'downcast', str(target), detail))
+        columns = [column for column in self.profile if column.dtype == object and column.count > 0]
+        inferred = self._infer_types(columns) if self.infer_types and columns else None
+        if inferred is not None:
+            for column, conversions in zip(columns, inferred):
+                for target, detail in conversions:
+                    findings.append(Finding('Data Types', column.name, 'convert', target, detail))
+        self.findings['Data Types'] = findings
+
+    def _advise_downcast(self):
+        """
+        Downcasting advice for the columns of the dataset, see downcast.advise_downcast.
+        """
+        self.require(DOWNCAST_NEEDS)
+        narrow_integers = self.population_rows is None
 
-        recommendations.append("Consider the following:")
-        recommendations.append("- Ensure numeric columns are of the appropriate type (int, float)")
-        recommendations.append("- Convert datetime columns to datetime type if not already")
-        recommendations.append("- Check for any unexpected data types")
+        def advise(columns):
+            names = [column.name for column in columns]
+            advice = {name: (target, before, after) for name, target, before, after
+                      in advise_downcast(self.dataset[names], columns, narrow_integers=narrow_integers,
+                                         on_column=self._column_timer())}
+            return [[advice[name]] if name in advice else [] for name in names]
 
-        self.recommendations['Data Types'] = recommendations
+        columns = list(self.profile)
+        return [(column.name, *advice) for column, per_column in
+                zip(columns, self._cached(columns, ('downcast', narrow_integers), advise)) for advice in per_column]
 
-    def check_scaling_encoding(self):
+    def _infer_types(self, columns):
         """
-        Provide recommendations for scaling numeric features and encoding categorical features.
+        Types the values of object columns parse as, see inference.infer_types.
+
+        :param columns: ColumnProfile instances of object columns with values
+        :return: list, one per column, of lists holding a tuple (target dtype, detail dict) if the column converts,
+            or None when no rows are available to infer from
         """
-        recommendations = []
-        numeric_columns = self.dataset.select_dtypes(include=[np.number]).columns
+        n_rows = self.population_rows or self.profile.n_rows
 
-        if len(numeric_columns) > 0:
-            recommendations.append("Consider scaling numeric features:")
-            recommendations.append("- Use StandardScaler for normal distributions")
-            recommendations.append("- Use MinMaxScaler to scale to a specific range")
-            recommendations.append("- Use RobustScaler if outliers are present")
+        def infer(pending):
+            names = [column.name for column in pending]
+            sample = self._inference_rows(names)
+            if sample is None:
+                return None
+            inferred = {name: (target, detail) for name, target, detail
+                        in infer_types(sample, n_rows, on_column=self._column_timer())}
+            return [[inferred[name]] if name in inferred else [] for name in names]
 
-        categorical_columns = self.dataset.select_dtypes(include=['object', 'category']).columns
-        if len(categorical_columns) > 0:
-            recommendations.append("Consider encoding categorical features:")
-            recommendations.append("- Use OneHotEncoder for nominal categorical data")
-            recommendations.append("- Use OrdinalEncoder for ordinal categorical data")
+        return self._cached(columns, ('inference', n_rows), infer)
 
-        self.recommendations['Scaling and Encoding'] = recommendations
+    def downcast_frame(self):
+        """
+        Return a copy of the dataset with every column stored in the smaller dtype check_data_types advised.
 
+        For a sampled analyzer this is the downcast sample.
+
+        :return: pandas DataFrame
+        """
+        if self.dataset is None:
+            raise ValueError("downcast_frame() needs a DatasetAnalyzer holding its dataset in memory")
+        if self._downcast_advice is None:
+            self._downcast_advice = self._advise_downcast()
+        return downcast(self.dataset, self._downcast_advice)
+
+    @instrumented(NUMERIC, CATEGORICAL)
+    @register_check('Scaling and Encoding')
+    def check_scaling_encoding(self):
+        """
+        Provide recommendations for scaling numeric features and encoding categorical features.
+        """
+        self.findings['Scaling and Encoding'] = [
+            Finding('Scaling and Encoding', None, 'numeric_columns', len(self.profile.of_kind(NUMERIC))),
+            Finding('Scaling and Encoding', None, 'categorical_columns', len(self.profile.of_kind(CATEGORICAL))),
+        ]
+
+    @instrumented(CATEGORICAL)
+    @register_check('Categorical Data', needs={'distinct': (CATEGORICAL,)})
     def check_categorical_data(self):
         """
         Analyze categorical columns and provide recommendations for handling high-cardinality features.
         """
-        recommendations = []
-        categorical_columns = self.dataset.select_dtypes(include=['object', 'category']).columns
-
-        for column in categorical_columns:
-            unique_values = self.dataset[column].nunique()
-            recommendations.append(f"Column '{column}' has {unique_values} unique categories.")
-
-            if unique_values > 10:
-                recommendations.append(f"  - Consider grouping less frequent categories in '{column}'")
-            
-        if len(categorical_columns) > 0:
-            recommendations.append("General recommendations for categorical data:")
-            recommendations.append("- Use label encoding for ordinal categories")
-            recommendations.append("- Use one-hot encoding for nominal categories with few unique values")
-            recommendations.append("- Consider feature hashing for high-cardinality categorical data")
-
-        self.recommendations['Categorical Data'] = recommendations
-
+        approximate = self._sketch_precision() is not None or self._running_outliers is not None
+        columns = self.profile.of_kind(CATEGORICAL)
+        findings = [
+            Finding('Categorical Data', column.name, 'distinct', column.distinct,
+                    {'approximate': True} if approximate else None)
+            for column in columns
+        ]
+        many = [column for column in columns if column.distinct > HIGH_CARDINALITY_THRESHOLD]
+        if many:
+            for column, summary in zip(many, self._summarize_categories(many)):
+                advice = grouping_advice(summary)
+                findings.append(Finding('Categorical Data', column.name, 'grouping', advice.pop('keep'), advice))
+        self.findings['Categorical Data'] = findings
+
+    @instrumented()
+    @register_check('Constant Columns', needs={'constancy': None})
     def check_constant_columns(self):
         """
         Identify columns with constant values and recommend their removal.
         """
-        recommendations = []
-        constant_columns = [column for column in self.dataset.columns if self.dataset[column].nunique() <= 1]
-
-        if constant_columns:
-            recommendations.append("The following columns have constant values:")
-            recommendations.extend(constant_columns)
-            recommendations.append("Consider removing these columns as they don't provide any information.")
-        else:
-            recommendations.append("No constant columns found in the dataset.")
-
-        self.recommendations['Constant Columns'] = recommendations
+        self.findings['Constant Columns'] = [
+            Finding('Constant Columns', column.name, 'constant', True) for column in self.profile if column.is_constant
+        ]
 
+    @instrumented()
+    @register_check('Imputation', needs={'null_count': None})
     def check_imputation(self):
         """
         Provide recommendations for imputing missing values if they exist in the dataset.
         """
-        recommendations = []
-        missing_values = self.dataset.isnull().sum()
+        columns_with_missing = sum(1 for column in self.profile if column.null_count > 0)
+        self.findings['Imputation'] = [Finding('Imputation', None, 'columns_with_missing', columns_with_missing)]
 
-        if missing_values.sum() > 0:
-            recommendations.append(" The data has missing imputations, consider the following imputation techniques:")
-            recommendations.append("- Simple imputation: mean, median, or mode")
-            recommendations.append("- Advanced imputation: KNN imputer, MICE, or domain-specific methods")
-            recommendations.append("- For time series data, consider forward fill or backward fill")
-            recommendations.append("- Create a binary column to indicate where values were imputed")
-        else:
-            recommendations.append("No missing values found, imputation is not necessary.")
+    @instrumented(NUMERIC, CATEGORICAL)
+    @register_check('Correlations', needs={'moments': (NUMERIC,), 'distinct': (CATEGORICAL,)})
+    def check_correlations(self):
+        """
+        Find redundant features: near-duplicate and highly correlated pairs of numeric columns (Pearson or
+        Spearman) and strongly associated pairs of categorical columns (Cramér's V).
+        """
+        numeric = [column for column in self.profile.of_kind(NUMERIC) if column.std]
+        categorical = [column for column in self.profile.of_kind(CATEGORICAL)
+                       if column.distinct is not None and 1 < column.distinct <= MAX_CATEGORIES]
+        findings = []
+        if len(numeric) > 1 or len(categorical) > 1:
+            result = self._correlate(numeric, categorical)
+            if result is None:
+                self.findings.pop('Correlations', None)
+                return
+            accumulator, rows = result
+            n_rows = self.population_rows or self.profile.n_rows
+            if rows < n_rows:
+                findings.append(Finding('Correlations', None, 'sample_rows', rows, {'rows': n_rows}))
+            for column, other, statistic, value in accumulator.pairs(CORRELATION_THRESHOLD):
+                metric = 'near_duplicate' if abs(value) >= DUPLICATE_THRESHOLD else 'correlated'
+                findings.append(Finding('Correlations', column, metric, value, {'other': other, 'statistic': statistic}))
+        self.findings['Correlations'] = findings
+
+    def snapshot(self, path=None):
+        """
+        Summarize the dataset into a compact snapshot that later versions of it can be compared against.
+
+        The snapshot holds the null counts and moments of the profile, plus quantile
+        sketches of the numeric columns, the most frequent values of the categorical
+        ones and distinct-count sketches of all of them; see drift.compare_snapshots.
+
+        :param path: optional file path to write the snapshot to as JSON
+        :return: DatasetSnapshot instance
+        """
+        self.require({'null_count': None, 'moments': (NUMERIC,)})
+        accumulator = SnapshotAccumulator([column.name for column in self.profile],
+                                          [column.kind for column in self.profile])
+        snapshot = DatasetSnapshot.from_profile(self.profile, self._accumulate_snapshot(accumulator),
+                                                n_rows=self.population_rows)
+        if path is not None:
+            snapshot.save(path)
+        return snapshot
+
+    def timings(self):
+        """
+        Return the recorded stage metrics as a list of plain dicts; empty when instrumentation is disabled.
+        """
+        return [] if self.instrumentation is None else self.instrumentation.to_records()
+
+    def to_records(self):
+        """
+        Return all findings as a list of plain dicts (category, column, metric, value, detail).
+        """
+        return to_records(self.findings)
+
+    def to_json(self, path=None, **json_kwargs):
+        """
+        Serialize all findings to JSON, optionally writing them to a file.
+
+        :param path: optional file path to write to
+        :param json_kwargs: extra keyword arguments passed to json.dumps
+        :return: JSON string
+        """
+        return to_json(self.findings, path, **json_kwargs)
 
-        self.recommendations['Imputation'] = recommendations
+    def to_arrow(self):
+        """
+        Return all findings as a pyarrow Table; requires pyarrow.
+        """
+        return to_arrow(self.findings)
 
 
-def analyze_dataset(dataset):
+def analyze_dataset(dataset, distinct_error=None, sample_size=None, stratify=None, random_state=None,
+                    n_jobs=1, backend='thread', cache=None, instrument=None, outlier_method='zscore',
+                    correlation_method='pearson', checks=None):
     """
     Analyze a dataset using the DatasetAnalyzer class and print the recommendations.
 
     :param dataset: pandas DataFrame to be analyzed
+    :param distinct_error: relative standard error allowed for approximate distinct counts, or None for exact counts
+    :param sample_size: analyze a random sample of this many rows instead of the whole dataset
+    :param stratify: column label to stratify the sample on, or None for a uniform sample
+    :param random_state: seed or numpy Generator used for sampling
+    :param n_jobs: number of workers the columns are split across; -1 uses all cores
+    :param backend: 'thread' or 'process'
+    :param cache: ProfileCache or directory path reusing statistics of unchanged columns across runs
+    :param instrument: True or an Instrumentation instance to record per-check timings
+    :param outlier_method: 'zscore', 'iqr', 'mad' or 'isolation', see DatasetAnalyzer
+    :param correlation_method: 'pearson' or 'spearman', see DatasetAnalyzer
+    :param checks: names of the registered checks to run, or None for all, see DatasetAnalyzer.analyze
     :return: DatasetAnalyzer instance with completed analysis
     """
-    analyzer = DatasetAnalyzer(dataset)
-    analyzer.analyze()
+    analyzer = DatasetAnalyzer(dataset, distinct_error=distinct_error, sample_size=sample_size,
+                               stratify=stratify, random_state=random_state, n_jobs=n_jobs, backend=backend,
+                               cache=cache, instrument=instrument, outlier_method=outlier_method,
+                               correlation_method=correlation_method)
+    analyzer.analyze(checks)
     analyzer.print_recommendations()
     return analyzer
 
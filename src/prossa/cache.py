@@ -0,0 +1,201 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import numpy as np
+from .profile import DatasetProfile
+from .sketches import hash_values
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Layout of the pickled entries; entries written with another format are ignored
+CACHE_FORMAT = 3
+
+
+def column_fingerprint(series, stamp=None, **settings):
+    """
+    Fingerprint a column by its dtype, length and contents.
+
+    Plain numpy columns are hashed from their raw bytes and other columns from their
+    per-value hashes. A caller that already knows when a column changes (for example
+    from a partition modification time) can pass that as ``stamp`` to skip reading
+    the data at all.
+
+    :param series: pandas Series to fingerprint
+    :param stamp: optional value identifying the column contents, used instead of hashing them
+    :param settings: analysis settings the cached statistics depend on
+    :return: hexadecimal fingerprint string
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((str(series.dtype), len(series), sorted(settings.items()))).encode())
+    if stamp is not None:
+        digest.update(repr(stamp).encode())
+    elif isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biufcmM':
+        digest.update(np.ascontiguousarray(series.to_numpy()).view(np.uint8))
+    else:
+        digest.update(hash_values(series))
+    return digest.hexdigest()
+
+
+def combine_fingerprints(keys, **settings):
+    """
+    Fingerprint a group of columns, e.g. for statistics over pairs of them.
+
+    :param keys: column fingerprints, in column order
+    :param settings: analysis settings the cached statistics depend on
+    :return: hexadecimal fingerprint string
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((list(keys), sorted(settings.items()))).encode())
+    return digest.hexdigest()
+
+
+class ProfileCache:
+    """
+    Persistent cache of per-column statistics keyed by column fingerprint.
+
+    Each entry is a small pickle file in ``directory`` holding a dict of named
+    results: the column profile, outlier counts, downcast advice and so on. Entries
+    are stamped with CACHE_FORMAT and entries of another format read as misses.
+    Reading an entry refreshes its modification time, and when the total size exceeds
+    ``max_bytes`` the least recently used entries are deleted first.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Open (and create if needed) a cache directory.
+
+        :param directory: path of the cache directory
+        :param max_bytes: size budget of the cache on disk
+        """
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+        self._size = sum(entry.stat().st_size for entry in self._entries())
+
+    def _entries(self):
+        return [entry for entry in os.scandir(self.directory) if entry.name.endswith('.pkl')]
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key):
+        """
+        Look up an entry and mark it as recently used.
+
+        :param key: column fingerprint
+        :return: the cached entry, or None on a miss
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as file:
+                stored = pickle.load(file)
+            os.utime(path)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        if not isinstance(stored, dict) or stored.get('format') != CACHE_FORMAT:
+            return None
+        return stored['entry']
+
+    def put(self, key, entry):
+        """
+        Store an entry, evicting least recently used entries beyond the size budget.
+
+        :param key: column fingerprint
+        :param entry: picklable value to store
+        """
+        path = self._path(key)
+        previous = os.path.getsize(path) if os.path.exists(path) else 0
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(handle, 'wb') as file:
+            pickle.dump({'format': CACHE_FORMAT, 'entry': entry}, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+        self._size += os.path.getsize(path) - previous
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """
+        Delete least recently used entries until the cache fits its size budget.
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        self._size = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if self._size <= self.max_bytes:
+                break
+            size = entry.stat().st_size
+            try:
+                os.remove(entry.path)
+            except OSError:
+                continue
+            self._size -= size
+
+    def clear(self):
+        """
+        Delete every entry of the cache.
+        """
+        for entry in self._entries():
+            os.remove(entry.path)
+        self._size = 0
+
+    def profile_frame(self, dataset, stamps=None, sketch_precision=None, n_jobs=1, backend='thread', on_column=None):
+        """
+        Profile a DataFrame, reusing cached statistics of unchanged columns.
+
+        Only the columns whose fingerprint is not in the cache are profiled; their
+        statistics are then stored for the next run.
+
+        :param dataset: pandas DataFrame to profile
+        :param stamps: optional dict mapping column labels to stamps, see column_fingerprint
+        :param sketch_precision: HyperLogLog precision for approximate distinct counts, or None for exact counts
+        :param n_jobs: number of workers profiling the changed columns
+        :param backend: 'thread' or 'process'
+        :param on_column: optional per-column timing callback for the profiled columns, see DatasetProfile.from_frame
+        :return: tuple (DatasetProfile, list of column fingerprints in column order)
+        """
+        stamps = stamps or {}
+        keys = [
+            column_fingerprint(series, stamps.get(name), sketch_precision=sketch_precision)
+            for name, series in dataset.items()
+        ]
+        columns = []
+        missing = []
+        for position, (key, (name, series)) in enumerate(zip(keys, dataset.items())):
+            entry = self.get(key)
+            if entry is None:
+                columns.append(None)
+                missing.append(position)
+            else:
+                column = entry['profile']
+                column.name = name
+                columns.append(column)
+
+        if missing:
+            computed = DatasetProfile.from_frame(dataset.iloc[:, missing], sketch_precision=sketch_precision,
+                                                 n_jobs=n_jobs, backend=backend, on_column=on_column)
+            for position, column in zip(missing, computed):
+                columns[position] = column
+                self.put(keys[position], {'profile': column})
+
+        return DatasetProfile(len(dataset), columns), keys
+
+    def result(self, key, name):
+        """
+        Cached result of a computation on a column or group of columns, or None if it was not stored yet.
+
+        :param key: column fingerprint, see column_fingerprint and combine_fingerprints
+        :param name: name of the result, e.g. 'outliers' or ('downcast', True)
+        """
+        entry = self.get(key)
+        return None if entry is None else entry.get(name)
+
+    def put_result(self, key, name, value):
+        """
+        Store a result next to the others cached under the same fingerprint.
+
+        :param key: column fingerprint, see column_fingerprint and combine_fingerprints
+        :param name: name of the result
+        :param value: picklable result, not None
+        """
+        entry = self.get(key) or {}
+        entry[name] = value
+        self.put(key, entry)
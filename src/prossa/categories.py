@@ -0,0 +1,84 @@
+import time
+from .sketches import SpaceSaving
+
+HEAVY_HITTER_CAPACITY = 1000
+TOP_CATEGORIES = 10
+COVERAGE_TARGET = 0.95
+MIN_SHARE = 0.005
+
+
+def summarize_categories(frame, names, capacity=HEAVY_HITTER_CAPACITY, on_column=None):
+    """
+    Build a heavy-hitter summary of each of some columns of a DataFrame.
+
+    :param frame: pandas DataFrame
+    :param names: column labels
+    :param capacity: number of values tracked per column, see SpaceSaving
+    :param on_column: optional per-column timing callback, see profile.DatasetProfile.from_frame
+    :return: list of SpaceSaving instances, one per column
+    """
+    summaries = []
+    for name in names:
+        started = time.perf_counter()
+        summaries.append(SpaceSaving(capacity).update(frame[name].dropna()))
+        if on_column is not None:
+            on_column(name, time.perf_counter() - started, len(frame))
+    return summaries
+
+
+def summarize_chunks(chunks, names, capacity=HEAVY_HITTER_CAPACITY):
+    """
+    Build heavy-hitter summaries of some columns over a stream of chunks, holding one chunk at a time.
+
+    :param chunks: iterable of pandas DataFrames holding at least the columns
+    :param names: column labels
+    :param capacity: number of values tracked per column
+    :return: list of SpaceSaving instances, one per column
+    """
+    summaries = [SpaceSaving(capacity) for _ in names]
+    for chunk in chunks:
+        for summary, name in zip(summaries, names):
+            summary.update(chunk[name].dropna())
+    return summaries
+
+
+def grouping_advice(summary, top=TOP_CATEGORIES, coverage=COVERAGE_TARGET, min_share=MIN_SHARE):
+    """
+    Suggest which categories of a column to keep and which to group into an 'other' category.
+
+    Categories are kept, most frequent first, until they cover ``coverage`` of the
+    non-missing rows, but a category holding less than ``min_share`` of them is never
+    kept; the count of the last kept category is the suggested cut-off. Shares are
+    computed from the guaranteed counts (``count - error``), so they are lower bounds
+    when the summary evicted values.
+
+    :param summary: SpaceSaving summary of the column
+    :param top: number of most frequent categories to report
+    :param coverage: fraction of rows the kept categories should cover
+    :param min_share: smallest fraction of rows a kept category may hold
+    :return: dict with ``top`` (list of [value, count, share]), ``keep`` (number of categories kept),
+        ``min_count`` (suggested cut-off: categories with fewer rows are grouped, None when none is kept),
+        ``min_share``, ``kept_share``, ``tail_share`` (fraction of rows in the grouped categories) and
+        ``approximate`` (whether the kept counts are lower bounds)
+    """
+    total = summary.total
+    keep = 0
+    kept = 0
+    min_count = None
+    approximate = False
+    for value, count, error in summary.top():
+        if kept >= coverage * total or (count - error) < min_share * total:
+            break
+        keep += 1
+        kept += count - error
+        min_count = count - error if min_count is None else min(min_count, count - error)
+        approximate = approximate or error > 0
+    return {
+        'top': [[value, count - error, (count - error) / total] for value, count, error in summary.top(top)],
+        'keep': keep,
+        'min_count': min_count,
+        'min_share': min_share,
+        'kept_share': kept / total if total else 0.0,
+        'tail_share': 1 - kept / total if total else 0.0,
+        'approximate': approximate,
+    }
@@ -0,0 +1,150 @@
+import functools
+from .findings import RENDERERS
+from .profile import DEPENDENCIES
+
+
+class Check:
+    """
+    A check registered with register_check: what it is called, where its findings go and what it needs.
+    """
+
+    def __init__(self, name, category, needs, function):
+        """
+        Initialize a registered check.
+
+        :param name: name the check is selected by, e.g. 'check_missing_values'
+        :param category: category of the findings it produces
+        :param needs: dict mapping the statistics the check reads (see profile.STATISTICS) to the dtype
+            classes of the columns it reads them for, or None for all columns
+        :param function: callable taking the analyzer, computing the statistics before running the check
+        """
+        self.name = name
+        self.category = category
+        self.needs = needs
+        self.function = function
+
+    def __repr__(self):
+        return f"Check({self.name!r}, {self.category!r}, {self.needs!r})"
+
+
+# Registered checks by name, in the order DatasetAnalyzer.analyze() runs them
+REGISTRY = {}
+
+
+def register_check(category, needs=None, name=None, render=None):
+    """
+    Register a function as a check run by DatasetAnalyzer.analyze().
+
+    Before the function runs, the statistics listed in ``needs`` are computed for
+    the columns of the given dtype classes, unless the profile already carries them.
+    The function reads them from ``analyzer.profile``; if it returns findings, they
+    are stored under ``category``. The built-in checks are DatasetAnalyzer methods
+    registered the same way::
+
+        @register_check('Skewness', needs={'moments': (NUMERIC,)})
+        def check_skewness(analyzer):
+            return [Finding('Skewness', column.name, 'mean_median_gap', ...) for column in ...]
+
+    :param category: category of the findings of the check
+    :param needs: dict mapping statistic names to a tuple of dtype classes (NUMERIC, CATEGORICAL, OTHER),
+        or to None for all columns
+    :param name: name the check is selected by; the function name by default
+    :param render: optional function rendering the findings of ``category`` as a list of strings;
+        findings of categories without a renderer are listed one per line
+    :return: decorator
+    """
+    needs = dict(needs or {})
+    for statistic in needs:
+        if statistic not in DEPENDENCIES:
+            raise ValueError(f"Unknown statistic '{statistic}', expected one of {tuple(DEPENDENCIES)}")
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(analyzer, *args, **kwargs):
+            analyzer.require(needs)
+            findings = function(analyzer, *args, **kwargs)
+            if findings is not None:
+                analyzer.findings[category] = list(findings)
+            return findings
+
+        check_name = name or function.__name__
+        REGISTRY[check_name] = Check(check_name, category, needs, wrapper)
+        if render is not None:
+            RENDERERS[category] = render
+        return wrapper
+    return decorator
+
+
+def resolve_checks(names=None):
+    """
+    Look up registered checks by name.
+
+    :param names: check names, with or without their 'check_' prefix, or None for all registered checks
+    :return: list of Check instances in registration order
+    """
+    if names is None:
+        return list(REGISTRY.values())
+    selected = set()
+    for name in names:
+        check = REGISTRY.get(name) or REGISTRY.get(f"check_{name}")
+        if check is None:
+            raise ValueError(f"Unknown check '{name}', expected one of {tuple(REGISTRY)}")
+        selected.add(check.name)
+    return [check for check in REGISTRY.values() if check.name in selected]
+
+
+def topological_order(statistics):
+    """
+    Order statistics so that every statistic comes after the statistics it is computed from.
+
+    :param statistics: names of statistics, see profile.DEPENDENCIES
+    :return: list of the same names
+    """
+    order = []
+    visiting = set()
+
+    def visit(statistic):
+        if statistic in order:
+            return
+        if statistic in visiting:
+            raise ValueError(f"Statistic '{statistic}' depends on itself")
+        visiting.add(statistic)
+        for dependency in DEPENDENCIES[statistic]:
+            visit(dependency)
+        visiting.discard(statistic)
+        order.append(statistic)
+
+    for statistic in statistics:
+        visit(statistic)
+    return order
+
+
+def schedule(needs, columns):
+    """
+    Plan the statistics to compute for a set of requirements, each once and only where missing.
+
+    Every requirement selects columns by dtype class; a statistic is planned for the
+    selected columns that do not carry it yet, and its dependencies for the same columns.
+
+    :param needs: iterable of dicts mapping statistic names to dtype classes or None, see register_check
+    :param columns: ColumnProfile instances of the profile, in column order
+    :return: list of tuples (statistic, list of ColumnProfile instances in column order), in topological order
+    """
+    pending = {}
+
+    def add(statistic, selected):
+        planned = pending.setdefault(statistic, set())
+        new = [column for column in selected if id(column) not in planned and not column.has(statistic)]
+        planned.update(id(column) for column in new)
+        for dependency in DEPENDENCIES[statistic]:
+            add(dependency, new)
+
+    for requirement in needs:
+        for statistic, kinds in requirement.items():
+            add(statistic, [column for column in columns if kinds is None or column.kind in kinds])
+    plan = []
+    for statistic in topological_order(pending):
+        selected = [column for column in columns if id(column) in pending[statistic]]
+        if selected:
+            plan.append((statistic, selected))
+    return plan
@@ -0,0 +1,371 @@
+import numbers
+import os
+import numpy as np
+from .analyzer import DatasetAnalyzer
+from .outliers import count_profiled_outliers, count_chunked_method_outliers
+from .correlation import correlate_chunks
+from .inference import head_rows
+from .categories import summarize_chunks
+from .profile import STATISTICS, ColumnProfile, DatasetProfile, NUMERIC, CATEGORICAL, dtype_kind
+
+PARQUET_SUFFIXES = ('.parquet', '.pq')
+ARROW_SUFFIXES = ('.arrow', '.feather', '.ipc')
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as error:
+        raise ImportError("Reading Parquet and Arrow files requires pyarrow; install it with 'pip install pyarrow'") from error
+    return pyarrow
+
+
+def _to_pandas(table):
+    """
+    Convert an Arrow table to pandas without the stored pandas metadata, one block per column.
+    """
+    return table.replace_schema_metadata(None).to_pandas(split_blocks=True)
+
+
+def _data_columns(schema):
+    """
+    Names of the columns of an Arrow schema, leaving out stored pandas index columns.
+    """
+    index_columns = {name for name in (schema.pandas_metadata or {}).get('index_columns', []) if isinstance(name, str)}
+    return [name for name in schema.names if name not in index_columns]
+
+
+def pandas_dtype(dtype, null_count):
+    """
+    Dtype pandas gives a column of a known Arrow type and null count, without reading it.
+
+    :param dtype: dtype of the column converted from an empty Arrow table
+    :param null_count: number of nulls in the column
+    :return: numpy or pandas dtype
+    """
+    if null_count and isinstance(dtype, np.dtype):
+        if dtype.kind in 'iu':
+            return np.dtype('float64')
+        if dtype.kind == 'b':
+            return np.dtype('O')
+    return dtype
+
+
+def holds_nan(dtype):
+    """
+    Whether a column of this dtype may hold NaN, which pandas counts as missing but Arrow and Parquet
+    null counts leave out.
+
+    :param dtype: numpy or pandas dtype
+    :return: bool
+    """
+    return isinstance(dtype, np.dtype) and dtype.kind in 'fc'
+
+
+class ParquetSource:
+    """
+    A Parquet file read column by column or row group by row group.
+
+    Row group statistics in the footer give null counts and min/max of every column
+    without decoding any data pages, except float columns: NaN values are neither
+    nulls nor part of min/max there, so these columns have to be read.
+    """
+
+    def __init__(self, path, columns=None):
+        """
+        Open a Parquet file and read its footer.
+
+        :param path: path to the Parquet file
+        :param columns: names of the columns to analyze, or None for all
+        """
+        _import_pyarrow()
+        import pyarrow.parquet as pq
+
+        self.path = os.fspath(path)
+        self.file = pq.ParquetFile(self.path, memory_map=True)
+        schema = self.file.schema_arrow
+        self.columns = list(columns) if columns is not None else _data_columns(schema)
+        self.num_rows = self.file.metadata.num_rows
+        self._dtypes = _to_pandas(schema.remove_metadata().empty_table().select(self.columns)).dtypes
+
+    def statistics(self):
+        """
+        Column statistics found in the file metadata.
+
+        :return: list of tuples (name, dtype, null count or None, min or None, max or None) in column order;
+            the null count is None when the metadata cannot give the pandas missing count
+        """
+        metadata = self.file.metadata
+        positions = {metadata.schema.column(position).path: position for position in range(metadata.num_columns)}
+        result = []
+        for name, dtype in zip(self.columns, self._dtypes):
+            position = positions.get(name)
+            null_count, minimum, maximum = 0, None, None
+            exact = position is not None and not holds_nan(dtype)
+            for group in range(metadata.num_row_groups):
+                statistics = metadata.row_group(group).column(position).statistics if exact else None
+                if statistics is None or not getattr(statistics, 'has_null_count', True):
+                    null_count = None
+                    exact = False
+                    break
+                null_count += statistics.null_count
+                if not statistics.has_min_max:
+                    exact = False
+                    continue
+                if not (getattr(statistics, 'is_min_value_exact', True) and getattr(statistics, 'is_max_value_exact', True)):
+                    exact = False
+                    continue
+                minimum = statistics.min if minimum is None else min(minimum, statistics.min)
+                maximum = statistics.max if maximum is None else max(maximum, statistics.max)
+            if not exact:
+                minimum = maximum = None
+            result.append((name, dtype if null_count is None else pandas_dtype(dtype, null_count),
+                           null_count, minimum, maximum))
+        return result
+
+    def read(self, columns):
+        """
+        Read whole columns, decoding only their column chunks.
+
+        :param columns: names of the columns to read
+        :return: pandas DataFrame
+        """
+        return _to_pandas(self.file.read(columns=list(columns), use_pandas_metadata=False))
+
+    def chunks(self, columns):
+        """
+        Read columns one row group at a time.
+
+        :param columns: names of the columns to read
+        :return: generator of pandas DataFrames
+        """
+        for group in range(self.file.num_row_groups):
+            yield _to_pandas(self.file.read_row_group(group, columns=list(columns), use_pandas_metadata=False))
+
+
+class ArrowSource:
+    """
+    An Arrow IPC (Feather v2) file, memory-mapped so that record batches are read without copying.
+
+    The null count of each column is stored with every record batch; min/max are not.
+    """
+
+    def __init__(self, path, columns=None):
+        """
+        Memory-map an Arrow IPC file.
+
+        :param path: path to the Arrow IPC or Feather v2 file
+        :param columns: names of the columns to analyze, or None for all
+        """
+        pa = _import_pyarrow()
+
+        self.path = os.fspath(path)
+        self.reader = pa.ipc.open_file(pa.memory_map(self.path, 'r'))
+        schema = self.reader.schema
+        self.columns = list(columns) if columns is not None else _data_columns(schema)
+        self.num_rows = sum(self.reader.get_batch(index).num_rows for index in range(self.reader.num_record_batches))
+        self._dtypes = _to_pandas(schema.remove_metadata().empty_table().select(self.columns)).dtypes
+
+    def statistics(self):
+        """
+        Column statistics found in the record batch headers.
+
+        NaN values of float columns are counted from the memory-mapped values, since
+        the headers count nulls only.
+
+        :return: list of tuples (name, dtype, null count, None, None) in column order
+        """
+        import pyarrow.compute as pc
+
+        null_counts = dict.fromkeys(self.columns, 0)
+        floats = [name for name, dtype in zip(self.columns, self._dtypes) if holds_nan(dtype)]
+        for index in range(self.reader.num_record_batches):
+            batch = self.reader.get_batch(index)
+            for name in self.columns:
+                null_counts[name] += batch.column(name).null_count
+            for name in floats:
+                null_counts[name] += pc.sum(pc.is_nan(batch.column(name))).as_py() or 0
+        return [(name, pandas_dtype(dtype, null_counts[name]), null_counts[name], None, None)
+                for name, dtype in zip(self.columns, self._dtypes)]
+
+    def read(self, columns):
+        """
+        Read whole columns from the memory-mapped batches.
+
+        :param columns: names of the columns to read
+        :return: pandas DataFrame
+        """
+        return _to_pandas(self.reader.read_all().select(list(columns)))
+
+    def chunks(self, columns):
+        """
+        Read columns one record batch at a time.
+
+        :param columns: names of the columns to read
+        :return: generator of pandas DataFrames
+        """
+        for index in range(self.reader.num_record_batches):
+            yield _to_pandas(self.reader.get_batch(index).select(list(columns)))
+
+
+def open_source(path, columns=None):
+    """
+    Open a Parquet or Arrow IPC/Feather file, chosen by its suffix.
+
+    :param path: path to the file
+    :param columns: names of the columns to analyze, or None for all
+    :return: ParquetSource or ArrowSource
+    """
+    suffix = os.path.splitext(os.fspath(path))[1].lower()
+    if suffix in PARQUET_SUFFIXES:
+        return ParquetSource(path, columns)
+    if suffix in ARROW_SUFFIXES:
+        return ArrowSource(path, columns)
+    raise ValueError(f"Unsupported columnar file '{path}', expected one of {PARQUET_SUFFIXES + ARROW_SUFFIXES}")
+
+
+class ColumnarDatasetAnalyzer(DatasetAnalyzer):
+    """
+    A DatasetAnalyzer for Parquet and Arrow files that reads only what each check needs.
+
+    The profile starts from the file metadata: dtypes from the schema, and null counts
+    and min/max from the footer statistics. Column values are decoded only when a check
+    needs statistics the metadata cannot give (moments for outliers, distinct counts,
+    constancy of columns without min/max), and then only for the columns involved.
+    Columns whose min equals their max are constant and are never read.
+    """
+
+    def __init__(self, source, distinct_error=None, n_jobs=1, backend='thread', instrument=None, outlier_method='zscore',
+                 correlation_method='pearson', infer_types=True):
+        """
+        Initialize the ColumnarDatasetAnalyzer with a file.
+
+        :param source: path of a Parquet or Arrow IPC/Feather file, or a ParquetSource or ArrowSource
+        :param distinct_error: relative standard error allowed for approximate distinct counts, or None for
+            exact counts; approximate counts read columns one row group at a time instead of whole
+        :param n_jobs: number of workers the columns are split across; -1 uses all cores
+        :param backend: 'thread' or 'process'
+        :param instrument: True or an Instrumentation instance to record per-check timings, see DatasetAnalyzer
+        :param outlier_method: 'zscore', 'iqr', 'mad' or 'isolation', see DatasetAnalyzer
+        :param correlation_method: 'pearson' or 'spearman'; correlations are accumulated row group by row group
+            over the columns involved only
+        :param infer_types: whether check_data_types infers the types of object columns from the first
+            row groups
+        """
+        super().__init__(None, distinct_error=distinct_error, n_jobs=n_jobs, backend=backend, instrument=instrument,
+                         outlier_method=outlier_method, correlation_method=correlation_method,
+                         infer_types=infer_types)
+        self.source = open_source(source) if isinstance(source, (str, os.PathLike)) else source
+
+    def _build_profile(self, on_column=None):
+        n_rows = self.source.num_rows
+        columns = []
+        unknown = []
+        for name, dtype, null_count, minimum, maximum in self.source.statistics():
+            if null_count is None:
+                columns.append(None)
+                unknown.append(len(columns) - 1)
+                continue
+            column = ColumnProfile(name, dtype, dtype_kind(dtype), n_rows, int(null_count))
+            if column.count == 0:
+                column.varies = False
+            elif minimum is not None and maximum is not None:
+                column.min, column.max = minimum, maximum
+                column.varies = bool(minimum != maximum)
+                if not column.varies:
+                    column.first_value = minimum
+                    if column.kind == NUMERIC and isinstance(minimum, numbers.Real):
+                        column.mean, column.std = float(minimum), 0.0
+                    elif column.kind == CATEGORICAL:
+                        column.distinct = 1
+            columns.append(column)
+
+        if unknown:
+            names = [self.source.columns[position] for position in unknown]
+            for position, column in zip(unknown, self._read_profiles(names, on_column)):
+                columns[position] = column
+        return DatasetProfile(n_rows, columns)
+
+    def _read_profiles(self, names, on_column=None):
+        """
+        Profile columns from their values: whole columns for exact counts, row group by row group otherwise.
+        """
+        precision = self._sketch_precision()
+        if precision is None:
+            return [
+                DatasetProfile.from_frame(self.source.read([name]), on_column=on_column)[name]
+                for name in names
+            ]
+        return list(DatasetProfile.from_chunks(self.source.chunks(names), sketch_precision=precision,
+                                               n_jobs=self.n_jobs, backend=self.backend, on_column=on_column))
+
+    def _require(self, columns, *statistics):
+        statistics = statistics or STATISTICS
+        pending = [column for column in columns if not all(column.has(statistic) for statistic in statistics)]
+        if pending:
+            with self._stage('read') as metrics:
+                read = self._read_profiles([column.name for column in pending],
+                                           on_column=metrics and metrics.add_column)
+                for column, computed in zip(pending, read):
+                    for attribute in ('min', 'max', 'mean', 'std', 'distinct', 'sketch', 'first_value', 'varies'):
+                        setattr(column, attribute, getattr(computed, attribute))
+                if metrics is not None:
+                    metrics.rows, metrics.columns = self.source.num_rows, len(pending)
+        return columns
+
+    def _count_outliers(self, columns):
+        counts = [0] * len(columns)
+        if columns:
+            for chunk in self.source.chunks([column.name for column in columns]):
+                chunk_counts = count_profiled_outliers(chunk, columns, n_jobs=self.n_jobs, backend=self.backend)
+                counts = [total + count for total, count in zip(counts, chunk_counts)]
+        return counts
+
+    def _count_method_outliers(self, columns):
+        names = [column.name for column in columns]
+        counts = count_chunked_method_outliers(lambda: self.source.chunks(names), names, self.outlier_method)
+        return [counts[name] for name in names]
+
+    def _inference_rows(self, names):
+        return head_rows(self.source.chunks(names))
+
+    def _accumulate_snapshot(self, accumulator):
+        for chunk in self.source.chunks(accumulator.names):
+            accumulator.update(chunk)
+        return accumulator
+
+    def _summarize_categories(self, columns):
+        names = [column.name for column in columns]
+        return summarize_chunks(self.source.chunks(names), names)
+
+    def _correlate(self, numeric, categorical):
+        names = [column.name for column in numeric + categorical]
+        return (correlate_chunks(lambda: self.source.chunks(names), numeric, categorical, self.correlation_method),
+                self.source.num_rows)
+
+    def update(self, batch):
+        raise ValueError("update() is not supported on a ColumnarDatasetAnalyzer")
+
+
+def analyze_columnar(path, columns=None, distinct_error=None, n_jobs=1, backend='thread', instrument=None,
+                     outlier_method='zscore', correlation_method='pearson', checks=None):
+    """
+    Analyze a Parquet or Arrow IPC/Feather file using the ColumnarDatasetAnalyzer class and print the recommendations.
+
+    :param path: path to the file
+    :param columns: names of the columns to analyze, or None for all
+    :param distinct_error: relative standard error allowed for approximate distinct counts, or None for exact counts
+    :param n_jobs: number of workers the columns are split across; -1 uses all cores
+    :param backend: 'thread' or 'process'
+    :param instrument: True or an Instrumentation instance to record per-check timings
+    :param outlier_method: 'zscore', 'iqr', 'mad' or 'isolation', see DatasetAnalyzer
+    :param correlation_method: 'pearson' or 'spearman', see DatasetAnalyzer
+    :param checks: names of the registered checks to run, or None for all, see DatasetAnalyzer.analyze
+    :return: ColumnarDatasetAnalyzer instance with completed analysis
+    """
+    analyzer = ColumnarDatasetAnalyzer(open_source(path, columns), distinct_error=distinct_error, n_jobs=n_jobs,
+                                       backend=backend, instrument=instrument, outlier_method=outlier_method,
+                                       correlation_method=correlation_method)
+    analyzer.analyze(checks)
+    analyzer.print_recommendations()
+    return analyzer
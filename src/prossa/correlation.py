@@ -0,0 +1,401 @@
+import math
+import numpy as np
+import pandas as pd
+from .outliers import numeric_block
+from .sketches import KLLSketch, update_sketches
+
+CORRELATION_METHODS = ('pearson', 'spearman')
+CORRELATION_THRESHOLD = 0.9
+DUPLICATE_THRESHOLD = 0.999
+CORRELATION_SAMPLE_ROWS = 20000
+MAX_CATEGORIES = 50
+COLUMN_BLOCK = 256
+BLOCK_BYTES = 2 ** 26
+RANK_POINTS = 1025
+
+
+def rank_grid(sketch, points=RANK_POINTS):
+    """
+    Quantiles of a column at evenly spaced ranks, used to map values to approximate ranks.
+
+    :param sketch: KLLSketch of the column
+    :param points: number of quantiles, including the minimum and the maximum
+    :return: numpy array of non-decreasing floats
+    """
+    return np.asarray(sketch.quantile(np.linspace(0, 1, points)), dtype=np.float64)
+
+
+def approximate_ranks(values, grid):
+    """
+    Map values to their approximate normalized ranks in [0, 1] by interpolating a quantile grid.
+
+    Values equal to a run of grid points get the middle of the run, like average ranks of ties.
+
+    :param values: numpy array of floats, missing values as NaN
+    :param grid: quantile grid, see rank_grid
+    :return: numpy array of floats, NaN where ``values`` is NaN
+    """
+    last = len(grid) - 1
+    ranks = np.interp(values, grid, np.linspace(0, 1, len(grid)))
+    left = np.searchsorted(grid, values, side='left')
+    right = np.searchsorted(grid, values, side='right')
+    ties = right - left > 1
+    ranks[ties] = (left[ties] + right[ties] - 1) / (2 * last)
+    ranks[np.isnan(values)] = np.nan
+    return ranks
+
+
+def _add_products(out, left, right, block_size, symmetric):
+    """
+    Add ``left.T @ right`` to ``out`` one block of columns at a time.
+
+    For symmetric products only the blocks on and above the diagonal are computed.
+    """
+    width = left.shape[1]
+    for start in range(0, width, block_size):
+        stop = start + block_size
+        first = start if symmetric else 0
+        for other in range(first, right.shape[1], block_size):
+            out[start:stop, other:other + block_size] += left[:, start:stop].T @ right[:, other:other + block_size]
+
+
+class CorrelationAccumulator:
+    """
+    Pairwise correlations of numeric columns and Cramér's V of categorical columns, accumulated over chunks.
+
+    Numeric values are standardized with a fixed center and scale and cast to
+    float32, then cross products of all columns are added up with blocked matrix
+    products, so one pass over the rows gives every pair at once. Missing values are
+    handled pairwise (like ``DataFrame.corr``): once a chunk has any, per-pair sums,
+    sums of squares and counts are accumulated as well. Spearman ranks each column
+    over all its values, where ``DataFrame.corr`` re-ranks the rows both columns of
+    a pair hold, so the two differ slightly when values are missing. Categorical values are
+    one-hot encoded against per-column vocabularies that grow chunk by chunk, and
+    blocked products of the indicator matrices give the contingency table of every
+    pair, kept one table per pair. Columns with more than ``max_categories``
+    distinct values are left out.
+
+    Memory is about four ``p x p`` float64 matrices for ``p`` numeric columns (one
+    without missing values) and one table of at most ``max_categories x max_categories``
+    per pair of categorical columns; temporaries are bounded by ``BLOCK_BYTES``. Accumulators built on different
+    chunks with the same columns, center, scale and grids merge into one.
+    """
+
+    def __init__(self, numeric, categorical=(), method='pearson', center=None, scale=None, grids=None,
+                 block_size=COLUMN_BLOCK, max_categories=MAX_CATEGORIES):
+        """
+        Initialize an empty accumulator.
+
+        :param numeric: labels of the numeric columns
+        :param categorical: labels of the categorical columns
+        :param method: 'pearson', or 'spearman' for the Pearson correlation of the ranks
+        :param center: value subtracted from each numeric column (or its ranks) before the products,
+            ideally its mean; zero by default
+        :param scale: value each centered numeric column is divided by, ideally its standard deviation;
+            one by default
+        :param grids: optional quantile grids of the numeric columns, see rank_grid; with 'spearman' values
+            are mapped to approximate ranks through them, so chunks can be fed one at a time. Without grids
+            'spearman' ranks exactly and update() must be given all rows at once
+        :param block_size: number of columns per block of the matrix products
+        :param max_categories: largest number of distinct values of a categorical column
+        """
+        if method not in CORRELATION_METHODS:
+            raise ValueError(f"Unknown correlation method '{method}', expected one of {CORRELATION_METHODS}")
+        self.numeric = list(numeric)
+        self.categorical = list(categorical)
+        self.method = method
+        width = len(self.numeric)
+        self.center = np.zeros(width) if center is None else np.asarray(center, dtype=np.float64)
+        scale = np.ones(width) if scale is None else np.asarray(scale, dtype=np.float64)
+        self.scale = np.where(np.isfinite(scale) & (scale > 0), scale, 1.0)
+        self.grids = grids
+        self.block_size = block_size
+        self.max_categories = max_categories
+        self.rows = 0
+        self.products = np.zeros((width, width))
+        self.column_sums = np.zeros(width)
+        self.column_squares = np.zeros(width)
+        self.sums = None
+        self.squares = None
+        self.counts = None
+        self.vocabularies = [{} for _ in self.categorical]
+        self.dropped = set()
+        self.tables = {}
+
+    @classmethod
+    def from_profiles(cls, numeric, categorical=(), method='pearson', grids=None, **kwargs):
+        """
+        Create an accumulator centered and scaled with the moments of profiled columns.
+
+        :param numeric: numeric ColumnProfile instances with a mean and a non-zero standard deviation
+        :param categorical: categorical ColumnProfile instances
+        :param method: 'pearson' or 'spearman'
+        :param grids: optional quantile grids for approximate ranks, see CorrelationAccumulator
+        :param kwargs: other keyword arguments of CorrelationAccumulator
+        :return: CorrelationAccumulator instance
+        """
+        if method == 'spearman':
+            # Normalized ranks are close to uniform on [0, 1]
+            center, scale = np.full(len(numeric), 0.5), np.full(len(numeric), math.sqrt(1 / 12))
+        else:
+            center = [column.mean for column in numeric]
+            scale = [column.std for column in numeric]
+        return cls([column.name for column in numeric], [column.name for column in categorical], method,
+                   center=center, scale=scale, grids=grids, **kwargs)
+
+    def _pairwise_terms(self):
+        """
+        Per-pair sums, sums of squares and counts, built from the per-column totals while nothing is missing.
+        """
+        if self.sums is not None:
+            return self.sums, self.squares, self.counts
+        width = len(self.numeric)
+        return (np.repeat(self.column_sums[:, None], width, axis=1),
+                np.repeat(self.column_squares[:, None], width, axis=1),
+                np.full((width, width), float(self.rows)))
+
+    def _track_missing(self):
+        if self.sums is None:
+            self.sums, self.squares, self.counts = self._pairwise_terms()
+
+    def _update_numeric(self, block):
+        if self.grids is not None and self.method == 'spearman':
+            block = np.column_stack([approximate_ranks(values, grid) for values, grid in zip(block.T, self.grids)])
+        values = ((block - self.center) / self.scale).astype(np.float32)
+        missing = np.isnan(values)
+        if missing.any():
+            self._track_missing()
+            values[missing] = 0
+        _add_products(self.products, values, values, self.block_size, symmetric=True)
+        if self.sums is None:
+            self.column_sums += values.sum(axis=0, dtype=np.float64)
+            self.column_squares += np.square(values).sum(axis=0, dtype=np.float64)
+            return
+        present = (~missing).astype(np.float32)
+        _add_products(self.sums, values, present, self.block_size, symmetric=False)
+        _add_products(self.squares, np.square(values), present, self.block_size, symmetric=False)
+        _add_products(self.counts, present, present, self.block_size, symmetric=True)
+
+    def _add_categories(self, position, values):
+        """
+        Give unseen values of a categorical column the next free rows or columns of its contingency tables.
+
+        :return: False if the column now has too many categories and is left out
+        """
+        vocabulary = self.vocabularies[position]
+        for value in values:
+            if value not in vocabulary:
+                vocabulary[value] = len(vocabulary)
+        if len(vocabulary) > self.max_categories:
+            self._drop(position)
+            return False
+        return True
+
+    def _drop(self, position):
+        self.dropped.add(position)
+        for pair in [pair for pair in self.tables if position in pair]:
+            del self.tables[pair]
+
+    def _table(self, first, second):
+        """
+        Contingency table of two categorical columns, grown to their current vocabularies.
+        """
+        shape = (len(self.vocabularies[first]), len(self.vocabularies[second]))
+        table = self.tables.get((first, second))
+        if table is None or table.shape != shape:
+            grown = np.zeros(shape)
+            if table is not None:
+                grown[:table.shape[0], :table.shape[1]] = table
+            table = self.tables[first, second] = grown
+        return table
+
+    def _column_groups(self, offsets):
+        """
+        Split consecutive categorical columns into groups whose indicators fit in one block of columns.
+
+        :param offsets: first indicator column of each categorical column, followed by the total width
+        :return: list of (start, stop) ranges of columns
+        """
+        groups = []
+        start = 0
+        for stop in range(1, len(offsets) - 1):
+            if offsets[stop + 1] - offsets[start] > self.block_size:
+                groups.append((start, stop))
+                start = stop
+        return groups + [(start, len(offsets) - 1)]
+
+    def _update_categorical(self, frame, start, stop):
+        codes = {}
+        for position, name in enumerate(self.categorical):
+            if position in self.dropped:
+                continue
+            column_codes, uniques = pd.factorize(frame[name].iloc[start:stop])
+            uniques = list(uniques)
+            if self._add_categories(position, uniques):
+                # Missing values have code -1 and map to the trailing -1
+                lookup = np.array([self.vocabularies[position][value] for value in uniques] + [-1], dtype=np.int64)
+                codes[position] = lookup[column_codes]
+        if not codes:
+            return
+        kept = list(codes)
+        offsets = np.cumsum([0] + [len(self.vocabularies[position]) for position in kept])
+        indicators = np.zeros((stop - start, offsets[-1]), dtype=np.float32)
+        for position, offset in zip(kept, offsets):
+            present = np.flatnonzero(codes[position] >= 0)
+            indicators[present, offset + codes[position][present]] = 1
+        # Each product of two groups of columns fills the tables of every pair across them
+        groups = self._column_groups(offsets)
+        for index, (first_start, first_stop) in enumerate(groups):
+            left = indicators[:, offsets[first_start]:offsets[first_stop]]
+            for second_start, second_stop in groups[index:]:
+                product = left.T @ indicators[:, offsets[second_start]:offsets[second_stop]]
+                for first in range(first_start, first_stop):
+                    row = offsets[first] - offsets[first_start]
+                    for second in range(max(first + 1, second_start), second_stop):
+                        column = offsets[second] - offsets[second_start]
+                        table = self._table(kept[first], kept[second])
+                        table += product[row:row + table.shape[0], column:column + table.shape[1]]
+
+    def _block_rows(self):
+        width = len(self.numeric) + (len(self.categorical) - len(self.dropped)) * self.max_categories
+        return max(1, BLOCK_BYTES // (4 * max(width, 1)))
+
+    def update(self, frame):
+        """
+        Add the rows of a DataFrame or chunk to the accumulated products.
+
+        :param frame: pandas DataFrame holding the columns
+        :return: the accumulator itself
+        """
+        ranks = None
+        if self.numeric and self.method == 'spearman' and self.grids is None:
+            ranks = pd.DataFrame(numeric_block(frame, self.numeric, 0, len(frame))).rank(pct=True).to_numpy()
+        step = self._block_rows()
+        for start in range(0, len(frame), step):
+            stop = min(start + step, len(frame))
+            if self.numeric:
+                self._update_numeric(ranks[start:stop] if ranks is not None
+                                     else numeric_block(frame, self.numeric, start, stop))
+            if self.categorical:
+                self._update_categorical(frame, start, stop)
+            self.rows += stop - start
+        return self
+
+    def merge(self, other):
+        """
+        Fold an accumulator fed with other rows into this one.
+
+        :param other: CorrelationAccumulator with the same columns, center, scale and grids
+        :return: the accumulator itself
+        """
+        self.products += other.products
+        if self.sums is not None or other.sums is not None:
+            self._track_missing()
+            sums, squares, counts = other._pairwise_terms()
+            self.sums += sums
+            self.squares += squares
+            self.counts += counts
+        self.column_sums += other.column_sums
+        self.column_squares += other.column_squares
+        self.rows += other.rows
+
+        for position in other.dropped:
+            self._drop(position)
+        mappings = {}
+        for position, vocabulary in enumerate(other.vocabularies):
+            if position not in self.dropped and self._add_categories(position, list(vocabulary)):
+                # Vocabularies list their values in index order
+                mappings[position] = np.array([self.vocabularies[position][value] for value in vocabulary],
+                                              dtype=np.int64)
+        for (first, second), table in other.tables.items():
+            if first in mappings and second in mappings:
+                rows, columns = mappings[first][:table.shape[0]], mappings[second][:table.shape[1]]
+                self._table(first, second)[np.ix_(rows, columns)] += table
+        return self
+
+    def _block_terms(self, rows, columns):
+        """
+        Pairwise counts, sums and sums of squares of the column pairs of one block, for both columns of each pair.
+        """
+        if self.sums is None:
+            sums, squares = self.column_sums, self.column_squares
+            return (float(self.rows), sums[rows, None], sums[None, columns], squares[rows, None],
+                    squares[None, columns])
+        return (self.counts[rows, columns], self.sums[rows, columns], self.sums[columns, rows].T,
+                self.squares[rows, columns], self.squares[columns, rows].T)
+
+    def _numeric_pairs(self, threshold):
+        width = len(self.numeric)
+        pairs = []
+        for start in range(0, width, self.block_size):
+            rows, columns = slice(start, min(start + self.block_size, width)), slice(start, width)
+            counts, sums, other_sums, squares, other_squares = self._block_terms(rows, columns)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                covariance = counts * self.products[rows, columns] - sums * other_sums
+                variance = (counts * squares - np.square(sums)) * (counts * other_squares - np.square(other_sums))
+                correlation = covariance / np.sqrt(variance)
+            upper = np.triu(np.ones(correlation.shape, dtype=bool), 1)
+            for row, column in zip(*np.nonzero(upper & (np.abs(correlation) >= threshold))):
+                pairs.append((self.numeric[start + row], self.numeric[start + column], self.method,
+                              float(np.clip(correlation[row, column], -1, 1))))
+        return pairs
+
+    def _categorical_pairs(self, threshold):
+        pairs = []
+        for (first, second), table in sorted(self.tables.items()):
+            value = cramers_v(table)
+            if value is not None and value >= threshold:
+                pairs.append((self.categorical[first], self.categorical[second], 'cramers_v', value))
+        return pairs
+
+    def pairs(self, threshold=CORRELATION_THRESHOLD):
+        """
+        Column pairs whose absolute correlation, or Cramér's V, reaches a threshold.
+
+        :param threshold: smallest absolute Pearson/Spearman correlation or Cramér's V reported
+        :return: list of tuples (column, other column, statistic, value), strongest first; statistic is
+            'pearson', 'spearman' or 'cramers_v'
+        """
+        pairs = self._numeric_pairs(threshold) + self._categorical_pairs(threshold)
+        return sorted(pairs, key=lambda pair: -abs(pair[3]))
+
+
+def cramers_v(table):
+    """
+    Cramér's V of a contingency table.
+
+    :param table: 2-d numpy array of co-occurrence counts
+    :return: float between 0 and 1, or None if either column has fewer than two categories
+    """
+    table = table[table.sum(axis=1) > 0][:, table.sum(axis=0) > 0]
+    if min(table.shape) < 2:
+        return None
+    phi2 = max(float((np.square(table) / np.outer(table.sum(axis=1), table.sum(axis=0))).sum()) - 1, 0.0)
+    return math.sqrt(phi2 / (min(table.shape) - 1))
+
+
+def correlate_chunks(chunks, numeric, categorical=(), method='pearson', random_state=0):
+    """
+    Accumulate the correlations of profiled columns over chunks.
+
+    With 'spearman' a first pass over the chunks sketches every numeric column, and
+    the second maps its values to approximate ranks through the sketch quantiles.
+
+    :param chunks: callable returning a fresh iterable of pandas DataFrames on every call
+    :param numeric: numeric ColumnProfile instances with a non-zero standard deviation
+    :param categorical: categorical ColumnProfile instances
+    :param method: 'pearson' or 'spearman'
+    :param random_state: seed of the sketches' compaction offsets
+    :return: CorrelationAccumulator fed with all chunks
+    """
+    grids = None
+    if method == 'spearman' and numeric:
+        names = [column.name for column in numeric]
+        sketches = [KLLSketch(random_state=random_state) for _ in names]
+        for chunk in chunks():
+            update_sketches(sketches, numeric_block(chunk, names, 0, len(chunk)))
+        grids = [rank_grid(sketch) for sketch in sketches]
+    accumulator = CorrelationAccumulator.from_profiles(numeric, categorical, method, grids=grids)
+    for chunk in chunks():
+        accumulator.update(chunk)
+    return accumulator
@@ -0,0 +1,125 @@
+import time
+import numpy as np
+import pandas as pd
+from .profile import CATEGORICAL
+
+# Relative error allowed when narrowing floats; float32 keeps about 6e-8 of each value, so any positive
+# tolerance above that accepts every float64 column within range and loses precision silently
+FLOAT_TOLERANCE = 0
+CATEGORY_RATIO = 0.5
+FLOAT_BLOCK_SIZE = 65536
+INTEGER_DTYPES = [np.dtype(dtype) for dtype in (np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32)]
+
+
+def integer_dtype(minimum, maximum):
+    """
+    Smallest integer dtype holding every value between two bounds.
+
+    :param minimum: smallest value of the column
+    :param maximum: largest value of the column
+    :return: numpy dtype, or None if only a 64-bit type fits
+    """
+    for dtype in INTEGER_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= minimum and maximum <= info.max:
+            return dtype
+    return None
+
+
+def fits_float32(series, tolerance=FLOAT_TOLERANCE, block_size=FLOAT_BLOCK_SIZE):
+    """
+    Whether a float column survives conversion to float32 within a relative tolerance.
+
+    Values beyond the float32 range, or flushed to zero, never fit; with the default
+    ``tolerance=0`` every value must round-trip exactly. Values are checked block by block,
+    stopping at the first block that does not fit, so the copies are block-sized.
+
+    :param series: pandas Series of a float dtype
+    :param tolerance: largest relative error allowed per value
+    :param block_size: number of values checked per vectorised step
+    :return: bool
+    """
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    for start in range(0, len(values), block_size):
+        block = values[start:start + block_size]
+        with np.errstate(over='ignore', invalid='ignore'):
+            converted = block.astype(np.float32).astype(np.float64)
+            fits = (np.abs(converted - block) <= tolerance * np.abs(block)) | np.isnan(block) | (block == converted)
+        if not fits.all():
+            return False
+    return True
+
+
+def target_dtype(series, column, tolerance=FLOAT_TOLERANCE, category_ratio=CATEGORY_RATIO, narrow_integers=True):
+    """
+    Smaller dtype a column could be stored with, judged from its profile and values.
+
+    Integers are narrowed from the profiled min/max, float64 becomes float32 when
+    fits_float32 allows it, and object columns with at most ``category_ratio``
+    distinct values per non-missing value become ``category``.
+
+    :param series: pandas Series holding the column
+    :param column: ColumnProfile of the column
+    :param tolerance: relative error allowed when narrowing floats
+    :param category_ratio: largest distinct/non-missing ratio of object columns turned into categories
+    :param narrow_integers: whether to narrow integers; the min/max of a sample may understate the range
+        of the population it was drawn from
+    :return: numpy or pandas dtype, or None if no smaller dtype applies
+    """
+    dtype = series.dtype
+    if not isinstance(dtype, np.dtype) or column.count == 0:
+        return None
+    if dtype.kind in 'iu':
+        if not narrow_integers:
+            return None
+        target = integer_dtype(column.min, column.max)
+        return target if target is not None and target.itemsize < dtype.itemsize else None
+    if dtype.kind == 'f' and dtype.itemsize > 4:
+        return np.dtype(np.float32) if fits_float32(series, tolerance) else None
+    if dtype.kind == 'O' and column.kind == CATEGORICAL and column.distinct is not None:
+        return pd.CategoricalDtype() if column.distinct <= category_ratio * column.count else None
+    return None
+
+
+def advise_downcast(dataset, profile, tolerance=FLOAT_TOLERANCE, category_ratio=CATEGORY_RATIO,
+                    narrow_integers=True, on_column=None):
+    """
+    Find the columns of a DataFrame that can be stored with a smaller dtype and measure the savings.
+
+    Savings of numeric columns follow from the item sizes. Only object columns
+    turned into categories are converted, comparing ``memory_usage(deep=True)``
+    before and after; candidates that would not save memory are left out.
+
+    :param dataset: pandas DataFrame
+    :param profile: DatasetProfile of the DataFrame
+    :param tolerance: relative error allowed when narrowing floats
+    :param category_ratio: largest distinct/non-missing ratio of object columns turned into categories
+    :param narrow_integers: whether to narrow integers, see target_dtype
+    :param on_column: optional per-column timing callback, see profile.DatasetProfile.from_frame
+    :return: list of tuples (column label, target dtype, bytes before, bytes after) in column order
+    """
+    advice = []
+    for (name, series), column in zip(dataset.items(), profile):
+        started = time.perf_counter()
+        target = target_dtype(series, column, tolerance, category_ratio, narrow_integers)
+        if isinstance(target, np.dtype):
+            before, after = len(series) * series.dtype.itemsize, len(series) * target.itemsize
+        elif target is not None:
+            before = int(series.memory_usage(index=False, deep=True))
+            after = int(series.astype(target).memory_usage(index=False, deep=True))
+        if target is not None and after < before:
+            advice.append((name, target, before, after))
+        if on_column is not None:
+            on_column(name, time.perf_counter() - started, len(series))
+    return advice
+
+
+def downcast(dataset, advice):
+    """
+    Apply downcasting advice to a DataFrame.
+
+    :param dataset: pandas DataFrame
+    :param advice: list of tuples as returned by advise_downcast
+    :return: new pandas DataFrame with the advised dtypes
+    """
+    return dataset.astype({name: target for name, target, _, _ in advice})
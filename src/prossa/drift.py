@@ -0,0 +1,375 @@
+import json
+import numpy as np
+import pandas as pd
+from .findings import Finding
+from .profile import NUMERIC, CATEGORICAL, numeric_values
+from .sketches import HyperLogLog, KLLSketch, SpaceSaving
+
+SNAPSHOT_VERSION = 1
+SKETCH_SIZE = 200
+SNAPSHOT_PRECISION = 12
+TOP_K = 50
+CATEGORY_CAPACITY = 1000
+PSI_BINS = 10
+PSI_EPSILON = 1e-4
+PSI_THRESHOLD = 0.2
+KS_THRESHOLD = 0.1
+NULL_RATE_THRESHOLD = 0.05
+CARDINALITY_THRESHOLD = 0.25
+
+
+class SnapshotAccumulator:
+    """
+    Sketches of the values of some columns, accumulated chunk by chunk for a DatasetSnapshot.
+
+    Numeric columns get a KLL quantile sketch, categorical columns a Space-Saving
+    summary of their most frequent values and every column a HyperLogLog sketch.
+    Accumulators of different chunks merge.
+    """
+
+    def __init__(self, names, kinds, sketch_size=SKETCH_SIZE, precision=SNAPSHOT_PRECISION,
+                 capacity=CATEGORY_CAPACITY, random_state=0):
+        """
+        Initialize empty sketches.
+
+        :param names: column labels
+        :param kinds: dtype class of each column, see profile.dtype_kind
+        :param sketch_size: ``k`` of the KLL sketches of numeric columns
+        :param precision: precision of the HyperLogLog sketches
+        :param capacity: number of values tracked per categorical column, see SpaceSaving
+        :param random_state: seed or numpy SeedSequence of the KLL compactions
+        """
+        self.names = list(names)
+        self.kinds = list(kinds)
+        if not isinstance(random_state, np.random.SeedSequence):
+            random_state = np.random.SeedSequence(random_state)
+        seeds = random_state.spawn(len(self.names))
+        self.sketches = [KLLSketch(sketch_size, random_state=seed) if kind == NUMERIC else None
+                         for kind, seed in zip(self.kinds, seeds)]
+        self.cardinalities = [HyperLogLog(precision) for _ in self.names]
+        self.counts = [SpaceSaving(capacity) if kind == CATEGORICAL else None for kind in self.kinds]
+
+    def update(self, frame):
+        """
+        Add the rows of a chunk.
+
+        :param frame: pandas DataFrame holding at least the columns of the accumulator
+        :return: the accumulator itself
+        """
+        for position, name in enumerate(self.names):
+            values = frame[name].dropna()
+            self.cardinalities[position].update(values)
+            if self.sketches[position] is not None:
+                self.sketches[position].update(numeric_values(values).to_numpy(dtype=np.float64))
+            elif self.counts[position] is not None:
+                self.counts[position].update(values)
+        return self
+
+    def merge(self, other):
+        """
+        Fold the accumulator of other rows of the same columns into this one.
+
+        :param other: SnapshotAccumulator over the same columns
+        :return: the accumulator itself
+        """
+        for position in range(len(self.names)):
+            self.cardinalities[position].merge(other.cardinalities[position])
+            if self.sketches[position] is not None:
+                self.sketches[position].merge(other.sketches[position])
+            elif self.counts[position] is not None:
+                self.counts[position].merge(other.counts[position])
+        return self
+
+
+class ColumnSnapshot:
+    """
+    The stored summary of one column: null count, moments, and sketches of its values.
+    """
+
+    def __init__(self, name, dtype, kind, n_rows, null_count, min=None, max=None, mean=None, std=None,
+                 cardinality=None, sketch=None, top=None, top_total=None):
+        """
+        Initialize a column snapshot.
+
+        :param name: column label
+        :param dtype: dtype of the column, as a string
+        :param kind: dtype class, see profile.dtype_kind
+        :param n_rows: number of rows the column was summarized from
+        :param null_count: number of missing values among them
+        :param min: minimum of a numeric column
+        :param max: maximum of a numeric column
+        :param mean: mean of a numeric column
+        :param std: population standard deviation of a numeric column
+        :param cardinality: HyperLogLog sketch of the distinct values
+        :param sketch: KLLSketch of the values of a numeric column
+        :param top: dict mapping the most frequent values of a categorical column, as strings, to their counts
+        :param top_total: number of non-missing values the counts in ``top`` were taken from
+        """
+        self.name = name
+        self.dtype = dtype
+        self.kind = kind
+        self.n_rows = n_rows
+        self.null_count = null_count
+        self.min = min
+        self.max = max
+        self.mean = mean
+        self.std = std
+        self.cardinality = cardinality
+        self.sketch = sketch
+        self.top = top
+        self.top_total = top_total
+
+    @property
+    def null_rate(self):
+        """
+        Fraction of missing values in the column.
+        """
+        return self.null_count / self.n_rows if self.n_rows else 0.0
+
+    @property
+    def distinct(self):
+        """
+        Estimated number of distinct non-missing values.
+        """
+        return self.cardinality.count() if self.cardinality is not None else None
+
+    def to_dict(self):
+        """
+        Convert the snapshot to a JSON-compatible dict.
+        """
+        return {
+            'name': self.name,
+            'dtype': self.dtype,
+            'kind': self.kind,
+            'n_rows': self.n_rows,
+            'null_count': self.null_count,
+            'min': self.min,
+            'max': self.max,
+            'mean': self.mean,
+            'std': self.std,
+            'cardinality': self.cardinality.to_dict() if self.cardinality is not None else None,
+            'sketch': self.sketch.to_dict() if self.sketch is not None else None,
+            'top': [[value, count] for value, count in self.top.items()] if self.top is not None else None,
+            'top_total': self.top_total,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Rebuild a column snapshot from to_dict output.
+        """
+        state = dict(state)
+        if state['cardinality'] is not None:
+            state['cardinality'] = HyperLogLog.from_dict(state['cardinality'])
+        if state['sketch'] is not None:
+            state['sketch'] = KLLSketch.from_dict(state['sketch'])
+        if state['top'] is not None:
+            state['top'] = dict((value, count) for value, count in state['top'])
+        return cls(**state)
+
+
+def _number(value):
+    return None if value is None or pd.isna(value) else float(value)
+
+
+class DatasetSnapshot:
+    """
+    A compact summary of a dataset that later versions of it can be compared against.
+
+    Its size depends on the number of columns only: a few kilobytes per column for
+    the sketches, whatever the number of rows.
+    """
+
+    def __init__(self, n_rows, columns):
+        """
+        Initialize the snapshot.
+
+        :param n_rows: number of rows of the dataset
+        :param columns: list of ColumnSnapshot instances in column order
+        """
+        self.n_rows = n_rows
+        self.columns = columns
+        self._by_name = {column.name: column for column in columns}
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __len__(self):
+        return len(self.columns)
+
+    def __getitem__(self, name):
+        return self._by_name[name]
+
+    @classmethod
+    def from_profile(cls, profile, accumulator, n_rows=None):
+        """
+        Combine the profile of a dataset with the sketches accumulated over its rows.
+
+        :param profile: DatasetProfile with moments of the numeric columns
+        :param accumulator: SnapshotAccumulator over the columns of the profile
+        :param n_rows: number of rows of the dataset when the profile is of a sample of them
+        :return: DatasetSnapshot instance
+        """
+        columns = []
+        for column, sketch, cardinality, counts in zip(profile, accumulator.sketches, accumulator.cardinalities,
+                                                       accumulator.counts):
+            snapshot = ColumnSnapshot(column.name, str(column.dtype), column.kind, column.n_rows,
+                                      int(column.null_count), cardinality=cardinality, sketch=sketch)
+            if column.kind == NUMERIC:
+                snapshot.min, snapshot.max = _number(column.min), _number(column.max)
+                snapshot.mean, snapshot.std = _number(column.mean), _number(column.std)
+            if counts is not None:
+                snapshot.top = {str(value): count for value, count, _ in counts.top(TOP_K)}
+                snapshot.top_total = int(column.count)
+            columns.append(snapshot)
+        return cls(profile.n_rows if n_rows is None else n_rows, columns)
+
+    def to_dict(self):
+        """
+        Convert the snapshot to a JSON-compatible dict.
+        """
+        return {'version': SNAPSHOT_VERSION, 'n_rows': self.n_rows,
+                'columns': [column.to_dict() for column in self.columns]}
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Rebuild a snapshot from to_dict output.
+        """
+        if state.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {state.get('version')!r}, expected {SNAPSHOT_VERSION}")
+        return cls(state['n_rows'], [ColumnSnapshot.from_dict(column) for column in state['columns']])
+
+    def save(self, path):
+        """
+        Write the snapshot to a JSON file.
+
+        :param path: file path
+        :return: the snapshot itself
+        """
+        with open(path, 'w') as file:
+            json.dump(self.to_dict(), file, default=str)
+        return self
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a snapshot written by save.
+
+        :param path: file path
+        :return: DatasetSnapshot instance
+        """
+        with open(path) as file:
+            return cls.from_dict(json.load(file))
+
+
+def population_stability_index(expected, actual, epsilon=PSI_EPSILON):
+    """
+    Population stability index between two distributions over the same bins.
+
+    :param expected: fractions of the baseline in each bin
+    :param actual: fractions of the current data in each bin
+    :param epsilon: smallest fraction used, so that empty bins do not give an infinite index
+    :return: float, 0 for identical distributions
+    """
+    expected = np.clip(np.asarray(expected, dtype=np.float64), epsilon, None)
+    actual = np.clip(np.asarray(actual, dtype=np.float64), epsilon, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def ks_statistic(left, right):
+    """
+    Two-sample Kolmogorov-Smirnov statistic estimated from two quantile sketches.
+
+    The empirical distribution functions are compared at every value either sketch
+    retains, so the estimate is within the rank error of the sketches.
+
+    :param left: KLLSketch of the first sample
+    :param right: KLLSketch of the second sample
+    :return: float between 0 and 1
+    """
+    points = np.concatenate(left.levels + right.levels)
+    return float(np.max(np.abs(left.cdf(points) - right.cdf(points)))) if len(points) else 0.0
+
+
+def _numeric_fractions(baseline, current, bins=PSI_BINS):
+    """
+    Fractions of the values of two numeric columns in bins cut at the baseline deciles.
+    """
+    edges = np.unique(baseline.sketch.quantile(np.linspace(0, 1, bins + 1)[1:-1]))
+    return [np.diff(np.concatenate([[0.0], np.atleast_1d(column.sketch.cdf(edges)), [1.0]]))
+            for column in (baseline, current)]
+
+
+def _categorical_fractions(baseline, current):
+    """
+    Fractions of the values of two categorical columns over the frequent values of either, and all others.
+
+    A value frequent in one column only gets a zero fraction in the other, which
+    population_stability_index floors at its epsilon, so categories that appear or
+    disappear count as drift.
+    """
+    values = list(baseline.top) + [value for value in current.top if value not in baseline.top]
+    fractions = []
+    for column in (baseline, current):
+        shares = np.array([column.top.get(value, 0) for value in values], dtype=np.float64) / column.top_total
+        fractions.append(np.append(shares, max(0.0, 1.0 - shares.sum())))
+    return fractions
+
+
+def compare_snapshots(baseline, current, psi_threshold=PSI_THRESHOLD, ks_threshold=KS_THRESHOLD,
+                      null_threshold=NULL_RATE_THRESHOLD, cardinality_threshold=CARDINALITY_THRESHOLD):
+    """
+    Measure how a dataset drifted between two snapshots, without reading either dataset.
+
+    Every column present in both gets its null-rate shift and relative cardinality
+    shift; numeric columns also get the population stability index over the baseline
+    deciles and the Kolmogorov-Smirnov statistic, categorical columns the population
+    stability index over the frequent values of either. The cost depends on the number
+    of columns and the sketch sizes only.
+
+    :param baseline: DatasetSnapshot of the reference data, or the path of a saved one
+    :param current: DatasetSnapshot of the new data, or the path of a saved one
+    :param psi_threshold: population stability index above which a column drifted
+    :param ks_threshold: Kolmogorov-Smirnov statistic above which a column drifted
+    :param null_threshold: absolute change of the null rate above which a column drifted
+    :param cardinality_threshold: relative change of the distinct count above which a column drifted
+    :return: list of Finding instances of category 'Drift'; ``detail['drifted']`` tells whether the
+        metric crossed its threshold
+    """
+    if not isinstance(baseline, DatasetSnapshot):
+        baseline = DatasetSnapshot.load(baseline)
+    if not isinstance(current, DatasetSnapshot):
+        current = DatasetSnapshot.load(current)
+
+    findings = [Finding('Drift', None, 'n_rows', current.n_rows, {'baseline': baseline.n_rows})]
+    current_names = {column.name for column in current}
+    baseline_names = {column.name for column in baseline}
+    findings.extend(Finding('Drift', column.name, 'removed', column.dtype, {'drifted': True})
+                    for column in baseline if column.name not in current_names)
+    findings.extend(Finding('Drift', column.name, 'added', column.dtype, {'drifted': True})
+                    for column in current if column.name not in baseline_names)
+
+    for old in baseline:
+        if old.name not in current_names:
+            continue
+        new = current[old.name]
+        if new.dtype != old.dtype:
+            findings.append(Finding('Drift', old.name, 'dtype', new.dtype, {'baseline': old.dtype, 'drifted': True}))
+        shift = new.null_rate - old.null_rate
+        findings.append(Finding('Drift', old.name, 'null_rate_shift', shift, {
+            'baseline': old.null_rate, 'current': new.null_rate, 'drifted': abs(shift) > null_threshold}))
+        if old.cardinality is not None and new.cardinality is not None:
+            before, after = old.distinct, new.distinct
+            shift = (after - before) / before if before else float(after > 0)
+            findings.append(Finding('Drift', old.name, 'cardinality_shift', shift, {
+                'baseline': before, 'current': after, 'drifted': abs(shift) > cardinality_threshold}))
+        if old.sketch is not None and new.sketch is not None and old.sketch.count and new.sketch.count:
+            psi = population_stability_index(*_numeric_fractions(old, new))
+            findings.append(Finding('Drift', old.name, 'psi', psi, {'drifted': psi > psi_threshold}))
+            ks = ks_statistic(old.sketch, new.sketch)
+            findings.append(Finding('Drift', old.name, 'ks', ks, {'drifted': ks > ks_threshold}))
+        elif old.top is not None and new.top is not None and old.top_total and new.top_total:
+            psi = population_stability_index(*_categorical_fractions(old, new))
+            findings.append(Finding('Drift', old.name, 'psi', psi, {'drifted': psi > psi_threshold}))
+    return findings
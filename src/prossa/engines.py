@@ -0,0 +1,469 @@
+import os
+import pandas as pd
+from pandas.api import types as ptypes
+from .analyzer import DatasetAnalyzer
+from .checks import resolve_checks, topological_order
+from .columnar import PARQUET_SUFFIXES, ARROW_SUFFIXES, pandas_dtype
+from .partitions import expand_paths, is_partitioned
+from .outliers import DEFAULT_THRESHOLDS, count_chunked_method_outliers
+from .correlation import correlate_chunks
+from .inference import head_rows
+from .categories import HEAVY_HITTER_CAPACITY
+from .sketches import SpaceSaving
+from .profile import STATISTICS, ColumnProfile, DatasetProfile, NUMERIC, CATEGORICAL, dtype_kind
+
+# Number of rows per pandas chunk handed to the checks that cannot be expressed as aggregates
+ENGINE_BATCH_ROWS = 100000
+
+
+def _import_polars():
+    try:
+        import polars
+    except ImportError as error:
+        raise ImportError("The polars engine requires polars; install it with 'pip install polars'") from error
+    return polars
+
+
+def _import_duckdb():
+    try:
+        import duckdb
+    except ImportError as error:
+        raise ImportError("The duckdb engine requires duckdb; install it with 'pip install duckdb'") from error
+    return duckdb
+
+
+def _data_files(source):
+    """
+    Paths of the files of a file, directory or glob pattern, and the suffix telling their format.
+    """
+    paths = expand_paths(source) if is_partitioned(source) else [os.fspath(source)]
+    return paths, os.path.splitext(paths[0])[1].lower()
+
+
+def _quote(name):
+    """
+    Quote a column name as a SQL identifier.
+    """
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+class PolarsEngine:
+    """
+    A Polars LazyFrame whose aggregates run on the Polars streaming engine.
+
+    Every statistic is one expression of a single ``select`` query, so the engine
+    scans only the columns involved, on all cores and without holding the table in
+    memory. Files are scanned lazily: CSV, Parquet and Arrow IPC files, directories
+    and glob patterns of them.
+    """
+
+    def __init__(self, source, columns=None, batch_rows=ENGINE_BATCH_ROWS):
+        """
+        Open a source lazily.
+
+        :param source: polars LazyFrame or DataFrame, or path of a file, directory or glob pattern
+        :param columns: names of the columns to analyze, or None for all
+        :param batch_rows: number of rows per chunk returned by chunks
+        """
+        pl = _import_polars()
+
+        if isinstance(source, pl.DataFrame):
+            source = source.lazy()
+        if not isinstance(source, pl.LazyFrame):
+            paths, suffix = _data_files(source)
+            if suffix in PARQUET_SUFFIXES:
+                source = pl.scan_parquet(paths)
+            elif suffix in ARROW_SUFFIXES:
+                source = pl.scan_ipc(paths)
+            else:
+                source = pl.scan_csv(paths)
+        self.frame = source if columns is None else source.select(list(columns))
+        self.schema = self.frame.collect_schema()
+        self.columns = list(self.schema.names())
+        self.dtypes = list(self.frame.head(0).collect().to_pandas().dtypes)
+        self.batch_rows = batch_rows
+
+    def _column(self, name):
+        """
+        Expression of the values of a column with NaN as null, as pandas counts NaN as missing.
+        """
+        pl = _import_polars()
+        return pl.col(name).fill_nan(None) if self.schema[name].is_float() else pl.col(name)
+
+    def _numeric(self, name):
+        """
+        Expression of the values of a numeric column as floats: durations in nanoseconds, decimals as floats.
+        """
+        pl = _import_polars()
+        dtype = self.schema[name]
+        if isinstance(dtype, pl.Duration):
+            return pl.col(name).dt.total_nanoseconds().cast(pl.Float64)
+        if dtype.is_decimal():
+            return pl.col(name).cast(pl.Float64)
+        return self._column(name)
+
+    def _select(self, expressions):
+        return self.frame.select(expressions).collect(engine='streaming').row(0)
+
+    def aggregate(self, null_counts=(), moments=(), distinct=(), approximate=False):
+        """
+        Compute column statistics in one scan.
+
+        :param null_counts: names of the columns to count the missing values of
+        :param moments: names of numeric columns to compute the min, max, mean and population standard deviation of
+        :param distinct: names of the columns to count the distinct non-missing values of
+        :param approximate: estimate distinct counts with HyperLogLog instead of counting them exactly
+        :return: tuple (number of rows, dict mapping each column to a dict of its statistics, with keys
+            'null_count', 'min', 'max', 'mean', 'std' and 'distinct')
+        """
+        pl = _import_polars()
+        keys = []
+        expressions = [pl.len()]
+        for name in null_counts:
+            keys.append((name, 'null_count'))
+            expressions.append(self._column(name).null_count())
+        for name in moments:
+            values = self._numeric(name)
+            keys.extend((name, statistic) for statistic in ('min', 'max', 'mean', 'std'))
+            expressions.extend([values.min(), values.max(), values.mean(), values.std(ddof=0)])
+        for name in distinct:
+            values = pl.col(name).drop_nulls()
+            keys.append((name, 'distinct'))
+            expressions.append(values.approx_n_unique() if approximate else values.n_unique())
+        row = self._select([expression.alias(f"_{position}") for position, expression in enumerate(expressions)])
+        statistics = {}
+        for (name, statistic), value in zip(keys, row[1:]):
+            statistics.setdefault(name, {})[statistic] = value
+        return row[0], statistics
+
+    def count_outliers(self, columns, threshold):
+        """
+        Count the values of numeric columns whose absolute z-score exceeds a threshold, in one scan.
+
+        :param columns: list of tuples (name, mean, standard deviation)
+        :param threshold: absolute z-score above which a value is an outlier
+        :return: list of outlier counts, one per column
+        """
+        if not columns:
+            return []
+        expressions = [
+            ((self._numeric(name) - mean).abs() / std > threshold).sum().alias(f"_{position}")
+            for position, (name, mean, std) in enumerate(columns)
+        ]
+        return [int(count) for count in self._select(expressions)]
+
+    def value_counts(self, name, limit):
+        """
+        Exact counts of the most frequent non-missing values of a column, computed by a group-by.
+
+        :param name: column name
+        :param limit: number of values to return
+        :return: pandas Series of counts indexed by value, most frequent first
+        """
+        pl = _import_polars()
+        counts = (self.frame.select(pl.col(name)).drop_nulls().group_by(name).len(name='_count')
+                  .sort('_count', descending=True).head(limit).collect(engine='streaming'))
+        return pd.Series(counts['_count'].to_list(), index=counts[name].to_list())
+
+    def chunks(self, columns):
+        """
+        Stream columns as pandas DataFrames of ``batch_rows`` rows.
+
+        :param columns: names of the columns to read
+        :return: generator of pandas DataFrames
+        """
+        for batch in self.frame.select(list(columns)).collect_batches(chunk_size=self.batch_rows):
+            yield batch.to_pandas()
+
+
+class DuckDBEngine:
+    """
+    A DuckDB relation whose aggregates run as SQL queries in an embedded DuckDB database.
+
+    Every statistic is one aggregate of a single query, which DuckDB runs on all
+    cores, spilling to disk when it needs more memory than allowed. Files are read
+    in place: CSV and Parquet files, directories and glob patterns of them.
+    """
+
+    def __init__(self, source, columns=None, connection=None, batch_rows=ENGINE_BATCH_ROWS):
+        """
+        Open a source in a DuckDB connection.
+
+        :param source: DuckDB relation, path of a file, directory or glob pattern, or name of a table or view
+            of ``connection``
+        :param columns: names of the columns to analyze, or None for all
+        :param connection: DuckDB connection to query, or None for a new in-memory database
+        :param batch_rows: number of rows per chunk returned by chunks
+        """
+        duckdb = _import_duckdb()
+
+        self.connection = connection if connection is not None else duckdb.connect()
+        if not isinstance(source, duckdb.DuckDBPyRelation):
+            if isinstance(source, str) and not is_partitioned(source) and not os.path.exists(source):
+                source = self.connection.table(source)
+            else:
+                paths, suffix = _data_files(source)
+                if suffix in ARROW_SUFFIXES:
+                    raise ValueError("The duckdb engine does not read Arrow IPC files; use the polars engine")
+                source = (self.connection.read_parquet(paths) if suffix in PARQUET_SUFFIXES
+                          else self.connection.read_csv(paths))
+        self.relation = source if columns is None else source.project(", ".join(map(_quote, columns)))
+        self.columns = list(self.relation.columns)
+        self.types = dict(zip(self.columns, (str(dtype) for dtype in self.relation.types)))
+        self.dtypes = list(self.relation.limit(0).to_arrow_table().to_pandas().dtypes)
+        self.batch_rows = batch_rows
+
+    def _column(self, name):
+        """
+        SQL expression of the values of a column with NaN as NULL, as pandas counts NaN as missing.
+        """
+        if self.types[name] in ('FLOAT', 'DOUBLE'):
+            return f"CASE WHEN isnan({_quote(name)}) THEN NULL ELSE {_quote(name)} END"
+        return _quote(name)
+
+    def _numeric(self, name):
+        """
+        SQL expression of the values of a numeric column as numbers: intervals in nanoseconds, decimals as doubles.
+        """
+        dtype = self.types[name]
+        if dtype == 'INTERVAL':
+            return f"epoch({_quote(name)}) * 1e9"
+        if dtype.startswith('DECIMAL'):
+            return f"CAST({_quote(name)} AS DOUBLE)"
+        return self._column(name)
+
+    def aggregate(self, null_counts=(), moments=(), distinct=(), approximate=False):
+        """
+        Compute column statistics in one query, see PolarsEngine.aggregate.
+        """
+        keys = []
+        expressions = ["count(*)"]
+        for name in null_counts:
+            keys.append((name, 'null_count'))
+            expressions.append(f"count(*) - count({self._column(name)})")
+        for name in moments:
+            values = self._numeric(name)
+            keys.extend((name, statistic) for statistic in ('min', 'max', 'mean', 'std'))
+            expressions.extend([f"min({values})", f"max({values})", f"avg({values})", f"stddev_pop({values})"])
+        for name in distinct:
+            keys.append((name, 'distinct'))
+            expressions.append(f"approx_count_distinct({_quote(name)})" if approximate
+                               else f"count(DISTINCT {_quote(name)})")
+        row = self.relation.aggregate(", ".join(expressions)).fetchone()
+        statistics = {}
+        for (name, statistic), value in zip(keys, row[1:]):
+            statistics.setdefault(name, {})[statistic] = value
+        return row[0], statistics
+
+    def count_outliers(self, columns, threshold):
+        """
+        Count the values of numeric columns whose absolute z-score exceeds a threshold, in one query.
+
+        :param columns: list of tuples (name, mean, standard deviation)
+        :param threshold: absolute z-score above which a value is an outlier
+        :return: list of outlier counts, one per column
+        """
+        if not columns:
+            return []
+        expressions = [
+            f"count_if(abs({self._numeric(name)} - {float(mean)!r}) / {float(std)!r} > {threshold})"
+            for name, mean, std in columns
+        ]
+        return [int(count) for count in self.relation.aggregate(", ".join(expressions)).fetchone()]
+
+    def value_counts(self, name, limit):
+        """
+        Exact counts of the most frequent non-missing values of a column, see PolarsEngine.value_counts.
+        """
+        column = _quote(name)
+        counts = (self.relation.filter(f"{column} IS NOT NULL")
+                  .aggregate(f"{column} AS value, count(*) AS count", column)
+                  .order("count DESC").limit(limit).fetchall())
+        return pd.Series([count for _, count in counts], index=[value for value, _ in counts], dtype='int64')
+
+    def chunks(self, columns):
+        """
+        Stream columns as pandas DataFrames of ``batch_rows`` rows.
+
+        :param columns: names of the columns to read
+        :return: generator of pandas DataFrames
+        """
+        reader = self.relation.project(", ".join(map(_quote, columns))).to_arrow_reader(self.batch_rows)
+        for batch in reader:
+            yield batch.to_pandas()
+
+
+ENGINES = {'polars': PolarsEngine, 'duckdb': DuckDBEngine}
+
+
+def open_engine(source, engine='polars', columns=None):
+    """
+    Open a source in a query engine.
+
+    :param source: PolarsEngine or DuckDBEngine, returned as is; otherwise a source of the engine, see
+        PolarsEngine and DuckDBEngine
+    :param engine: 'polars' or 'duckdb'
+    :param columns: names of the columns to analyze, or None for all
+    :return: PolarsEngine or DuckDBEngine
+    """
+    if isinstance(source, tuple(ENGINES.values())):
+        return source
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}', expected one of {tuple(ENGINES)}")
+    return ENGINES[engine](source, columns)
+
+
+class EngineDatasetAnalyzer(DatasetAnalyzer):
+    """
+    A DatasetAnalyzer that pushes the statistics of the checks down to a query engine (Polars or DuckDB).
+
+    The profile is computed by aggregate queries the engine plans and runs out of
+    core on all its threads; prossa only interprets the aggregates. analyze() asks
+    for every statistic its checks need in a single query; statistics needed later
+    are queried for the columns involved only. Z-score outliers and the most frequent
+    categories are aggregates too; robust outlier methods, correlations, type
+    inference and snapshots process the rows the engine streams back in chunks.
+    """
+
+    def __init__(self, source, engine='polars', columns=None, distinct_error=None, instrument=None,
+                 outlier_method='zscore', correlation_method='pearson', infer_types=True):
+        """
+        Initialize the EngineDatasetAnalyzer with a source.
+
+        :param source: path of a file, directory or glob pattern, a polars LazyFrame or DataFrame, a DuckDB
+            relation or table name, or a PolarsEngine or DuckDBEngine
+        :param engine: 'polars' or 'duckdb'
+        :param columns: names of the columns to analyze, or None for all
+        :param distinct_error: if not None, distinct counts are HyperLogLog estimates of the engine, whose
+            error is set by the engine rather than by this value
+        :param instrument: True or an Instrumentation instance to record per-check timings, see DatasetAnalyzer
+        :param outlier_method: 'zscore', 'iqr', 'mad' or 'isolation', see DatasetAnalyzer
+        :param correlation_method: 'pearson' or 'spearman', see DatasetAnalyzer
+        :param infer_types: whether check_data_types infers the types of object columns from the first rows
+        """
+        super().__init__(None, distinct_error=distinct_error, instrument=instrument, outlier_method=outlier_method,
+                         correlation_method=correlation_method, infer_types=infer_types)
+        self.engine = open_engine(source, engine, columns)
+        self._statistics = STATISTICS
+
+    def prepare(self, checks=None):
+        self._statistics = {statistic for check in resolve_checks(checks) for statistic in check.needs}
+        return super().prepare(checks)
+
+    def _build_profile(self, on_column=None):
+        columns = [ColumnProfile(name, dtype, dtype_kind(dtype), None, None)
+                   for name, dtype in zip(self.engine.columns, self.engine.dtypes)]
+        n_rows = self._push_down(columns, self._statistics)
+        return DatasetProfile(n_rows, columns)
+
+    def _push_down(self, columns, statistics):
+        """
+        Compute statistics of profiled columns with one aggregate query, and fill them in.
+
+        Null counts are computed for columns without one; they may change the dtype
+        the columns get in pandas, so booleans count their distinct values whenever
+        they might turn out categorical.
+
+        :param columns: ColumnProfile instances
+        :param statistics: names of the statistics needed, see profile.STATISTICS
+        :return: number of rows of the table
+        """
+        statistics = set(topological_order(statistics))
+        varies = 'constancy' in statistics
+        moments = [column for column in columns if column.kind == NUMERIC and column.std is None
+                   and (varies or 'moments' in statistics)]
+        distinct = [
+            column for column in columns
+            if column.kind != NUMERIC and column.distinct is None and column.varies is None
+            and (varies or ('distinct' in statistics and (column.kind == CATEGORICAL or ptypes.is_bool_dtype(column.dtype))))
+        ]
+        n_rows, results = self.engine.aggregate(
+            null_counts=[column.name for column in columns if column.null_count is None],
+            moments=[column.name for column in moments], distinct=[column.name for column in distinct],
+            approximate=self.distinct_error is not None)
+
+        for column in columns:
+            result = results.get(column.name, {})
+            if column.n_rows is None:
+                column.n_rows = n_rows
+            if 'null_count' in result:
+                column.null_count = int(result['null_count'])
+                column.dtype = pandas_dtype(column.dtype, column.null_count)
+                column.kind = dtype_kind(column.dtype)
+            if column.count == 0:
+                column.varies = False
+            elif 'std' in result:
+                column.min, column.max = result['min'], result['max']
+                column.mean, column.std = float(result['mean']), float(result['std'])
+                column.first_value = column.min
+                column.varies = bool(column.min != column.max)
+            elif 'distinct' in result:
+                if column.kind == CATEGORICAL:
+                    column.distinct = int(result['distinct'])
+                column.varies = result['distinct'] > 1
+        return n_rows
+
+    def _require(self, columns, *statistics):
+        statistics = statistics or STATISTICS
+        pending = [column for column in columns if not all(column.has(statistic) for statistic in statistics)]
+        if pending:
+            with self._stage('query') as metrics:
+                self._push_down(pending, statistics)
+                if metrics is not None:
+                    metrics.rows, metrics.columns = self.profile.n_rows, len(pending)
+        return columns
+
+    def _count_outliers(self, columns):
+        return self.engine.count_outliers([(column.name, column.mean, column.std) for column in columns],
+                                          DEFAULT_THRESHOLDS['zscore'])
+
+    def _count_method_outliers(self, columns):
+        names = [column.name for column in columns]
+        counts = count_chunked_method_outliers(lambda: self.engine.chunks(names), names, self.outlier_method)
+        return [counts[name] for name in names]
+
+    def _inference_rows(self, names):
+        return head_rows(self.engine.chunks(names))
+
+    def _accumulate_snapshot(self, accumulator):
+        for chunk in self.engine.chunks(accumulator.names):
+            accumulator.update(chunk)
+        return accumulator
+
+    def _summarize_categories(self, columns):
+        return [
+            SpaceSaving.from_counts(self.engine.value_counts(column.name, HEAVY_HITTER_CAPACITY + 1), column.count,
+                                    HEAVY_HITTER_CAPACITY)
+            for column in columns
+        ]
+
+    def _correlate(self, numeric, categorical):
+        names = [column.name for column in numeric + categorical]
+        return (correlate_chunks(lambda: self.engine.chunks(names), numeric, categorical, self.correlation_method),
+                self.profile.n_rows)
+
+    def update(self, batch):
+        raise ValueError("update() is not supported on an EngineDatasetAnalyzer")
+
+
+def analyze_engine(source, engine='polars', columns=None, distinct_error=None, instrument=None,
+                   outlier_method='zscore', correlation_method='pearson', checks=None):
+    """
+    Analyze a dataset with a query engine using the EngineDatasetAnalyzer class and print the recommendations.
+
+    :param source: path of a file, directory or glob pattern, or another source, see EngineDatasetAnalyzer
+    :param engine: 'polars' or 'duckdb'
+    :param columns: names of the columns to analyze, or None for all
+    :param distinct_error: if not None, distinct counts are HyperLogLog estimates of the engine
+    :param instrument: True or an Instrumentation instance to record per-check timings
+    :param outlier_method: 'zscore', 'iqr', 'mad' or 'isolation', see DatasetAnalyzer
+    :param correlation_method: 'pearson' or 'spearman', see DatasetAnalyzer
+    :param checks: names of the registered checks to run, or None for all, see DatasetAnalyzer.analyze
+    :return: EngineDatasetAnalyzer instance with completed analysis
+    """
+    analyzer = EngineDatasetAnalyzer(source, engine=engine, columns=columns, distinct_error=distinct_error,
+                                     instrument=instrument, outlier_method=outlier_method,
+                                     correlation_method=correlation_method)
+    analyzer.analyze(checks)
+    analyzer.print_recommendations()
+    return analyzer
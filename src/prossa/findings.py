@@ -0,0 +1,405 @@
+import json
+from collections.abc import Mapping
+
+HIGH_CARDINALITY_THRESHOLD = 10
+
+
+class Finding:
+    """
+    One structured result of a check: a metric measured on a column, or on the whole dataset.
+
+    Findings are what the checks produce; the text recommendations are rendered
+    from them only when they are asked for.
+    """
+
+    __slots__ = ('category', 'column', 'metric', 'value', 'detail')
+
+    def __init__(self, category, column, metric, value, detail=None):
+        """
+        Initialize a finding.
+
+        :param category: recommendation category, e.g. 'Missing Values'
+        :param column: column label, or None for dataset-level findings
+        :param metric: name of what was measured, e.g. 'null_count'
+        :param value: measured value
+        :param detail: optional dict of secondary values (fractions, interval bounds, ...)
+        """
+        self.category = category
+        self.column = column
+        self.metric = metric
+        self.value = value
+        self.detail = detail
+
+    def __repr__(self):
+        return (f"Finding({self.category!r}, {self.column!r}, {self.metric!r}, {self.value!r}"
+                + (f", {self.detail!r})" if self.detail else ")"))
+
+    def to_dict(self):
+        """
+        Convert the finding to a plain dict.
+
+        :return: dict with category, column, metric, value and detail keys
+        """
+        return {
+            'category': self.category,
+            'column': self.column,
+            'metric': self.metric,
+            'value': self.value,
+            'detail': self.detail,
+        }
+
+
+def _of(findings, metric):
+    return [finding for finding in findings if finding.metric == metric]
+
+
+def _render_missing_values(findings):
+    lines = []
+    columns = _of(findings, 'null_count')
+    sample = next(iter(_of(findings, 'sample_rows')), None)
+    if columns:
+        lines.append("Dataset contains missing values.")
+        if sample is not None:
+            lines.append(f"Estimated from a sample of {sample.value} of {sample.detail['population_rows']} rows "
+                         f"with {sample.detail['confidence']:.0%} confidence intervals.")
+        for finding in columns:
+            detail = finding.detail
+            percentage = detail['fraction'] * 100
+            if 'estimate' in detail:
+                lines.append(f"Column '{finding.column}' has about {detail['estimate']} ({percentage:.2f}%, "
+                             f"CI {detail['low'] * 100:.2f}%-{detail['high'] * 100:.2f}%) missing values.")
+            else:
+                lines.append(f"Column '{finding.column}' has {finding.value} ({percentage:.2f}%) missing values.")
+        lines.append("Consider the following techniques:")
+        lines.append("- Remove rows with missing values using dropna()")
+        lines.append("- Impute missing values using fillna() or more advanced techniques")
+        lines.append("- Use algorithms that handle missing values (e.g., some tree-based models)")
+    elif sample is not None:
+        lines.append(f"No missing values found in a sample of {sample.value} of {sample.detail['population_rows']} rows "
+                     f"(at most {sample.detail['max_fraction'] * 100:.2f}% per column at "
+                     f"{sample.detail['confidence']:.0%} confidence).")
+    else:
+        lines.append("No missing values found in the dataset.")
+    return lines
+
+
+OUTLIER_RULES = {
+    'zscore': ('z-score', "using z-score > {threshold}"),
+    'iqr': ('IQR', "outside the {threshold} x IQR fences"),
+    'mad': ('MAD', "using modified z-score > {threshold} from the median and MAD"),
+    'isolation': ('isolation forest', "using isolation score > {threshold}"),
+}
+
+
+def _render_outliers(findings):
+    lines = []
+    method = next(iter(_of(findings, 'method')), None)
+    name, rule = OUTLIER_RULES['zscore' if method is None else method.value]
+    rule = rule.format(threshold=3 if method is None else method.detail['threshold'])
+    for finding in findings:
+        if not finding.metric.endswith('_outliers'):
+            continue
+        detail = finding.detail or {}
+        if 'estimate' in detail:
+            lines.append(f"Column '{finding.column}' has about {detail['estimate']} (CI {detail['low']}-{detail['high']}) "
+                         f"potential outliers ({rule} in a sample of {detail['sample_rows']} rows).")
+        else:
+            lines.append(f"Column '{finding.column}' has {finding.value} potential outliers ({rule}).")
+    if lines:
+        lines.append("Consider the following techniques:")
+        lines.append("- Investigate and potentially remove outliers")
+        lines.append("- Use robust scaling methods (e.g., RobustScaler)")
+        lines.append("- Apply transformations (e.g., log transformation) to reduce the impact of outliers")
+    else:
+        lines.append(f"No significant outliers detected using the {name} method.")
+    return lines
+
+
+def _format_bytes(size):
+    for unit in ('B', 'KiB', 'MiB', 'GiB'):
+        if abs(size) < 1024 or unit == 'GiB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def _render_data_types(findings):
+    lines = [f"Column '{finding.column}' has data type: {finding.value}" for finding in _of(findings, 'dtype')]
+    downcasts = _of(findings, 'downcast')
+    for finding in downcasts:
+        detail = finding.detail
+        saved = f"about {_format_bytes(detail['estimate'])} over the whole dataset" if 'estimate' in detail \
+            else _format_bytes(detail['saved_bytes'])
+        lines.append(f"Column '{finding.column}' can be stored as {finding.value} instead of {detail['from']}, "
+                     f"saving {saved} ({detail['saved_bytes'] / detail['bytes']:.1%}).")
+    if downcasts:
+        saved = sum(finding.detail.get('estimate', finding.detail['saved_bytes']) for finding in downcasts)
+        lines.append(f"Downcasting these columns saves {_format_bytes(saved)} in total; "
+                     f"DatasetAnalyzer.downcast_frame() returns the downcast DataFrame.")
+    for finding in _of(findings, 'convert'):
+        detail = finding.detail
+        kind = {'numeric': 'numbers', 'boolean': 'booleans', 'datetime': 'dates'}[detail['kind']]
+        fmt = f" in the format {detail['format']}" if 'format' in detail else ''
+        lines.append(f"Column '{finding.column}' holds {kind} stored as objects{fmt} ({detail['parsed']:.1%} of "
+                     f"{detail['sample_rows']} sampled values parse); converting it to {finding.value} saves about "
+                     f"{_format_bytes(detail['saved_bytes'])} ({detail['saved_bytes'] / detail['bytes']:.0%}) and "
+                     f"replaces Python objects of about {detail['object_bytes']} bytes with {detail['value_bytes']}-byte "
+                     f"values that sort and compare without calling into Python.")
+    lines.append("Consider the following:")
+    lines.append("- Ensure numeric columns are of the appropriate type (int, float)")
+    lines.append("- Convert datetime columns to datetime type if not already")
+    lines.append("- Check for any unexpected data types")
+    return lines
+
+
+def _render_scaling_encoding(findings):
+    lines = []
+    counts = {finding.metric: finding.value for finding in findings}
+    if counts.get('numeric_columns', 0) > 0:
+        lines.append("Consider scaling numeric features:")
+        lines.append("- Use StandardScaler for normal distributions")
+        lines.append("- Use MinMaxScaler to scale to a specific range")
+        lines.append("- Use RobustScaler if outliers are present")
+    if counts.get('categorical_columns', 0) > 0:
+        lines.append("Consider encoding categorical features:")
+        lines.append("- Use OneHotEncoder for nominal categorical data")
+        lines.append("- Use OrdinalEncoder for ordinal categorical data")
+    return lines
+
+
+def _grouping_lines(finding, distinct):
+    detail = finding.detail
+    about = 'about ' if detail['approximate'] else ''
+    if finding.value == 0:
+        return [f"  - Every category holds less than {detail['min_share']:.1%} of rows; consider feature hashing "
+                f"or target encoding instead of grouping '{finding.column}'"]
+    top = ', '.join(f"'{value}' ({share:.1%})" for value, _, share in detail['top'])
+    lines = [f"  - Most frequent: {top}"]
+    if distinct > finding.value:
+        lines.append(f"  - Keep the {finding.value} categories with at least {about}{detail['min_count']} rows "
+                     f"({detail['kept_share']:.1%} of rows) and group the other {distinct - finding.value} "
+                     f"({detail['tail_share']:.1%} of rows) into 'other'")
+    return lines
+
+
+def _render_categorical_data(findings):
+    lines = []
+    columns = _of(findings, 'distinct')
+    grouping = {finding.column: finding for finding in _of(findings, 'grouping')}
+    for finding in columns:
+        lines.append(f"Column '{finding.column}' has {finding.value} unique categories.")
+        if finding.value > HIGH_CARDINALITY_THRESHOLD and finding.column in grouping:
+            lines.extend(_grouping_lines(grouping[finding.column], finding.value))
+        elif finding.value > HIGH_CARDINALITY_THRESHOLD:
+            lines.append(f"  - Consider grouping less frequent categories in '{finding.column}'")
+    if columns:
+        lines.append("General recommendations for categorical data:")
+        lines.append("- Use label encoding for ordinal categories")
+        lines.append("- Use one-hot encoding for nominal categories with few unique values")
+        lines.append("- Consider feature hashing for high-cardinality categorical data")
+    return lines
+
+
+def _render_constant_columns(findings):
+    columns = [finding.column for finding in _of(findings, 'constant')]
+    if not columns:
+        return ["No constant columns found in the dataset."]
+    return (["The following columns have constant values:"] + columns
+            + ["Consider removing these columns as they don't provide any information."])
+
+
+def _render_imputation(findings):
+    if not any(finding.value for finding in _of(findings, 'columns_with_missing')):
+        return ["No missing values found, imputation is not necessary."]
+    return [
+        " The data has missing imputations, consider the following imputation techniques:",
+        "- Simple imputation: mean, median, or mode",
+        "- Advanced imputation: KNN imputer, MICE, or domain-specific methods",
+        "- For time series data, consider forward fill or backward fill",
+        "- Create a binary column to indicate where values were imputed",
+    ]
+
+
+STATISTIC_NAMES = {'pearson': 'Pearson r', 'spearman': 'Spearman rho', 'cramers_v': "Cramér's V"}
+
+
+def _render_correlations(findings):
+    lines = []
+    duplicates = _of(findings, 'near_duplicate')
+    correlated = _of(findings, 'correlated')
+    for finding in duplicates:
+        lines.append(f"Columns '{finding.column}' and '{finding.detail['other']}' are near-duplicates "
+                     f"({STATISTIC_NAMES[finding.detail['statistic']]} = {finding.value:.3f}).")
+    for finding in correlated:
+        lines.append(f"Columns '{finding.column}' and '{finding.detail['other']}' are highly correlated "
+                     f"({STATISTIC_NAMES[finding.detail['statistic']]} = {finding.value:.3f}).")
+    if not lines:
+        return ["No highly correlated column pairs found."]
+    for finding in _of(findings, 'sample_rows'):
+        lines.append(f"Correlations were estimated from a sample of {finding.value} of {finding.detail['rows']} rows.")
+    lines.append("Consider the following techniques:")
+    if duplicates:
+        lines.append("- Drop one column of each near-duplicate pair")
+    lines.append("- Remove or combine highly correlated features (e.g., PCA)")
+    lines.append("- Use regularized models (e.g., Ridge) that are less sensitive to correlated features")
+    return lines
+
+
+DRIFT_NAMES = {
+    'psi': 'population stability index',
+    'ks': 'Kolmogorov-Smirnov statistic',
+    'null_rate_shift': 'null rate',
+    'cardinality_shift': 'distinct count',
+}
+
+
+def _render_drift(findings):
+    lines = []
+    for finding in _of(findings, 'n_rows'):
+        if finding.value != finding.detail['baseline']:
+            lines.append(f"Row count changed from {finding.detail['baseline']} to {finding.value}.")
+    drifted = [finding for finding in findings if finding.detail and finding.detail.get('drifted')]
+    if not drifted:
+        lines.append("No column drifted beyond the thresholds.")
+    for finding in drifted:
+        detail = finding.detail
+        if finding.metric in ('added', 'removed'):
+            lines.append(f"Column '{finding.column}' ({finding.value}) was {finding.metric}.")
+        elif finding.metric == 'dtype':
+            lines.append(f"Column '{finding.column}' changed type from {detail['baseline']} to {finding.value}.")
+        elif finding.metric == 'null_rate_shift':
+            lines.append(f"Column '{finding.column}' {DRIFT_NAMES[finding.metric]} changed from "
+                         f"{detail['baseline']:.2%} to {detail['current']:.2%}.")
+        elif finding.metric == 'cardinality_shift':
+            lines.append(f"Column '{finding.column}' {DRIFT_NAMES[finding.metric]} changed from about "
+                         f"{detail['baseline']} to {detail['current']} ({finding.value:+.0%}).")
+        else:
+            lines.append(f"Column '{finding.column}' distribution shifted "
+                         f"({DRIFT_NAMES[finding.metric]} = {finding.value:.3f}).")
+    return lines
+
+
+def _render_findings(findings):
+    lines = []
+    for finding in findings:
+        subject = f"Column '{finding.column}': " if finding.column is not None else ""
+        lines.append(f"{subject}{finding.metric} = {finding.value}")
+    return lines
+
+
+RENDERERS = {
+    'Missing Values': _render_missing_values,
+    'Outliers': _render_outliers,
+    'Data Types': _render_data_types,
+    'Scaling and Encoding': _render_scaling_encoding,
+    'Categorical Data': _render_categorical_data,
+    'Constant Columns': _render_constant_columns,
+    'Imputation': _render_imputation,
+    'Correlations': _render_correlations,
+    'Drift': _render_drift,
+}
+
+
+def render(category, findings):
+    """
+    Render the findings of one category as recommendation text.
+
+    :param category: recommendation category
+    :param findings: list of Finding instances of that category
+    :return: list of recommendation strings; findings of a category without a renderer are listed one per line
+    """
+    return RENDERERS.get(category, _render_findings)(findings)
+
+
+class Recommendations(Mapping):
+    """
+    Read-only mapping of category to recommendation text, rendered from findings on first access.
+    """
+
+    def __init__(self, findings):
+        """
+        Initialize the mapping over the analyzer's findings.
+
+        :param findings: dict mapping category to a list of Finding instances
+        """
+        self._findings = findings
+        self._rendered = {}
+
+    def __getitem__(self, category):
+        findings = self._findings[category]
+        rendered = self._rendered.get(category)
+        if rendered is None or rendered[0] is not findings:
+            rendered = (findings, render(category, findings))
+            self._rendered[category] = rendered
+        return rendered[1]
+
+    def __iter__(self):
+        return iter(self._findings)
+
+    def __len__(self):
+        return len(self._findings)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+def to_records(findings):
+    """
+    Flatten findings of all categories into a list of plain dicts.
+
+    :param findings: dict mapping category to a list of Finding instances
+    :return: list of dicts, see Finding.to_dict
+    """
+    return [finding.to_dict() for category_findings in findings.values() for finding in category_findings]
+
+
+def to_json(findings, path=None, **json_kwargs):
+    """
+    Serialize findings to JSON.
+
+    :param findings: dict mapping category to a list of Finding instances
+    :param path: optional file path to write to
+    :param json_kwargs: extra keyword arguments passed to json.dumps
+    :return: JSON string
+    """
+    text = json.dumps(to_records(findings), default=_json_default, **json_kwargs)
+    if path is not None:
+        with open(path, 'w') as file:
+            file.write(text)
+    return text
+
+
+def _json_default(value):
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def to_arrow(findings):
+    """
+    Convert findings to a pyarrow Table for columnar consumers.
+
+    Numeric values go to the ``value`` column and textual ones to ``text``;
+    ``detail`` is kept as a JSON string.
+
+    :param findings: dict mapping category to a list of Finding instances
+    :return: pyarrow.Table with category, column, metric, value, text and detail columns
+    """
+    try:
+        import pyarrow as pa
+    except ImportError as error:
+        raise ImportError("to_arrow() requires pyarrow; install it with 'pip install pyarrow'") from error
+
+    records = to_records(findings)
+    numeric = [isinstance(record['value'], (int, float)) for record in records]
+    return pa.table({
+        'category': pa.array([record['category'] for record in records], pa.string()),
+        'column': pa.array([None if record['column'] is None else str(record['column']) for record in records],
+                           pa.string()),
+        'metric': pa.array([record['metric'] for record in records], pa.string()),
+        'value': pa.array([float(record['value']) if is_numeric else None
+                           for record, is_numeric in zip(records, numeric)], pa.float64()),
+        'text': pa.array([None if is_numeric else str(record['value'])
+                          for record, is_numeric in zip(records, numeric)], pa.string()),
+        'detail': pa.array([None if record['detail'] is None else json.dumps(record['detail'], default=_json_default)
+                            for record in records], pa.string()),
+    })
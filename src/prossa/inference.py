@@ -0,0 +1,178 @@
+import time
+import warnings
+import numpy as np
+import pandas as pd
+from pandas.api import types as ptypes
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:
+    from pandas.core.tools.datetimes import guess_datetime_format
+
+INFERENCE_SAMPLE_ROWS = 10000
+PROBE_ROWS = 200
+PARSE_THRESHOLD = 0.95
+BOOLEAN_VALUES = {'true': True, 'false': False, 'yes': True, 'no': False, 't': True, 'f': False, 'y': True, 'n': False}
+
+
+def _parse_numeric(values):
+    return pd.to_numeric(values, errors='coerce'), None
+
+
+def _parse_boolean_strings(values):
+    return values.str.strip().str.lower().map(BOOLEAN_VALUES), None
+
+
+def _parse_date_strings(values):
+    # Formats guessed from the first value; day-first and month-first differ only for dates like 01/02/2020
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning)
+        formats = dict.fromkeys(guess_datetime_format(values.iloc[0], dayfirst=dayfirst) for dayfirst in (False, True))
+    parsed = [(pd.to_datetime(values, format=fmt or 'ISO8601', errors='coerce'), fmt) for fmt in formats]
+    return max(parsed, key=lambda result: result[0].notna().sum())
+
+
+def _parse_dates(values):
+    return pd.to_datetime(values, errors='coerce'), None
+
+
+def _identity(values):
+    return values, None
+
+
+# Parsers tried, in order, for each kind of values found by pandas.api.types.infer_dtype
+PARSERS = {
+    'string': (('numeric', _parse_numeric), ('boolean', _parse_boolean_strings), ('datetime', _parse_date_strings)),
+    'integer': (('numeric', _parse_numeric),),
+    'floating': (('numeric', _parse_numeric),),
+    'mixed-integer-float': (('numeric', _parse_numeric),),
+    'decimal': (('numeric', _parse_numeric),),
+    'boolean': (('boolean', _identity),),
+    'datetime': (('datetime', _parse_dates),),
+    'date': (('datetime', _parse_dates),),
+}
+
+
+def _success(parsed):
+    return float(parsed.notna().mean()) if len(parsed) else 0.0
+
+
+def _converted(kind, parsed, has_nulls):
+    """
+    The parsed values stored with the dtype the column would be converted to.
+    """
+    if kind == 'numeric':
+        values = parsed.dropna()
+        if not has_nulls and len(values) == len(parsed) and (values == np.floor(values)).all():
+            return parsed.astype(np.int64)
+        return parsed.astype(np.float64)
+    if kind == 'boolean':
+        return parsed.astype(bool) if not has_nulls and parsed.notna().all() else parsed.astype('boolean')
+    return parsed
+
+
+def infer_column(series, threshold=PARSE_THRESHOLD, probe_rows=PROBE_ROWS):
+    """
+    Find out whether the values of an object column are numbers, booleans or dates stored as objects.
+
+    pandas.api.types.infer_dtype tells which parsers can apply. Each parser first
+    runs on the first ``probe_rows`` non-missing values and is abandoned as soon as
+    too few of them parse; only a parser that passes the probe runs on all values.
+
+    :param series: pandas Series of object dtype, typically a bounded sample of a column
+    :param threshold: smallest fraction of non-missing values that must parse
+    :param probe_rows: number of values tried before all of them
+    :return: tuple (kind, parsed Series of the non-missing values, fraction parsed, datetime format or None),
+        or None if no parser reaches the threshold
+    """
+    values = series.dropna()
+    if values.empty:
+        return None
+    for kind, parse in PARSERS.get(ptypes.infer_dtype(values, skipna=True), ()):
+        if _success(parse(values.iloc[:probe_rows])[0]) < threshold:
+            continue
+        parsed, fmt = parse(values)
+        rate = _success(parsed)
+        if rate >= threshold:
+            return kind, parsed, rate, fmt
+    return None
+
+
+def _conversion(series, n_rows, threshold, probe_rows):
+    """
+    Target dtype and detail dict of the conversion of one sampled object column, or None; see infer_types.
+    """
+    inferred = infer_column(series, threshold, probe_rows)
+    if inferred is None:
+        return None
+    kind, parsed, rate, fmt = inferred
+    has_nulls = len(parsed) < len(series)
+    converted = _converted(kind, parsed.reindex(series.index), has_nulls)
+    object_bytes = series.memory_usage(index=False, deep=True) / len(series)
+    value_bytes = converted.memory_usage(index=False, deep=True) / len(series)
+    before, after = object_bytes * n_rows, value_bytes * n_rows
+    detail = {
+        'kind': kind,
+        'parsed': rate,
+        'sample_rows': len(series),
+        'bytes': int(before),
+        'saved_bytes': int(before - after),
+        'object_bytes': round(object_bytes),
+        'value_bytes': round(value_bytes),
+    }
+    if fmt is not None:
+        detail['format'] = fmt
+    return str(converted.dtype), detail
+
+
+def infer_types(sample, n_rows=None, threshold=PARSE_THRESHOLD, probe_rows=PROBE_ROWS, on_column=None):
+    """
+    Classify the object columns of a sample by the type their values parse as, with the gain of converting them.
+
+    The memory gain compares ``memory_usage(deep=True)`` of each sampled column with
+    and without conversion, scaled to ``n_rows``. The speed gain is given by the same
+    measure per value: the average size of the Python objects, which every sort or
+    comparison has to call into, against the width of the native values replacing them.
+
+    :param sample: pandas DataFrame holding a bounded sample of rows
+    :param n_rows: number of rows of the whole dataset, to scale the memory gain to; the sample size by default
+    :param threshold: smallest fraction of non-missing values that must parse
+    :param probe_rows: number of values tried before all of them, see infer_column
+    :param on_column: optional per-column timing callback, see profile.DatasetProfile.from_frame
+    :return: list of tuples (column label, target dtype, detail dict) in column order; detail holds
+        ``kind``, ``parsed`` (fraction of sampled non-missing values that parse), ``sample_rows``,
+        ``bytes``, ``saved_bytes``, ``object_bytes`` and ``value_bytes`` (average bytes per value before
+        and after conversion) and, for dates, ``format``
+    """
+    n_rows = len(sample) if n_rows is None else n_rows
+    results = []
+    for name, series in sample.items():
+        if series.dtype != object or len(series) == 0:
+            continue
+        started = time.perf_counter()
+        conversion = _conversion(series, n_rows, threshold, probe_rows)
+        if conversion is not None:
+            results.append((name, *conversion))
+        if on_column is not None:
+            on_column(name, time.perf_counter() - started, len(series))
+    return results
+
+
+def head_rows(chunks, size=INFERENCE_SAMPLE_ROWS):
+    """
+    Collect the first rows of a stream of chunks, reading no more chunks than needed.
+
+    :param chunks: iterable of pandas DataFrames
+    :param size: number of rows to collect
+    :return: pandas DataFrame with at most ``size`` rows, or None if there are no chunks
+    """
+    collected = []
+    count = 0
+    for chunk in chunks:
+        collected.append(chunk.iloc[:size - count])
+        count += len(collected[-1])
+        if count >= size:
+            break
+    if hasattr(chunks, 'close'):
+        chunks.close()
+    return pd.concat(collected) if collected else None
@@ -0,0 +1,159 @@
+import functools
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class StageMetrics:
+    """
+    Resource usage of one stage of an analysis (building the profile, or one check).
+    """
+
+    __slots__ = ('name', 'wall_seconds', 'cpu_seconds', 'peak_bytes', 'rows', 'columns', 'per_column')
+
+    def __init__(self, name):
+        """
+        Initialize empty metrics for a stage.
+
+        :param name: stage name, e.g. 'profile' or 'check_outliers'
+        """
+        self.name = name
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.peak_bytes = None
+        self.rows = None
+        self.columns = None
+        self.per_column = {}
+
+    def add_column(self, column, seconds, rows):
+        """
+        Record the time spent on one column, accumulating over chunks.
+
+        :param column: column label
+        :param seconds: wall time spent on the column
+        :param rows: number of rows of the column processed
+        """
+        totals = self.per_column.setdefault(column, {'wall_seconds': 0.0, 'rows': 0})
+        totals['wall_seconds'] += seconds
+        totals['rows'] += rows
+
+    def to_dict(self):
+        """
+        Convert the metrics to a plain dict.
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return (f"StageMetrics({self.name!r}, wall_seconds={self.wall_seconds:.6f}, cpu_seconds={self.cpu_seconds:.6f}, "
+                f"peak_bytes={self.peak_bytes}, rows={self.rows}, columns={self.columns})")
+
+
+class Instrumentation:
+    """
+    Collects StageMetrics for the stages of an analysis and forwards them to hooks.
+    """
+
+    def __init__(self, trace_memory=False, hooks=None):
+        """
+        Initialize the collector.
+
+        :param trace_memory: record peak allocations with tracemalloc, which slows the analysis down
+        :param hooks: callables invoked with each StageMetrics as soon as its stage ends,
+            e.g. to forward them to a metrics system
+        """
+        self.trace_memory = trace_memory
+        self.hooks = list(hooks or [])
+        self.stages = []
+        # Open stages, innermost last, each with the highest peak erased by the resets of stages nested in it
+        self._open = []
+
+    @property
+    def current(self):
+        """
+        StageMetrics of the innermost stage being measured, or None outside any stage.
+        """
+        return self._open[-1][0] if self._open else None
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Measure the enclosed code as one stage.
+
+        Stages may be nested, e.g. the profile built inside the first check; the peak
+        allocation of an enclosing stage still covers the stages nested in it.
+
+        :param name: stage name
+        :return: context manager yielding the StageMetrics being filled in
+        """
+        metrics = StageMetrics(name)
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            elif hasattr(tracemalloc, 'reset_peak'):
+                peak = tracemalloc.get_traced_memory()[1]
+                for frame in self._open:
+                    frame[1] = max(frame[1], peak)
+                tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        frame = [metrics, 0]
+        self._open.append(frame)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield metrics
+        finally:
+            metrics.wall_seconds = time.perf_counter() - wall
+            metrics.cpu_seconds = time.process_time() - cpu
+            self._open.pop()
+            if self.trace_memory:
+                metrics.peak_bytes = max(0, max(frame[1], tracemalloc.get_traced_memory()[1]) - baseline)
+                if started_tracing:
+                    tracemalloc.stop()
+            self.stages.append(metrics)
+            for hook in self.hooks:
+                hook(metrics)
+
+    def to_records(self):
+        """
+        Return the metrics of all stages as a list of plain dicts.
+        """
+        return [metrics.to_dict() for metrics in self.stages]
+
+    def summary(self):
+        """
+        Format the metrics of all stages as a text table.
+
+        :return: multi-line string
+        """
+        lines = [f"{'stage':<24} {'wall ms':>10} {'cpu ms':>10} {'peak MiB':>10} {'rows':>12} {'columns':>8}"]
+        for metrics in self.stages:
+            peak = '' if metrics.peak_bytes is None else f"{metrics.peak_bytes / 2 ** 20:.1f}"
+            lines.append(f"{metrics.name:<24} {metrics.wall_seconds * 1000:>10.1f} {metrics.cpu_seconds * 1000:>10.1f} "
+                         f"{peak:>10} {metrics.rows if metrics.rows is not None else '':>12} "
+                         f"{metrics.columns if metrics.columns is not None else '':>8}")
+        return '\n'.join(lines)
+
+
+def instrumented(*kinds):
+    """
+    Decorate a DatasetAnalyzer check so that it is measured when instrumentation is enabled.
+
+    When the analyzer has no instrumentation the check runs directly, so the only
+    overhead is one attribute lookup per check.
+
+    :param kinds: dtype classes of the columns the check examines; all columns if empty
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.instrumentation is None:
+                return method(self, *args, **kwargs)
+            with self.instrumentation.stage(method.__name__) as metrics:
+                result = method(self, *args, **kwargs)
+                profile = self.profile
+                metrics.rows = profile.n_rows
+                metrics.columns = (sum(len(profile.of_kind(kind)) for kind in kinds) if kinds else len(profile))
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,572 @@
+import math
+import numpy as np
+from pandas.api import types as ptypes
+from .profile import numeric_values
+from .parallel import effective_n_jobs, map_columns, map_items
+from .sketches import KLLSketch, update_sketches
+
+DEFAULT_BLOCK_SIZE = 65536
+OUTLIER_METHODS = ('zscore', 'iqr', 'mad', 'isolation')
+DEFAULT_THRESHOLDS = {'zscore': 3, 'iqr': 1.5, 'mad': 3.5, 'isolation': 0.75}
+EXACT_QUANTILE_ROWS = 1000000
+
+
+def numeric_block(frame, names, start, stop):
+    """
+    Copy a block of rows of several numeric columns into one float64 array.
+
+    :param frame: pandas DataFrame holding the columns
+    :param names: column labels to include, in order
+    :param start: first row of the block
+    :param stop: row after the last row of the block
+    :return: numpy array of shape (stop - start, len(names)), missing values as NaN
+    """
+    positions = frame.columns.get_indexer(names)
+    rows = frame.iloc[start:stop]
+    block = rows.iloc[:, positions].to_numpy(dtype=np.float64, na_value=np.nan)
+    for offset, position in enumerate(positions):
+        series = rows.iloc[:, position]
+        if ptypes.is_timedelta64_dtype(series.dtype):
+            block[:, offset] = numeric_values(series).to_numpy(dtype=np.float64, na_value=np.nan)
+    return block
+
+
+class ZScoreOutliers:
+    """
+    Two-pass z-score outlier detection over all numeric columns at once.
+
+    The first pass accumulates per-column count, mean and sum of squared deviations
+    with the parallel Welford update; the second pass counts values whose absolute
+    z-score exceeds the threshold. Both passes work on blocks of rows across all
+    columns, so temporaries are bounded by ``block_size * len(names)`` floats however
+    long the columns are, and both accept any number of chunks of the same dataset.
+    """
+
+    def __init__(self, names, threshold=3, block_size=DEFAULT_BLOCK_SIZE):
+        """
+        Initialize the detector with empty moments.
+
+        :param names: labels of the numeric columns to check
+        :param threshold: absolute z-score above which a value is an outlier
+        :param block_size: number of rows processed per vectorised step
+        """
+        self.names = list(names)
+        self.threshold = threshold
+        self.block_size = block_size
+        self.count = np.zeros(len(self.names), dtype=np.int64)
+        self.mean = np.zeros(len(self.names))
+        self.m2 = np.zeros(len(self.names))
+        self.outliers = np.zeros(len(self.names), dtype=np.int64)
+
+    @classmethod
+    def from_profiles(cls, columns, threshold=3, block_size=DEFAULT_BLOCK_SIZE):
+        """
+        Initialize the detector from already profiled columns, skipping the first pass.
+
+        :param columns: numeric ColumnProfile instances
+        :param threshold: absolute z-score above which a value is an outlier
+        :param block_size: number of rows processed per vectorised step
+        :return: ZScoreOutliers instance ready for update_counts
+        """
+        detector = cls([column.name for column in columns], threshold, block_size)
+        for position, column in enumerate(columns):
+            if column.count > 0:
+                detector.count[position] = column.count
+                detector.mean[position] = column.mean
+                detector.m2[position] = column.std ** 2 * column.count
+        return detector
+
+    @property
+    def std(self):
+        """
+        Population standard deviation of each column, NaN for empty columns.
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.sqrt(self.m2 / self.count)
+
+    def _blocks(self, frame):
+        for start in range(0, len(frame), self.block_size):
+            yield numeric_block(frame, self.names, start, start + self.block_size)
+
+    def update_moments(self, frame):
+        """
+        First pass: fold the rows of a DataFrame or chunk into the running moments.
+
+        :param frame: pandas DataFrame holding the columns
+        :return: the detector itself
+        """
+        for block in self._blocks(frame):
+            count = np.count_nonzero(~np.isnan(block), axis=0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                mean = np.nansum(block, axis=0) / count
+            np.subtract(block, mean, out=block)
+            np.square(block, out=block)
+            m2 = np.nansum(block, axis=0)
+
+            total = self.count + count
+            seen = count > 0
+            delta = np.where(seen, mean - self.mean, 0.0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                weight = np.where(seen, count / total, 0.0)
+            self.mean += delta * weight
+            self.m2 += np.where(seen, m2, 0.0) + delta ** 2 * self.count * weight
+            self.count = total
+        return self
+
+    def update_counts(self, frame):
+        """
+        Second pass: count the outliers in the rows of a DataFrame or chunk.
+
+        :param frame: pandas DataFrame holding the columns
+        :return: the detector itself
+        """
+        std = self.std
+        for block in self._blocks(frame):
+            np.subtract(block, self.mean, out=block)
+            np.abs(block, out=block)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                np.divide(block, std, out=block)
+            self.outliers += np.count_nonzero(block > self.threshold, axis=0)
+        return self
+
+    def counts(self):
+        """
+        Outlier counts accumulated so far, one per column.
+
+        :return: list of ints in the order of ``names``
+        """
+        return [int(count) for count in self.outliers]
+
+
+def _count_column_outliers(columns, profiles, threshold=3, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Count z-score outliers column by column; the worker function of parallel outlier counting.
+    """
+    return [
+        ZScoreOutliers.from_profiles([profile], threshold, block_size).update_counts(series.to_frame()).counts()[0]
+        for series, profile in zip(columns, profiles)
+    ]
+
+
+def count_profiled_outliers(frame, columns, threshold=3, n_jobs=1, backend='thread', block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Count z-score outliers of profiled columns, optionally spreading the columns over workers.
+
+    :param frame: pandas DataFrame or chunk holding the columns
+    :param columns: numeric ColumnProfile instances providing each column's mean and standard deviation
+    :param threshold: absolute z-score above which a value is an outlier
+    :param n_jobs: number of workers, see parallel.effective_n_jobs
+    :param backend: 'thread' or 'process'
+    :param block_size: number of rows processed per vectorised step
+    :return: list of outlier counts, one per column
+    """
+    if effective_n_jobs(n_jobs) == 1:
+        return ZScoreOutliers.from_profiles(columns, threshold, block_size).update_counts(frame).counts()
+    positions = frame.columns.get_indexer([column.name for column in columns])
+    return map_columns(_count_column_outliers, frame, positions, items=columns, n_jobs=n_jobs, backend=backend,
+                       threshold=threshold, block_size=block_size)
+
+
+class FenceOutliers:
+    """
+    Robust outlier detection with per-column fences: IQR fences or median/MAD.
+
+    With ``method='iqr'`` a value is an outlier outside ``[Q1 - t * IQR, Q3 + t * IQR]``;
+    with ``method='mad'`` when its modified z-score ``0.6745 * |x - median| / MAD``
+    exceeds ``t``. Fences come either from the exact quantiles of a whole DataFrame,
+    one column at a time (fit_exact), or from one KLL quantile sketch per column fed
+    block by block for all columns at once (update, merge, fit), which bounds memory
+    and lets chunks be sketched in parallel. Values are compared against the fences of
+    all columns at once, block by block.
+    """
+
+    def __init__(self, names, method='iqr', threshold=None, sketch_size=200, block_size=DEFAULT_BLOCK_SIZE,
+                 random_state=0):
+        """
+        Initialize the detector with empty sketches.
+
+        :param names: labels of the numeric columns to check
+        :param method: 'iqr' or 'mad'
+        :param threshold: fence multiplier, 1.5 for 'iqr' and 3.5 for 'mad' by default
+        :param sketch_size: ``k`` of the KLL sketches
+        :param block_size: number of rows processed per vectorised step
+        :param random_state: seed of the sketches' compaction offsets
+        """
+        if method not in ('iqr', 'mad'):
+            raise ValueError(f"Unknown fence method '{method}', expected 'iqr' or 'mad'")
+        self.names = list(names)
+        self.method = method
+        self.threshold = DEFAULT_THRESHOLDS[method] if threshold is None else threshold
+        self.block_size = block_size
+        self.sketches = [KLLSketch(sketch_size, random_state) for _ in self.names]
+        self.lower = np.full(len(self.names), np.nan)
+        self.upper = np.full(len(self.names), np.nan)
+        self.outliers = np.zeros(len(self.names), dtype=np.int64)
+
+    def _blocks(self, frame):
+        for start in range(0, len(frame), self.block_size):
+            yield numeric_block(frame, self.names, start, start + self.block_size)
+
+    def _set_fences(self, low, center, high):
+        if self.method == 'iqr':
+            spread = self.threshold * (high - low)
+            self.lower, self.upper = low - spread, high + spread
+        else:
+            with np.errstate(invalid='ignore'):
+                spread = np.where(center > 0, self.threshold * center / 0.6745, np.inf)
+            self.lower, self.upper = low - spread, low + spread
+        return self
+
+    def fit_exact(self, frame):
+        """
+        Set the fences from the exact quantiles of a whole DataFrame.
+
+        Columns are read one at a time and their quantiles are selected in place, so
+        the temporaries hold one column's values rather than the whole table.
+
+        :param frame: pandas DataFrame holding the columns
+        :return: the detector itself
+        """
+        low = np.full(len(self.names), np.nan)
+        center = np.full(len(self.names), np.nan)
+        high = np.full(len(self.names), np.nan)
+        for position, name in enumerate(self.names):
+            values = numeric_block(frame, [name], 0, len(frame))[:, 0]
+            values = values[~np.isnan(values)]
+            if not len(values):
+                continue
+            if self.method == 'iqr':
+                low[position], high[position] = np.quantile(values, [0.25, 0.75], overwrite_input=True)
+            else:
+                low[position] = np.median(values, overwrite_input=True)
+                np.subtract(values, low[position], out=values)
+                np.abs(values, out=values)
+                center[position] = np.median(values, overwrite_input=True)
+        return self._set_fences(low, center, high)
+
+    def update(self, frame):
+        """
+        First pass: add the rows of a DataFrame or chunk to the quantile sketches.
+
+        :param frame: pandas DataFrame holding the columns
+        :return: the detector itself
+        """
+        for block in self._blocks(frame):
+            update_sketches(self.sketches, block)
+        return self
+
+    def merge(self, other):
+        """
+        Fold the sketches of a detector fed with other rows into this one.
+
+        :param other: FenceOutliers with the same names and method
+        :return: the detector itself
+        """
+        for sketch, other_sketch in zip(self.sketches, other.sketches):
+            sketch.merge(other_sketch)
+        return self
+
+    def fit(self):
+        """
+        Set the fences from the quantile sketches.
+
+        :return: the detector itself
+        """
+        if self.method == 'iqr':
+            quartiles = np.array([sketch.quantile([0.25, 0.75]) for sketch in self.sketches]).reshape(-1, 2)
+            return self._set_fences(quartiles[:, 0], None, quartiles[:, 1])
+        median = np.array([sketch.quantile(0.5) for sketch in self.sketches])
+        mad = np.array([sketch.mad(center) for sketch, center in zip(self.sketches, median)])
+        return self._set_fences(median, mad, None)
+
+    def update_counts(self, frame):
+        """
+        Second pass: count the values outside the fences in the rows of a DataFrame or chunk.
+
+        :param frame: pandas DataFrame holding the columns
+        :return: the detector itself
+        """
+        for block in self._blocks(frame):
+            with np.errstate(invalid='ignore'):
+                self.outliers += np.count_nonzero((block < self.lower) | (block > self.upper), axis=0)
+        return self
+
+    def counts(self):
+        """
+        Outlier counts accumulated so far, one per column.
+
+        :return: list of ints in the order of ``names``
+        """
+        return [int(count) for count in self.outliers]
+
+
+def average_path_length(n):
+    """
+    Average path length of an unsuccessful binary search tree lookup among ``n`` values.
+
+    :param n: number or numpy array of subset sizes
+    :return: float or numpy array
+    """
+    n = np.asarray(n, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        length = 2 * (np.log(n - 1) + np.euler_gamma) - 2 * (n - 1) / n
+    return np.where(n > 2, length, np.where(n == 2, 1.0, 0.0))[()]
+
+
+class IsolationOutliers:
+    """
+    Isolation-forest-style outlier scores for each numeric column on its own.
+
+    A value is easy to isolate when random splits between the smallest and largest
+    values separate it from the rest after few steps. On one column every isolation
+    tree partitions the line into intervals, so the trees of a column collapse into
+    one sorted array of split points with the average path length between each pair.
+    Only the points where the outlier flag changes are kept, usually a handful per
+    column, and a block of values is scored against all columns at once with no
+    per-value tree traversal. The trees are grown level by level, vectorised over all
+    trees of a column, from a uniform sample kept in a mergeable bottom-k reservoir.
+    """
+
+    def __init__(self, names, threshold=None, n_trees=100, sample_size=256, reservoir_size=4096,
+                 block_size=DEFAULT_BLOCK_SIZE, random_state=0):
+        """
+        Initialize the detector with empty reservoirs.
+
+        :param names: labels of the numeric columns to check
+        :param threshold: anomaly score, between 0 and 1, above which a value is an outlier; 0.75 by default
+        :param n_trees: number of isolation trees per column
+        :param sample_size: number of values each tree is grown from
+        :param reservoir_size: number of values per column kept to grow the trees from
+        :param block_size: number of rows processed per vectorised step
+        :param random_state: seed or numpy Generator used for sampling and splits
+        """
+        self.names = list(names)
+        self.threshold = DEFAULT_THRESHOLDS['isolation'] if threshold is None else threshold
+        self.n_trees = n_trees
+        self.sample_size = sample_size
+        self.reservoir_size = reservoir_size
+        self.block_size = block_size
+        self._rng = np.random.default_rng(random_state)
+        self.sample = np.empty((0, len(self.names)))
+        self.keys = np.empty((0, len(self.names)))
+        self.tables = None
+        self.outliers = np.zeros(len(self.names), dtype=np.int64)
+
+    def _blocks(self, frame):
+        for start in range(0, len(frame), self.block_size):
+            yield numeric_block(frame, self.names, start, start + self.block_size)
+
+    def _keep(self, sample, keys):
+        if len(keys) > self.reservoir_size:
+            order = np.argpartition(keys, self.reservoir_size - 1, axis=0)[:self.reservoir_size]
+            sample = np.take_along_axis(sample, order, axis=0)
+            keys = np.take_along_axis(keys, order, axis=0)
+        self.sample, self.keys = sample, keys
+
+    def update(self, frame):
+        """
+        First pass: offer the rows of a DataFrame or chunk to the per-column reservoirs.
+
+        Every non-missing value gets a uniform random key and each column keeps the
+        values with the smallest keys, which is a uniform sample without replacement
+        of everything offered so far.
+
+        :param frame: pandas DataFrame holding the columns
+        :return: the detector itself
+        """
+        for block in self._blocks(frame):
+            keys = self._rng.random(block.shape)
+            keys[np.isnan(block)] = np.inf
+            self._keep(np.concatenate([self.sample, block]), np.concatenate([self.keys, keys]))
+        return self
+
+    def merge(self, other):
+        """
+        Fold the reservoirs of a detector fed with other rows into this one.
+
+        :param other: IsolationOutliers with the same names and a different random state
+        :return: the detector itself
+        """
+        self._keep(np.concatenate([self.sample, other.sample]), np.concatenate([self.keys, other.keys]))
+        return self
+
+    def _fit_column(self, values):
+        """
+        Grow the trees of one column and collapse them into (split points, outlier flag per interval).
+        """
+        if len(values) < 2 or values.min() == values.max():
+            return np.empty(0), np.zeros(1, dtype=bool)
+        size = min(self.sample_size, len(values))
+        order = np.argsort(self._rng.random((self.n_trees, len(values))), axis=1)[:, :size]
+        trees = np.sort(values[order], axis=1)
+        limit = math.ceil(math.log2(size))
+        positions = np.arange(size)
+
+        tree = np.arange(self.n_trees)
+        start = np.zeros(self.n_trees, dtype=np.intp)
+        stop = np.full(self.n_trees, size)
+        low = np.full(self.n_trees, -np.inf)
+        high = np.full(self.n_trees, np.inf)
+        depth = 0
+        leaves = []
+        while len(tree):
+            first, last = trees[tree, start], trees[tree, stop - 1]
+            leaf = (stop - start <= 1) | (first == last) | (depth >= limit)
+            leaves.append((low[leaf], high[leaf], depth + average_path_length(stop[leaf] - start[leaf])))
+            split = ~leaf
+            tree, start, stop, low, high = tree[split], start[split], stop[split], low[split], high[split]
+            first, last = first[split], last[split]
+            cut = first + self._rng.random(len(tree)) * (last - first)
+            inside = (positions >= start[:, None]) & (positions < stop[:, None])
+            middle = start + np.count_nonzero(inside & (trees[tree] < cut[:, None]), axis=1)
+            tree = np.concatenate([tree, tree])
+            start, stop = np.concatenate([start, middle]), np.concatenate([middle, stop])
+            low, high = np.concatenate([low, cut]), np.concatenate([cut, high])
+            depth += 1
+
+        low, high, length = (np.concatenate(parts) for parts in zip(*leaves))
+        bounds = np.unique(low[np.isfinite(low)])
+        first = np.searchsorted(bounds, low, side='right')
+        after = np.where(np.isinf(high), len(bounds) + 1, np.searchsorted(bounds, high, side='right'))
+        total = np.zeros(len(bounds) + 2)
+        np.add.at(total, first, length)
+        np.add.at(total, after, -length)
+        mean_length = np.cumsum(total)[:len(bounds) + 1] / self.n_trees
+        flagged = 2.0 ** (-mean_length / average_path_length(size)) > self.threshold
+        change = np.flatnonzero(flagged[1:] != flagged[:-1])
+        return bounds[change], flagged[np.concatenate([[0], change + 1])]
+
+    def fit(self):
+        """
+        Grow the isolation trees of every column from its reservoir.
+
+        :return: the detector itself
+        """
+        tables = [
+            self._fit_column(self.sample[np.isfinite(self.keys[:, position]), position])
+            for position in range(len(self.names))
+        ]
+        width = max((len(bounds) for bounds, _ in tables), default=0)
+        self.tables = (
+            np.array([np.pad(bounds, (0, width - len(bounds)), constant_values=np.inf) for bounds, _ in tables],
+                     dtype=np.float64).reshape(len(tables), width),
+            np.array([np.pad(flagged, (0, width + 1 - len(flagged)), mode='edge') for _, flagged in tables],
+                     dtype=bool).reshape(len(tables), width + 1),
+        )
+        return self
+
+    def update_counts(self, frame):
+        """
+        Second pass: count the values scoring above the threshold in the rows of a DataFrame or chunk.
+
+        :param frame: pandas DataFrame holding the columns
+        :return: the detector itself
+        """
+        bounds, flagged = self.tables
+        for block in self._blocks(frame):
+            interval = np.zeros(block.shape, dtype=np.intp)
+            for bound in bounds.T:
+                interval += block >= bound
+            outlier = np.take_along_axis(flagged.T, interval, axis=0) & ~np.isnan(block)
+            self.outliers += np.count_nonzero(outlier, axis=0)
+        return self
+
+    def counts(self):
+        """
+        Outlier counts accumulated so far, one per column.
+
+        :return: list of ints in the order of ``names``
+        """
+        return [int(count) for count in self.outliers]
+
+
+def make_detector(method, names, threshold=None, random_state=0, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Create the detector of a robust outlier method.
+
+    :param method: 'iqr', 'mad' or 'isolation'
+    :param names: labels of the numeric columns to check
+    :param threshold: method-specific threshold, see DEFAULT_THRESHOLDS
+    :param random_state: seed or numpy Generator of the detector
+    :param block_size: number of rows processed per vectorised step
+    :return: FenceOutliers or IsolationOutliers
+    """
+    if method == 'isolation':
+        return IsolationOutliers(names, threshold, block_size=block_size, random_state=random_state)
+    if method in ('iqr', 'mad'):
+        return FenceOutliers(names, method, threshold, block_size=block_size, random_state=random_state)
+    raise ValueError(f"Unknown outlier method '{method}', expected one of {OUTLIER_METHODS}")
+
+
+def _fit_rows(rows, method, names, threshold=None):
+    """
+    Feed one range of rows, given with its seed, to a fresh detector; the worker function of the parallel first pass.
+    """
+    frame, seed = rows
+    return make_detector(method, names, threshold, np.random.default_rng(seed)).update(frame)
+
+
+def _count_rows(frame, detector):
+    """
+    Count the outliers of one range of rows; the worker function of the parallel second pass.
+    """
+    detector.outliers = np.zeros(len(detector.names), dtype=np.int64)
+    return detector.update_counts(frame).outliers
+
+
+def count_method_outliers(frame, names, method, threshold=None, n_jobs=1, backend='thread', random_state=0):
+    """
+    Count the outliers of numeric columns of a DataFrame with a robust method.
+
+    IQR and MAD use exact quantiles up to EXACT_QUANTILE_ROWS rows and quantile
+    sketches beyond. With several workers the rows are split into contiguous ranges
+    that are sketched and counted in parallel, and the sketches are merged in between.
+
+    :param frame: pandas DataFrame holding the columns
+    :param names: labels of the numeric columns to check
+    :param method: 'iqr', 'mad' or 'isolation'
+    :param threshold: method-specific threshold, see DEFAULT_THRESHOLDS
+    :param n_jobs: number of workers, see parallel.effective_n_jobs
+    :param backend: 'thread' or 'process'
+    :param random_state: seed of the detectors
+    :return: list of outlier counts, one per column
+    """
+    detector = make_detector(method, names, threshold, random_state)
+    n_jobs = min(effective_n_jobs(n_jobs), max(1, len(frame) // DEFAULT_BLOCK_SIZE))
+    if method != 'isolation' and len(frame) <= EXACT_QUANTILE_ROWS:
+        detector.fit_exact(frame)
+    elif n_jobs == 1:
+        detector.update(frame).fit()
+    else:
+        bounds = np.linspace(0, len(frame), n_jobs + 1).astype(int)
+        ranges = [frame.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+        seeds = np.random.SeedSequence(random_state).spawn(n_jobs)
+        parts = map_items(_fit_rows, list(zip(ranges, seeds)), n_jobs=n_jobs, backend=backend,
+                          method=method, names=names, threshold=threshold)
+        detector = parts[0]
+        for part in parts[1:]:
+            detector.merge(part)
+        detector.fit()
+        counts = map_items(_count_rows, ranges, n_jobs=n_jobs, backend=backend, detector=detector)
+        return [int(count) for count in np.sum(counts, axis=0)]
+    return detector.update_counts(frame).counts()
+
+
+def count_chunked_method_outliers(chunks, names, method, threshold=None, random_state=0):
+    """
+    Count outliers in a chunked dataset with a robust method and two passes over the chunks.
+
+    :param chunks: callable returning a fresh iterable of pandas DataFrames on every call
+    :param names: labels of the numeric columns to check
+    :param method: 'iqr', 'mad' or 'isolation'
+    :param threshold: method-specific threshold, see DEFAULT_THRESHOLDS
+    :param random_state: seed of the detector
+    :return: dict mapping column label to outlier count
+    """
+    detector = make_detector(method, names, threshold, random_state)
+    for chunk in chunks():
+        detector.update(chunk)
+    detector.fit()
+    for chunk in chunks():
+        detector.update_counts(chunk)
+    return dict(zip(detector.names, detector.counts()))
@@ -0,0 +1,199 @@
+import os
+from collections import deque
+from concurrent.futures import CancelledError, ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+import numpy as np
+import pandas as pd
+
+BACKENDS = ('thread', 'process')
+
+
+def effective_n_jobs(n_jobs):
+    """
+    Number of workers for an ``n_jobs`` setting; negative values count back from the CPU count.
+
+    :param n_jobs: None or 1 for serial execution, -1 for all cores, -2 for all but one, ...
+    :return: positive number of workers
+    """
+    if n_jobs is None or n_jobs == 0:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return n_jobs
+
+
+def _shareable(series):
+    return isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biufcmM'
+
+
+class SharedColumns:
+    """
+    Column buffers placed in one shared memory segment for process workers.
+
+    Columns with plain numpy dtypes are copied once into the segment and rebuilt
+    in the workers as zero-copy views; other columns (objects, extension dtypes)
+    are pickled with the task. Use as a context manager so the segment is unlinked.
+    """
+
+    def __init__(self, dataset, positions):
+        """
+        Copy the shareable columns of a DataFrame into shared memory.
+
+        :param dataset: pandas DataFrame holding the columns
+        :param positions: positions of the columns to share
+        """
+        from multiprocessing import shared_memory
+
+        columns = [dataset.iloc[:, position] for position in positions]
+        sizes = [series.to_numpy().nbytes if _shareable(series) else 0 for series in columns]
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, sum(-(-size // 64) * 64 for size in sizes)))
+        self.descriptors = []
+        offset = 0
+        for series, size in zip(columns, sizes):
+            if _shareable(series):
+                values = series.to_numpy()
+                target = np.ndarray(values.shape, dtype=values.dtype, buffer=self.shm.buf, offset=offset)
+                target[:] = values
+                self.descriptors.append((series.name, values.dtype.str, offset, len(values)))
+                del target
+                offset += -(-size // 64) * 64
+            else:
+                self.descriptors.append(series)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shm.close()
+        self.shm.unlink()
+
+
+def _attach(shm_name, descriptors):
+    """
+    Rebuild columns in a worker from shared memory descriptors.
+    """
+    from multiprocessing import shared_memory
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    columns = []
+    for descriptor in descriptors:
+        if isinstance(descriptor, pd.Series):
+            columns.append(descriptor)
+        else:
+            name, dtype, offset, length = descriptor
+            values = np.ndarray((length,), dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+            columns.append(pd.Series(values, name=name, copy=False))
+    return shm, columns
+
+
+def _run_shared(func, shm_name, descriptors, items):
+    shm, columns = _attach(shm_name, descriptors)
+    try:
+        return func(columns, items)
+    finally:
+        del columns
+        try:
+            shm.close()
+        except BufferError:
+            pass
+
+
+def map_columns(func, dataset, positions, items=None, n_jobs=1, backend='thread', **kwargs):
+    """
+    Apply a function to batches of columns on a pool of workers.
+
+    Columns are split into ``n_jobs`` contiguous batches and the per-batch results
+    are concatenated in batch order, so the output is in column order whatever the
+    scheduling. With the process backend ``func`` must be a picklable module-level
+    function, and numeric columns reach the workers through shared memory instead
+    of being pickled.
+
+    :param func: callable ``func(columns, items, **kwargs)`` taking a list of Series and
+        the matching slice of ``items``, returning one result per column
+    :param dataset: pandas DataFrame holding the columns
+    :param positions: positions of the columns to process
+    :param items: optional list of per-column arguments aligned with ``positions``
+    :param n_jobs: number of workers, see effective_n_jobs
+    :param backend: 'thread' or 'process'
+    :param kwargs: extra keyword arguments passed to ``func``
+    :return: list of per-column results in the order of ``positions``
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+    positions = list(positions)
+    items = list(items) if items is not None else [None] * len(positions)
+    func = partial(func, **kwargs) if kwargs else func
+    n_jobs = min(effective_n_jobs(n_jobs), len(positions))
+
+    if n_jobs <= 1:
+        return list(func([dataset.iloc[:, position] for position in positions], items))
+
+    bounds = np.linspace(0, len(positions), n_jobs + 1).astype(int)
+
+    if backend == 'thread':
+        def run(start, stop):
+            return func([dataset.iloc[:, position] for position in positions[start:stop]], items[start:stop])
+
+        with ThreadPoolExecutor(n_jobs) as executor:
+            results = list(executor.map(run, bounds[:-1], bounds[1:]))
+    else:
+        with SharedColumns(dataset, positions) as shared, ProcessPoolExecutor(n_jobs) as executor:
+            futures = [
+                executor.submit(_run_shared, func, shared.shm.name,
+                                shared.descriptors[start:stop], items[start:stop])
+                for start, stop in zip(bounds[:-1], bounds[1:])
+            ]
+            results = [future.result() for future in futures]
+
+    return [result for batch_results in results for result in batch_results]
+
+
+def map_items(func, items, n_jobs=1, backend='thread', **kwargs):
+    """
+    Apply a function to independent work items, such as the files of a partitioned dataset, on a pool of workers.
+
+    :param func: callable ``func(item, **kwargs)``; with the process backend a picklable module-level function
+    :param items: list of work items
+    :param n_jobs: number of workers, see effective_n_jobs
+    :param backend: 'thread' or 'process'
+    :param kwargs: extra keyword arguments passed to ``func``
+    :return: list of results in the order of ``items``
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+    items = list(items)
+    func = partial(func, **kwargs) if kwargs else func
+    n_jobs = min(effective_n_jobs(n_jobs), len(items))
+
+    if n_jobs <= 1:
+        return [func(item) for item in items]
+    executor_class = ThreadPoolExecutor if backend == 'thread' else ProcessPoolExecutor
+    with executor_class(n_jobs) as executor:
+        return list(executor.map(func, items))
+
+
+_END = object()
+
+
+def prefetch(iterable, depth=1, cancel=None):
+    """
+    Iterate over an iterable while a background thread reads the next items, so that
+    reading a chunk or partition overlaps with computing on the previous one.
+
+    :param iterable: iterable of work items, e.g. chunks of a CSV file
+    :param depth: number of items read ahead of the consumer
+    :param cancel: optional threading.Event; once set, the next item raises CancelledError
+        instead of being returned, which stops a pass over the chunks at the next boundary
+    :return: generator of the items in order
+    """
+    iterator = iter(iterable)
+    with ThreadPoolExecutor(1) as reader:
+        pending = deque(reader.submit(next, iterator, _END) for _ in range(max(1, depth)))
+        while True:
+            if cancel is not None and cancel.is_set():
+                raise CancelledError("Analysis cancelled")
+            item = pending.popleft().result()
+            if item is _END:
+                return
+            pending.append(reader.submit(next, iterator, _END))
+            yield item
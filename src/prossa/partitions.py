@@ -0,0 +1,312 @@
+import copy
+import glob
+import os
+from collections import Counter
+import numpy as np
+import pandas as pd
+from .analyzer import DatasetAnalyzer
+from .columnar import PARQUET_SUFFIXES, ARROW_SUFFIXES, open_source
+from .outliers import count_profiled_outliers, make_detector
+from .correlation import CorrelationAccumulator, rank_grid
+from .inference import head_rows
+from .drift import SnapshotAccumulator
+from .categories import summarize_categories
+from .parallel import map_items
+from .profile import DatasetProfile
+
+CSV_SUFFIXES = ('.csv', '.csv.gz', '.csv.bz2', '.csv.zip', '.csv.xz')
+SUFFIXES = CSV_SUFFIXES + PARQUET_SUFFIXES + ARROW_SUFFIXES
+
+
+def is_partitioned(path):
+    """
+    Whether a path names several files: a directory or a glob pattern.
+    """
+    path = os.fspath(path)
+    return os.path.isdir(path) or any(character in path for character in '*?[')
+
+
+def expand_paths(path):
+    """
+    List the data files of a partitioned dataset.
+
+    A directory is searched recursively for CSV, Parquet and Arrow files, skipping
+    hidden and underscore-prefixed names such as ``_SUCCESS``; a glob pattern
+    (``**`` allowed) is expanded as is.
+
+    :param path: directory, glob pattern or single file path
+    :return: sorted list of file paths
+    """
+    path = os.fspath(path)
+    if os.path.isdir(path):
+        paths = [
+            os.path.join(root, name)
+            for root, _, names in os.walk(path)
+            for name in names
+            if name.lower().endswith(SUFFIXES) and not name.startswith(('.', '_'))
+        ]
+    else:
+        paths = [match for match in glob.glob(path, recursive=True) if os.path.isfile(match)]
+    if not paths:
+        raise FileNotFoundError(f"No data files found for '{path}'")
+    return sorted(paths)
+
+
+def read_partition(path, columns=None, **read_csv_kwargs):
+    """
+    Read one partition file into a DataFrame.
+
+    :param path: path of a CSV, Parquet or Arrow IPC/Feather file
+    :param columns: names of the columns to read, or None for all
+    :param read_csv_kwargs: extra keyword arguments passed to pandas.read_csv for CSV files
+    :return: pandas DataFrame
+    """
+    if path.lower().endswith(PARQUET_SUFFIXES + ARROW_SUFFIXES):
+        source = open_source(path, columns)
+        return source.read(source.columns)
+    return pd.read_csv(path, usecols=columns, **read_csv_kwargs)
+
+
+def _profile_partition(path, sketch_precision, columns=None, read_csv_kwargs=None):
+    """
+    Profile one partition into a mergeable DatasetProfile; the worker function of the first pass.
+    """
+    frame = read_partition(path, columns, **(read_csv_kwargs or {}))
+    return DatasetProfile.from_frame(frame, sketch_precision=sketch_precision, mergeable=True)
+
+
+def _count_partition_outliers(path, profiles, read_csv_kwargs=None):
+    """
+    Count the outliers of one partition against dataset-level moments; the worker function of the second pass.
+    """
+    frame = read_partition(path, [profile.name for profile in profiles], **(read_csv_kwargs or {}))
+    return count_profiled_outliers(frame, profiles)
+
+
+def _fit_partition_detector(partition, method, names, read_csv_kwargs=None):
+    """
+    Sketch one partition, given with its seed, for a robust outlier method; the worker function of its first pass.
+    """
+    path, seed = partition
+    frame = read_partition(path, names, **(read_csv_kwargs or {}))
+    return make_detector(method, names, random_state=np.random.default_rng(seed)).update(frame)
+
+
+def _count_partition_detector(path, detector, read_csv_kwargs=None):
+    """
+    Count the outliers of one partition with a fitted robust detector; the worker function of its second pass.
+    """
+    frame = read_partition(path, detector.names, **(read_csv_kwargs or {}))
+    detector.outliers = np.zeros(len(detector.names), dtype=np.int64)
+    return detector.update_counts(frame).counts()
+
+
+def _correlate_partition(path, accumulator, read_csv_kwargs=None):
+    """
+    Accumulate the correlations of one partition into a copy of an empty accumulator.
+    """
+    frame = read_partition(path, accumulator.numeric + accumulator.categorical, **(read_csv_kwargs or {}))
+    return copy.deepcopy(accumulator).update(frame)
+
+
+def _summarize_partition(path, names, read_csv_kwargs=None):
+    """
+    Build heavy-hitter summaries of some columns of one partition.
+    """
+    return summarize_categories(read_partition(path, names, **(read_csv_kwargs or {})), names)
+
+
+def _snapshot_partition(partition, names, kinds, read_csv_kwargs=None):
+    """
+    Sketch one partition, given with its seed, for a dataset snapshot.
+    """
+    path, seed = partition
+    frame = read_partition(path, names, **(read_csv_kwargs or {}))
+    return SnapshotAccumulator(names, kinds, random_state=seed).update(frame)
+
+
+class PartitionedDatasetAnalyzer(DatasetAnalyzer):
+    """
+    A DatasetAnalyzer for datasets split over many CSV, Parquet or Arrow files.
+
+    Every partition is read and profiled independently on a pool of workers, and the
+    mergeable partial profiles (null counts, Welford moments, min/max, HyperLogLog
+    sketches, constancy) are reduced into one dataset profile. Outliers are counted
+    in a second parallel pass against the dataset-level moments. Only one partition
+    per worker is held in memory at a time.
+    """
+
+    def __init__(self, paths, distinct_error=0.01, columns=None, n_jobs=1, backend='thread', instrument=None,
+                 outlier_method='zscore', correlation_method='pearson', infer_types=True,
+                 **read_csv_kwargs):
+        """
+        Initialize the PartitionedDatasetAnalyzer with the partition files.
+
+        :param paths: directory or glob pattern, see expand_paths, or a list of file paths
+        :param distinct_error: relative standard error allowed for the HyperLogLog distinct counts; partition
+            profiles are merged, so distinct values cannot be counted exactly
+        :param columns: names of the columns to analyze, or None for all
+        :param n_jobs: number of partitions read and profiled at once; -1 uses all cores
+        :param backend: 'thread' or 'process'
+        :param instrument: True or an Instrumentation instance to record per-check timings, see DatasetAnalyzer
+        :param outlier_method: 'zscore', 'iqr', 'mad' or 'isolation'; the robust methods sketch every
+            partition in parallel and merge the sketches
+        :param correlation_method: 'pearson' or 'spearman'; every partition accumulates correlations in parallel
+            and the accumulators are merged
+        :param infer_types: whether check_data_types infers the types of object columns from the first rows
+            of the first partitions
+        :param read_csv_kwargs: extra keyword arguments passed to pandas.read_csv for CSV partitions
+        """
+        if distinct_error is None:
+            raise ValueError("PartitionedDatasetAnalyzer needs a distinct_error: distinct values are counted with "
+                             "HyperLogLog sketches merged across partitions")
+        super().__init__(None, distinct_error=distinct_error, n_jobs=n_jobs, backend=backend, instrument=instrument,
+                         outlier_method=outlier_method, correlation_method=correlation_method,
+                         infer_types=infer_types)
+        self.paths = expand_paths(paths) if isinstance(paths, (str, os.PathLike)) else list(paths)
+        self.columns = columns
+        self.read_csv_kwargs = read_csv_kwargs
+        self.partitions = None
+        self._partition_outliers = None
+
+    def _build_profile(self, on_column=None):
+        self.partitions = map_items(_profile_partition, self.paths, n_jobs=self.n_jobs, backend=self.backend,
+                                    sketch_precision=self._sketch_precision(), columns=self.columns,
+                                    read_csv_kwargs=self.read_csv_kwargs)
+        profile = None
+        for path, partition in zip(self.paths, self.partitions):
+            if profile is None:
+                profile = copy.deepcopy(partition)
+                continue
+            try:
+                profile.merge(partition)
+            except ValueError as error:
+                raise ValueError(f"Partition '{path}' does not have the columns of '{self.paths[0]}'") from error
+        return profile
+
+    def _count_outliers(self, columns):
+        if not columns:
+            return []
+        per_partition = map_items(_count_partition_outliers, self.paths, n_jobs=self.n_jobs, backend=self.backend,
+                                  profiles=columns, read_csv_kwargs=self.read_csv_kwargs)
+        return self._sum_partitions(columns, per_partition)
+
+    def _count_method_outliers(self, columns):
+        names = [column.name for column in columns]
+        seeds = np.random.SeedSequence(0).spawn(len(self.paths))
+        parts = map_items(_fit_partition_detector, list(zip(self.paths, seeds)), n_jobs=self.n_jobs,
+                          backend=self.backend, method=self.outlier_method, names=names,
+                          read_csv_kwargs=self.read_csv_kwargs)
+        detector = parts[0]
+        for part in parts[1:]:
+            detector.merge(part)
+        detector.fit()
+        per_partition = map_items(_count_partition_detector, self.paths, n_jobs=self.n_jobs, backend=self.backend,
+                                  detector=detector, read_csv_kwargs=self.read_csv_kwargs)
+        return self._sum_partitions(columns, per_partition)
+
+    def _inference_rows(self, names):
+        return head_rows(read_partition(path, names, **self.read_csv_kwargs) for path in self.paths)
+
+    def _accumulate_snapshot(self, accumulator):
+        seeds = np.random.SeedSequence(0).spawn(len(self.paths))
+        parts = map_items(_snapshot_partition, list(zip(self.paths, seeds)), n_jobs=self.n_jobs, backend=self.backend,
+                          names=accumulator.names, kinds=accumulator.kinds, read_csv_kwargs=self.read_csv_kwargs)
+        for part in parts:
+            accumulator.merge(part)
+        return accumulator
+
+    def _summarize_categories(self, columns):
+        parts = map_items(_summarize_partition, self.paths, n_jobs=self.n_jobs, backend=self.backend,
+                          names=[column.name for column in columns], read_csv_kwargs=self.read_csv_kwargs)
+        for part in parts[1:]:
+            for summary, other in zip(parts[0], part):
+                summary.merge(other)
+        return parts[0]
+
+    def _correlate(self, numeric, categorical):
+        grids = None
+        if self.correlation_method == 'spearman' and numeric:
+            seeds = np.random.SeedSequence(0).spawn(len(self.paths))
+            parts = map_items(_fit_partition_detector, list(zip(self.paths, seeds)), n_jobs=self.n_jobs,
+                              backend=self.backend, method='iqr', names=[column.name for column in numeric],
+                              read_csv_kwargs=self.read_csv_kwargs)
+            for part in parts[1:]:
+                parts[0].merge(part)
+            grids = [rank_grid(sketch) for sketch in parts[0].sketches]
+        accumulator = CorrelationAccumulator.from_profiles(numeric, categorical, self.correlation_method, grids=grids)
+        parts = map_items(_correlate_partition, self.paths, n_jobs=self.n_jobs, backend=self.backend,
+                          accumulator=accumulator, read_csv_kwargs=self.read_csv_kwargs)
+        for part in parts[1:]:
+            parts[0].merge(part)
+        return parts[0], self.profile.n_rows
+
+    def _sum_partitions(self, columns, per_partition):
+        """
+        Keep the per-partition outlier counts for partition_records and return the dataset totals.
+        """
+        self._partition_outliers = [dict(zip([column.name for column in columns], counts))
+                                    for counts in per_partition]
+        return [sum(counts) for counts in zip(*per_partition)]
+
+    def update(self, batch):
+        raise ValueError("update() is not supported on a PartitionedDatasetAnalyzer")
+
+    def partition_records(self):
+        """
+        Per-partition breakdown of the column statistics, to find partitions that differ from the rest.
+
+        ``dtype_mismatch`` marks columns read with another dtype than in most partitions,
+        and ``outliers`` is filled in once check_outliers has run.
+
+        :return: list of dicts, one per partition and column
+        """
+        self.profile
+        dtypes = {}
+        for partition in self.partitions:
+            for column in partition:
+                dtypes.setdefault(column.name, Counter())[str(column.dtype)] += 1
+        usual = {name: counts.most_common(1)[0][0] for name, counts in dtypes.items()}
+        records = []
+        for index, (path, partition) in enumerate(zip(self.paths, self.partitions)):
+            outliers = self._partition_outliers[index] if self._partition_outliers is not None else {}
+            for column in partition:
+                records.append({
+                    'partition': path,
+                    'column': column.name,
+                    'rows': column.n_rows,
+                    'null_count': column.null_count,
+                    'null_fraction': column.null_count / column.n_rows if column.n_rows else 0.0,
+                    'dtype': str(column.dtype),
+                    'dtype_mismatch': str(column.dtype) != usual[column.name],
+                    'mean': column.mean,
+                    'std': column.std,
+                    'distinct': column.distinct,
+                    'outliers': outliers.get(column.name),
+                })
+        return records
+
+
+def analyze_partitions(paths, distinct_error=0.01, columns=None, n_jobs=1, backend='thread', instrument=None,
+                       outlier_method='zscore', correlation_method='pearson', checks=None, **read_csv_kwargs):
+    """
+    Analyze a partitioned dataset using the PartitionedDatasetAnalyzer class and print the recommendations.
+
+    :param paths: directory, glob pattern or list of file paths
+    :param distinct_error: relative standard error allowed for the HyperLogLog distinct counts
+    :param columns: names of the columns to analyze, or None for all
+    :param n_jobs: number of partitions read and profiled at once; -1 uses all cores
+    :param backend: 'thread' or 'process'
+    :param instrument: True or an Instrumentation instance to record per-check timings
+    :param outlier_method: 'zscore', 'iqr', 'mad' or 'isolation', see DatasetAnalyzer
+    :param correlation_method: 'pearson' or 'spearman', see DatasetAnalyzer
+    :param checks: names of the registered checks to run, or None for all, see DatasetAnalyzer.analyze
+    :param read_csv_kwargs: extra keyword arguments passed to pandas.read_csv for CSV partitions
+    :return: PartitionedDatasetAnalyzer instance with completed analysis
+    """
+    analyzer = PartitionedDatasetAnalyzer(paths, distinct_error=distinct_error, columns=columns, n_jobs=n_jobs,
+                                          backend=backend, instrument=instrument, outlier_method=outlier_method,
+                                          correlation_method=correlation_method, **read_csv_kwargs)
+    analyzer.analyze(checks)
+    analyzer.print_recommendations()
+    return analyzer
@@ -0,0 +1,455 @@
+import time
+import numpy as np
+import pandas as pd
+from pandas.api import types as ptypes
+from .sketches import HyperLogLog
+from .parallel import effective_n_jobs, map_columns
+
+NUMERIC = 'numeric'
+CATEGORICAL = 'categorical'
+OTHER = 'other'
+
+# Column statistics a profile can carry, and the statistics each one is computed from
+STATISTICS = ('null_count', 'moments', 'distinct', 'constancy')
+DEPENDENCIES = {
+    'null_count': (),
+    'moments': ('null_count',),
+    'distinct': (),
+    'constancy': ('null_count', 'moments'),
+}
+
+
+def dtype_kind(dtype):
+    """
+    Classify a dtype the same way the checks select columns.
+
+    Numeric matches ``select_dtypes(include=[np.number])`` (booleans excluded,
+    timedeltas included) and categorical matches
+    ``select_dtypes(include=['object', 'category'])``.
+
+    :param dtype: pandas or numpy dtype
+    :return: one of NUMERIC, CATEGORICAL or OTHER
+    """
+    if ptypes.is_bool_dtype(dtype):
+        return OTHER
+    if ptypes.is_numeric_dtype(dtype) or ptypes.is_timedelta64_dtype(dtype):
+        return NUMERIC
+    if ptypes.is_object_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype):
+        return CATEGORICAL
+    return OTHER
+
+
+def numeric_values(series):
+    """
+    Return the values of a numeric column as a float Series suitable for moments.
+
+    :param series: pandas Series of NUMERIC kind
+    :return: pandas Series of floats, missing values as NaN
+    """
+    if ptypes.is_timedelta64_dtype(series.dtype):
+        return series / pd.Timedelta(1, 'ns')
+    return series
+
+
+def common_dtype(left, right):
+    """
+    Dtype a column would get if two parts read with different dtypes were read together.
+
+    :param left: dtype of the first part, with its non-missing count
+    :param right: dtype of the second part, with its non-missing count
+    :return: numpy or pandas dtype
+    """
+    (left_dtype, left_count), (right_dtype, right_count) = left, right
+    if left_dtype == right_dtype:
+        return left_dtype
+    if dtype_kind(left_dtype) == NUMERIC and dtype_kind(right_dtype) == NUMERIC:
+        try:
+            return np.result_type(left_dtype, right_dtype)
+        except TypeError:
+            return np.dtype('float64')
+    if left_count == 0:
+        return right_dtype
+    if right_count == 0:
+        return left_dtype
+    return np.dtype('O')
+
+
+def first_and_varies(series, block_size=1024):
+    """
+    Find the first non-missing value of a column and whether any other value differs from it.
+
+    The column is scanned in blocks of geometrically growing size and the scan stops
+    at the first block holding a second distinct value, so non-constant columns are
+    usually decided after a few thousand rows without building a hash table.
+
+    :param series: pandas Series to scan
+    :param block_size: number of rows in the first block
+    :return: tuple (first value or None, True if the column holds more than one distinct value)
+    """
+    first = None
+    start = 0
+    while start < len(series):
+        block = series.iloc[start:start + block_size].dropna()
+        if len(block) > 0:
+            if first is None:
+                first = block.iloc[0]
+            if bool((block != first).any()):
+                return first, True
+        start += block_size
+        block_size *= 2
+    return first, False
+
+
+class ColumnProfile:
+    """
+    Summary statistics of a single column, computed once and shared by all checks.
+    """
+
+    def __init__(self, name, dtype, kind, n_rows, null_count):
+        """
+        Initialize an empty column profile.
+
+        :param name: column label
+        :param dtype: dtype of the column
+        :param kind: dtype class, see dtype_kind
+        :param n_rows: number of rows in the column
+        :param null_count: number of missing values in the column
+        """
+        self.name = name
+        self.dtype = dtype
+        self.kind = kind
+        self.n_rows = n_rows
+        self.null_count = null_count
+        self.min = None
+        self.max = None
+        self.mean = None
+        self.std = None
+        self.distinct = None
+        self.sketch = None
+        self.first_value = None
+        self.varies = None
+
+    @property
+    def count(self):
+        """
+        Number of non-missing values in the column.
+        """
+        return self.n_rows - self.null_count
+
+    @property
+    def is_constant(self):
+        """
+        Whether the column holds at most one distinct non-missing value.
+        """
+        if self.count == 0:
+            return True
+        return not self.varies
+
+    def has(self, statistic):
+        """
+        Whether the profile already carries a statistic, see STATISTICS.
+
+        Statistics that do not apply to the kind of the column, or to a column
+        without values, count as present.
+
+        :param statistic: statistic name
+        :return: bool
+        """
+        if statistic == 'null_count':
+            return self.null_count is not None
+        if self.null_count is not None and self.count == 0:
+            return True
+        if statistic == 'moments':
+            return self.kind != NUMERIC or self.std is not None
+        if statistic == 'distinct':
+            return self.kind != CATEGORICAL or self.distinct is not None
+        if statistic == 'constancy':
+            return self.varies is not None
+        raise ValueError(f"Unknown statistic '{statistic}', expected one of {STATISTICS}")
+
+    @classmethod
+    def from_series(cls, series, null_count=None, sketch_precision=None, mergeable=False):
+        """
+        Profile a single column.
+
+        Numeric columns get min/max/mean/std (population std, as used by z-scores);
+        their constancy follows from min == max so no hash table is built for them.
+        Categorical columns get an exact distinct count, or a HyperLogLog estimate when
+        ``sketch_precision`` is given. The constancy of every other column is decided
+        by an early-exit scan that stops at the second distinct value.
+
+        With ``mergeable`` every column keeps its HyperLogLog sketch and first value,
+        so that the profile can later be merged with profiles of other parts of the
+        same column.
+
+        :param series: pandas Series to profile
+        :param null_count: precomputed number of missing values, if already known
+        :param sketch_precision: HyperLogLog precision for approximate distinct counts, or None for exact counts
+        :param mergeable: whether to keep the state needed by merge; requires ``sketch_precision``
+        :return: ColumnProfile instance
+        """
+        profile = cls(series.name, series.dtype, dtype_kind(series.dtype), len(series),
+                      None if null_count is None else int(null_count))
+        return profile.compute(series, STATISTICS, sketch_precision=sketch_precision, mergeable=mergeable)
+
+    def compute(self, series, statistics, sketch_precision=None, mergeable=False):
+        """
+        Compute the statistics the profile does not carry yet from the values of the column.
+
+        The null count is always computed first when missing. Constancy follows from
+        the moments of numeric columns, which are computed for it if needed, and from
+        the exact distinct count of categorical ones when that is computed anyway;
+        other columns are scanned by first_and_varies, which stops at the second
+        distinct value.
+
+        :param series: pandas Series the profile describes
+        :param statistics: names of the statistics to compute, see STATISTICS
+        :param sketch_precision: HyperLogLog precision for approximate distinct counts, or None for exact counts
+        :param mergeable: whether to keep the state needed by merge; requires ``sketch_precision``
+        :return: the profile itself
+        """
+        if mergeable and sketch_precision is None:
+            raise ValueError("Mergeable profiles need a sketch_precision")
+        statistics = set(statistics)
+        if self.null_count is None:
+            self.null_count = int(series.isna().sum())
+
+        if self.kind == NUMERIC and statistics & {'moments', 'constancy'} and self.std is None:
+            if self.count > 0:
+                values = numeric_values(series)
+                self.min = values.min()
+                self.max = values.max()
+                self.mean = float(values.mean())
+                self.std = float(values.std(ddof=0))
+            self.first_value = self.min
+            self.varies = bool(self.count > 0 and self.min != self.max)
+        elif self.kind == CATEGORICAL and sketch_precision is None and 'distinct' in statistics and self.distinct is None:
+            self.distinct = int(series.nunique())
+            self.varies = self.distinct > 1
+        elif 'constancy' in statistics and self.varies is None:
+            self.first_value, self.varies = first_and_varies(series)
+
+        if ('distinct' in statistics and sketch_precision is not None and self.sketch is None
+                and (mergeable or self.kind == CATEGORICAL)):
+            self.sketch = HyperLogLog(sketch_precision).update(series.dropna())
+            self.distinct = self.sketch.count()
+
+        return self
+
+    def merge(self, other):
+        """
+        Fold the profile of another part of the same column into this one.
+
+        Moments are combined with the parallel Welford update, so the result equals
+        the profile of the concatenated column up to floating point rounding. Both
+        profiles must have been built with the same ``sketch_precision``.
+
+        :param other: ColumnProfile of the same column over different rows
+        :return: the profile itself
+        """
+        dtype = common_dtype((self.dtype, self.count), (other.dtype, other.count))
+        kind = dtype_kind(dtype)
+
+        if kind == NUMERIC and self.kind == NUMERIC and other.kind == NUMERIC:
+            if self.count == 0:
+                self.min, self.max, self.mean, self.std = other.min, other.max, other.mean, other.std
+            elif other.count > 0:
+                count = self.count + other.count
+                delta = other.mean - self.mean
+                m2 = (self.std ** 2 * self.count + other.std ** 2 * other.count
+                      + delta ** 2 * self.count * other.count / count)
+                self.mean = self.mean + delta * other.count / count
+                self.std = float(np.sqrt(m2 / count))
+                self.min = min(self.min, other.min)
+                self.max = max(self.max, other.max)
+        else:
+            self.min = self.max = self.mean = self.std = None
+
+        if self.sketch is not None and other.sketch is not None:
+            self.sketch.merge(other.sketch)
+            self.distinct = self.sketch.count()
+        else:
+            self.distinct = None
+
+        if self.count == 0:
+            self.first_value, self.varies = other.first_value, other.varies
+        elif other.count > 0:
+            self.varies = self.varies or other.varies or bool(self.first_value != other.first_value)
+
+        self.dtype = dtype
+        self.kind = kind
+        self.n_rows += other.n_rows
+        self.null_count += other.null_count
+        return self
+
+
+def _compute_columns(columns, profiles, statistics, sketch_precision=None, timed=False):
+    """
+    Compute statistics of a batch of profiled columns; the worker function of DatasetProfile.compute.
+    """
+    results = []
+    for series, column in zip(columns, profiles):
+        started = time.perf_counter() if timed else None
+        column.compute(series, statistics, sketch_precision=sketch_precision)
+        results.append((column, time.perf_counter() - started) if timed else column)
+    return results
+
+
+def _profile_columns(columns, null_counts, sketch_precision=None, mergeable=False, timed=False):
+    """
+    Profile a batch of columns; the worker function of DatasetProfile.from_frame.
+
+    With ``timed`` each result is a tuple (ColumnProfile, seconds spent on the column).
+    """
+    results = []
+    for series, null_count in zip(columns, null_counts):
+        started = time.perf_counter() if timed else None
+        column = ColumnProfile.from_series(series, null_count=null_count, sketch_precision=sketch_precision,
+                                           mergeable=mergeable)
+        results.append((column, time.perf_counter() - started) if timed else column)
+    return results
+
+
+class DatasetProfile:
+    """
+    Per-column profiles of a whole dataset, in column order.
+    """
+
+    def __init__(self, n_rows, columns):
+        """
+        Initialize the dataset profile.
+
+        :param n_rows: number of rows in the dataset
+        :param columns: list of ColumnProfile instances in column order
+        """
+        self.n_rows = n_rows
+        self.columns = columns
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __len__(self):
+        return len(self.columns)
+
+    def __getitem__(self, name):
+        for column in self.columns:
+            if column.name == name:
+                return column
+        raise KeyError(name)
+
+    @property
+    def null_count(self):
+        """
+        Total number of missing values across all columns.
+        """
+        return sum(column.null_count for column in self.columns)
+
+    def of_kind(self, kind):
+        """
+        Return the profiles of all columns of a given dtype class.
+
+        :param kind: one of NUMERIC, CATEGORICAL or OTHER
+        :return: list of ColumnProfile instances in column order
+        """
+        return [column for column in self.columns if column.kind == kind]
+
+    def merge(self, other):
+        """
+        Fold the profile of more rows of the same dataset into this one.
+
+        :param other: DatasetProfile with the same columns
+        :return: the profile itself
+        """
+        if [column.name for column in self.columns] != [column.name for column in other.columns]:
+            raise ValueError("Cannot merge profiles of datasets with different columns")
+        for column, other_column in zip(self.columns, other.columns):
+            column.merge(other_column)
+        self.n_rows += other.n_rows
+        return self
+
+    @classmethod
+    def skeleton(cls, dataset):
+        """
+        Profile a DataFrame without reading its values: only names, dtypes and the number of rows.
+
+        The statistics are computed later, for the columns that need them, by compute.
+
+        :param dataset: pandas DataFrame
+        :return: DatasetProfile instance
+        """
+        return cls(len(dataset), [ColumnProfile(name, dtype, dtype_kind(dtype), len(dataset), None)
+                                  for name, dtype in dataset.dtypes.items()])
+
+    def compute(self, dataset, columns, statistics, sketch_precision=None, n_jobs=1, backend='thread',
+                on_column=None):
+        """
+        Compute statistics of some columns of the profile from the DataFrame it describes.
+
+        :param dataset: pandas DataFrame the profile was built from
+        :param columns: ColumnProfile instances of this profile
+        :param statistics: names of the statistics to compute, see STATISTICS
+        :param sketch_precision: HyperLogLog precision for approximate distinct counts, or None for exact counts
+        :param n_jobs: number of workers computing columns in parallel
+        :param backend: 'thread' or 'process'
+        :param on_column: optional per-column timing callback, see from_frame
+        :return: the profile itself
+        """
+        positions = {id(column): position for position, column in enumerate(self.columns)}
+        if set(statistics) == {'null_count'} and len(columns) == len(self.columns):
+            for column, null_count in zip(self.columns, dataset.isna().sum().to_numpy()):
+                column.null_count = int(null_count)
+            return self
+        results = map_columns(_compute_columns, dataset, [positions[id(column)] for column in columns],
+                              items=columns, n_jobs=n_jobs, backend=backend, statistics=tuple(statistics),
+                              sketch_precision=sketch_precision, timed=on_column is not None)
+        for column, result in zip(columns, results):
+            if on_column is not None:
+                result, seconds = result
+                on_column(column.name, seconds, column.n_rows)
+            if result is not column:
+                column.__dict__.update(result.__dict__)
+        return self
+
+    @classmethod
+    def from_frame(cls, dataset, sketch_precision=None, mergeable=False, n_jobs=1, backend='thread', on_column=None):
+        """
+        Profile every column of a DataFrame in a single pass over the data.
+
+        :param dataset: pandas DataFrame to profile
+        :param sketch_precision: HyperLogLog precision for approximate distinct counts, or None for exact counts
+        :param mergeable: whether to keep the state needed by merge; requires ``sketch_precision``
+        :param n_jobs: number of workers profiling columns in parallel, see parallel.effective_n_jobs
+        :param backend: 'thread' or 'process'
+        :param on_column: optional callable ``on_column(name, seconds, rows)`` called with the time spent
+            profiling each column, e.g. StageMetrics.add_column
+        :return: DatasetProfile instance
+        """
+        positions = range(dataset.shape[1])
+        null_counts = dataset.isna().sum().to_numpy() if effective_n_jobs(n_jobs) == 1 else None
+        columns = map_columns(_profile_columns, dataset, positions, items=null_counts, n_jobs=n_jobs,
+                              backend=backend, sketch_precision=sketch_precision, mergeable=mergeable,
+                              timed=on_column is not None)
+        if on_column is not None:
+            for column, seconds in columns:
+                on_column(column.name, seconds, column.n_rows)
+            columns = [column for column, _ in columns]
+        return cls(len(dataset), columns)
+
+    @classmethod
+    def from_chunks(cls, chunks, sketch_precision=14, n_jobs=1, backend='thread', on_column=None):
+        """
+        Profile a dataset given as consecutive DataFrame chunks, holding one chunk at a time.
+
+        :param chunks: iterable of pandas DataFrames with the same columns
+        :param sketch_precision: HyperLogLog precision used for distinct counts
+        :param n_jobs: number of workers profiling the columns of each chunk in parallel
+        :param backend: 'thread' or 'process'
+        :param on_column: optional per-column timing callback, see from_frame; called once per chunk
+        :return: DatasetProfile instance
+        """
+        profile = None
+        for chunk in chunks:
+            chunk_profile = cls.from_frame(chunk, sketch_precision=sketch_precision, mergeable=True,
+                                           n_jobs=n_jobs, backend=backend, on_column=on_column)
+            profile = chunk_profile if profile is None else profile.merge(chunk_profile)
+        return profile if profile is not None else cls(0, [])
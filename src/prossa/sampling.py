@@ -0,0 +1,132 @@
+import math
+from statistics import NormalDist
+import numpy as np
+import pandas as pd
+
+
+def _allocate(stratum_sizes, size):
+    """
+    Split a sample size across strata proportionally to their sizes (largest remainder).
+
+    :param stratum_sizes: pandas Series of stratum sizes indexed by stratum
+    :param size: total sample size
+    :return: pandas Series of per-stratum sample sizes
+    """
+    total = stratum_sizes.sum()
+    if total <= size:
+        return stratum_sizes.copy()
+    quota = stratum_sizes * (size / total)
+    allocation = np.floor(quota).astype(np.int64)
+    shortfall = int(size - allocation.sum())
+    if shortfall > 0:
+        order = (quota - allocation).sort_values(ascending=False, kind='mergesort').index[:shortfall]
+        allocation[order] += 1
+    return allocation
+
+
+def sample_frame(dataset, size, stratify=None, random_state=None):
+    """
+    Draw a uniform or stratified sample of rows from an in-memory DataFrame.
+
+    Uniform samples cost time proportional to ``size``. Stratified samples use
+    proportional allocation, so the sample is self-weighting and plain proportions
+    estimated from it are unbiased; they also read the ``stratify`` column once.
+
+    :param dataset: pandas DataFrame to sample from
+    :param size: number of rows to draw
+    :param stratify: optional column label to stratify on
+    :param random_state: seed or numpy Generator
+    :return: pandas DataFrame with the sampled rows in their original order
+    """
+    rng = np.random.default_rng(random_state)
+    if size >= len(dataset):
+        return dataset
+    if stratify is None:
+        positions = rng.choice(len(dataset), size=size, replace=False)
+    else:
+        groups = dataset.groupby(stratify, dropna=False, sort=False).indices
+        sizes = pd.Series({key: len(rows) for key, rows in groups.items()})
+        allocation = _allocate(sizes, size)
+        positions = np.concatenate([
+            rng.choice(groups[key], size=int(count), replace=False)
+            for key, count in allocation.items() if count > 0
+        ])
+    return dataset.iloc[np.sort(positions)]
+
+
+def sample_chunks(chunks, size, stratify=None, random_state=None):
+    """
+    Draw a uniform or stratified reservoir sample from a dataset given as chunks.
+
+    Every row gets a random priority and the rows with the lowest priorities are
+    kept (overall, or per stratum), which is a vectorised equivalent of reservoir
+    sampling. Memory is bounded by the chunk size plus the sample size (times the
+    number of strata when stratifying, trimmed to the proportional allocation at
+    the end).
+
+    :param chunks: iterable of pandas DataFrames with the same columns
+    :param size: number of rows to draw
+    :param stratify: optional column label to stratify on
+    :param random_state: seed or numpy Generator
+    :return: tuple (sampled pandas DataFrame, number of rows seen)
+    """
+    rng = np.random.default_rng(random_state)
+    reservoir = None
+    priorities = np.empty(0)
+    stratum_sizes = pd.Series(dtype=np.int64)
+    n_rows = 0
+
+    for chunk in chunks:
+        n_rows += len(chunk)
+        chunk = chunk.reset_index(drop=True)
+        chunk_priorities = rng.random(len(chunk))
+        if stratify is not None:
+            stratum_sizes = stratum_sizes.add(chunk[stratify].value_counts(dropna=False), fill_value=0)
+        candidates = chunk if reservoir is None else pd.concat([reservoir, chunk], ignore_index=True)
+        priorities = np.concatenate([priorities, chunk_priorities])
+        keep = _lowest(candidates, priorities, size, stratify)
+        reservoir = candidates.iloc[keep].reset_index(drop=True)
+        priorities = priorities[keep]
+
+    if reservoir is None:
+        return pd.DataFrame(), 0
+    if stratify is not None:
+        allocation = _allocate(stratum_sizes.astype(np.int64), size)
+        rank = pd.Series(priorities).groupby(reservoir[stratify].to_numpy(), dropna=False).rank(method='first')
+        limit = reservoir[stratify].map(allocation).fillna(0).to_numpy()
+        reservoir = reservoir[(rank.to_numpy() <= limit)].reset_index(drop=True)
+    return reservoir, n_rows
+
+
+def _lowest(candidates, priorities, size, stratify):
+    """
+    Positions of the ``size`` rows with the lowest priorities, overall or per stratum.
+    """
+    if stratify is None:
+        if len(priorities) <= size:
+            return np.arange(len(priorities))
+        return np.sort(np.argpartition(priorities, size)[:size])
+    rank = pd.Series(priorities).groupby(candidates[stratify].to_numpy(), dropna=False).rank(method='first')
+    return np.flatnonzero(rank.to_numpy() <= size)
+
+
+def proportion_interval(successes, sample_size, population_size=None, confidence=0.95):
+    """
+    Wilson score interval for a proportion estimated from a sample.
+
+    :param successes: number of sampled rows with the property
+    :param sample_size: number of sampled rows
+    :param population_size: number of rows sampled from, for the finite population correction
+    :param confidence: confidence level of the interval
+    :return: tuple (lower, upper) bounds of the proportion
+    """
+    if sample_size == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    if population_size is not None and population_size > 1:
+        z *= math.sqrt(max(population_size - sample_size, 0) / (population_size - 1))
+    p = successes / sample_size
+    denominator = 1 + z * z / sample_size
+    centre = (p + z * z / (2 * sample_size)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / sample_size + z * z / (4 * sample_size * sample_size)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
@@ -0,0 +1,434 @@
+import base64
+import math
+import zlib
+import numpy as np
+import pandas as pd
+
+
+def hash_values(values):
+    """
+    Hash a sequence of values to 64-bit integers.
+
+    :param values: pandas Series, Index or array-like of values
+    :return: numpy array of uint64 hashes
+    """
+    if not isinstance(values, (pd.Series, pd.Index)):
+        values = pd.Series(values)
+    return pd.util.hash_pandas_object(values, index=False).to_numpy()
+
+
+def _bit_length(values):
+    """
+    Vectorised ``int.bit_length`` for an array of uint64 values.
+    """
+    values = values.copy()
+    length = np.zeros(len(values), dtype=np.uint8)
+    for shift in (32, 16, 8, 4, 2, 1):
+        mask = values >= np.uint64(1 << shift)
+        length[mask] += shift
+        values[mask] >>= np.uint64(shift)
+    length += values.astype(np.uint8)
+    return length
+
+
+class HyperLogLog:
+    """
+    Mergeable approximate distinct counter.
+
+    Memory is ``2 ** precision`` bytes regardless of how many values are added and
+    the relative standard error is about ``1.04 / sqrt(2 ** precision)``.
+    """
+
+    def __init__(self, precision=14):
+        """
+        Initialize an empty sketch.
+
+        :param precision: number of index bits, between 4 and 18
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @staticmethod
+    def precision_for_error(error):
+        """
+        Smallest precision whose relative standard error is at most ``error``.
+
+        :param error: target relative standard error, e.g. 0.01 for 1%
+        :return: precision to pass to HyperLogLog
+        """
+        if not 0 < error < 1:
+            raise ValueError("error must be between 0 and 1")
+        precision = max(4, math.ceil(2 * math.log2(1.04 / error)))
+        if precision > 18:
+            raise ValueError(f"An error of {error} needs more than 2**18 registers; use exact counts instead")
+        return precision
+
+    def update(self, values):
+        """
+        Add values to the sketch. Missing values should be dropped beforehand.
+
+        :param values: pandas Series, Index or array-like of values
+        :return: the sketch itself
+        """
+        if len(values) == 0:
+            return self
+        hashes = hash_values(values)
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.intp)
+        remainder = hashes << np.uint64(self.precision)
+        rank = np.minimum(65 - _bit_length(remainder).astype(np.int16), 65 - self.precision).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other):
+        """
+        Fold another sketch of the same precision into this one.
+
+        :param other: HyperLogLog instance
+        :return: the sketch itself
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self):
+        """
+        Estimate the number of distinct values added so far.
+
+        :return: estimated cardinality as a float
+        """
+        m = len(self.registers)
+        if m >= 128:
+            alpha = 0.7213 / (1 + 1.079 / m)
+        else:
+            alpha = {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int32)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)
+        return float(raw)
+
+    def count(self):
+        """
+        Estimated number of distinct values, rounded to an integer.
+        """
+        return int(round(self.estimate()))
+
+    def to_dict(self):
+        """
+        Serialize the sketch to a JSON-compatible dict, with the registers compressed.
+        """
+        return {'precision': self.precision,
+                'registers': base64.b64encode(zlib.compress(self.registers.tobytes())).decode('ascii')}
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Rebuild a sketch serialized with to_dict.
+
+        :param state: dict returned by to_dict
+        :return: HyperLogLog instance
+        """
+        sketch = cls(state['precision'])
+        sketch.registers = np.frombuffer(zlib.decompress(base64.b64decode(state['registers'])), dtype=np.uint8).copy()
+        return sketch
+
+
+class KLLSketch:
+    """
+    Mergeable quantile sketch (KLL compactor hierarchy).
+
+    Values are buffered in levels; when a level outgrows its capacity it is sorted
+    and every other value, from a random offset, moves up one level with twice the
+    weight. Memory is about ``3 * k`` values whatever the number of values added,
+    and the rank error is roughly ``1.7 / k``. Sketches built on different chunks
+    with the same ``k`` merge into a sketch of the union.
+    """
+
+    def __init__(self, k=200, random_state=None):
+        """
+        Initialize an empty sketch.
+
+        :param k: capacity of the top level; larger is more accurate
+        :param random_state: seed or numpy Generator choosing the compaction offsets
+        """
+        if k < 8:
+            raise ValueError("k must be at least 8")
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(random_state)
+
+    def _capacity(self, level):
+        return max(2, math.ceil(self.k * (2 / 3) ** (len(self.levels) - 1 - level)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                odd = len(items) % 2
+                promoted = items[odd:][self._rng.integers(2)::2]
+                self.levels[level] = items[:odd]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def update(self, values):
+        """
+        Add values to the sketch; NaNs are ignored.
+
+        :param values: array-like of numbers
+        :return: the sketch itself
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.count += len(values)
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+        return self
+
+    def merge(self, other):
+        """
+        Fold another sketch into this one.
+
+        :param other: KLLSketch instance
+        :return: the sketch itself
+        """
+        return self._absorb(other.levels, other.count)
+
+    def _absorb(self, levels, count):
+        """
+        Add weighted values, given as one array per level, that summarize ``count`` values.
+        """
+        while len(self.levels) < len(levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += count
+        self._compress()
+        return self
+
+    def _sorted(self):
+        """
+        Retained values in ascending order with the cumulative weight before each of them.
+        """
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        return values[order], np.concatenate([[0.0], np.cumsum(weights[order])])
+
+    def cdf(self, x):
+        """
+        Estimate the fraction of the values added so far that are at most ``x``.
+
+        :param x: number or array of numbers
+        :return: float or numpy array of floats, NaN for an empty sketch
+        """
+        if self.count == 0:
+            return np.full(np.shape(x), np.nan)[()]
+        values, cumulative = self._sorted()
+        return (cumulative[np.searchsorted(values, x, side='right')] / cumulative[-1])[()]
+
+    def quantile(self, q):
+        """
+        Estimate quantiles of the values added so far.
+
+        :param q: quantile or array of quantiles between 0 and 1
+        :return: float or numpy array of floats, NaN for an empty sketch
+        """
+        if self.count == 0:
+            return np.full(np.shape(q), np.nan)[()]
+        values, cumulative = self._sorted()
+        index = np.searchsorted(cumulative[1:], np.asarray(q) * cumulative[-1], side='left')
+        return values[np.clip(index, 0, len(values) - 1)][()]
+
+    def mad(self, center=None):
+        """
+        Estimate the median absolute deviation around ``center`` (the median by default).
+
+        The MAD is the smallest distance ``d`` whose interval ``[center - d, center + d]``
+        holds half of the weight, which is read from the same sketch without a second pass.
+
+        :param center: centre of the deviations, or None for the estimated median
+        :return: float, NaN for an empty sketch
+        """
+        if self.count == 0:
+            return np.nan
+        if center is None:
+            center = self.quantile(0.5)
+        values, cumulative = self._sorted()
+        distances = np.sort(np.abs(values - center))
+        covered = (cumulative[np.searchsorted(values, center + distances, side='right')]
+                   - cumulative[np.searchsorted(values, center - distances, side='left')])
+        index = np.searchsorted(covered, 0.5 * cumulative[-1], side='left')
+        return float(distances[min(index, len(distances) - 1)])
+
+    def to_dict(self):
+        """
+        Serialize the retained values of the sketch to a JSON-compatible dict.
+        """
+        return {'k': self.k, 'count': self.count, 'levels': [items.tolist() for items in self.levels]}
+
+    @classmethod
+    def from_dict(cls, state, random_state=None):
+        """
+        Rebuild a sketch serialized with to_dict.
+
+        :param state: dict returned by to_dict
+        :param random_state: seed or numpy Generator for later compactions
+        :return: KLLSketch instance
+        """
+        sketch = cls(state['k'], random_state=random_state)
+        sketch.count = state['count']
+        sketch.levels = [np.asarray(items, dtype=np.float64) for items in state['levels']]
+        return sketch
+
+
+def update_sketches(sketches, block):
+    """
+    Add a block of rows to one KLL sketch per column, vectorised over the columns.
+
+    The block is sorted and compacted to at most ``k`` rows for all columns at once,
+    keeping for every column the values and weights its own compactions would keep;
+    each sketch then merges the few values left in its column.
+
+    :param sketches: KLLSketch instances with the same ``k``, one per column of the block
+    :param block: numpy array of shape (rows, len(sketches)), missing values as NaN
+    :return: the list of sketches
+    """
+    if not sketches:
+        return sketches
+    rng = sketches[0]._rng
+    items = np.sort(np.asarray(block, dtype=np.float64).T, axis=1)
+    valid = np.count_nonzero(~np.isnan(items), axis=1)
+    items = items[:, :valid.max(initial=0)]
+    counts = valid
+    levels = []
+    while items.shape[1] > sketches[0].k:
+        odd = valid % 2
+        levels.append(np.where(odd == 1, items[:, 0], np.nan)[:, None])
+        start = odd + rng.integers(2)
+        valid = (valid - odd) // 2
+        if (start == start[0]).all():
+            items = items[:, start[0]::2][:, :valid.max(initial=0)]
+        else:
+            rows = np.arange(valid.max(initial=0))
+            items = np.take_along_axis(items, np.minimum(start[:, None] + 2 * rows, items.shape[1] - 1), axis=1)
+        if (valid != items.shape[1]).any():
+            items[np.arange(items.shape[1]) >= valid[:, None]] = np.nan
+    levels.append(items)
+    for position, sketch in enumerate(sketches):
+        if counts[position]:
+            columns = [values[position] for values in levels]
+            sketch._absorb([values[~np.isnan(values)] for values in columns], int(counts[position]))
+    return sketches
+
+
+class SpaceSaving:
+    """
+    Mergeable heavy-hitter summary (Space-Saving) of the most frequent values of a column.
+
+    At most ``capacity`` values are tracked with a counter and the largest error that
+    counter may carry; ``floor`` bounds the count of every value not tracked. Counts
+    never underestimate, and overestimate by at most ``total / capacity``, so every
+    value more frequent than that is tracked. Each chunk is counted exactly with
+    ``value_counts`` and folded in with the merge rule of mergeable summaries, so
+    summaries of chunks and of workers combine into a summary of their union.
+
+    Between updates the summary holds ``capacity`` counters; while a chunk is folded
+    in, its exact counts take memory proportional to the number of distinct values in
+    the chunk, so the chunk size bounds the peak for high-cardinality columns.
+    """
+
+    def __init__(self, capacity=1000):
+        """
+        Initialize an empty summary.
+
+        :param capacity: number of values tracked
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.total = 0
+        self.floor = 0
+        self.counts = pd.Series(dtype=np.int64)
+        self.errors = pd.Series(dtype=np.int64)
+
+    @property
+    def is_exact(self):
+        """
+        Whether the tracked counts are exact: no value was ever evicted.
+        """
+        return self.floor == 0
+
+    def _fold(self, counts, errors, floor, total):
+        index = self.counts.index.union(counts.index, sort=False)
+        merged = self.counts.reindex(index, fill_value=self.floor) + counts.reindex(index, fill_value=floor)
+        merged_errors = self.errors.reindex(index, fill_value=self.floor) + errors.reindex(index, fill_value=floor)
+        merged = merged.sort_values(ascending=False, kind='stable')
+        dropped = merged.iloc[self.capacity:]
+        self.floor = max(self.floor + floor, int(dropped.iloc[0]) if len(dropped) else 0)
+        self.counts = merged.iloc[:self.capacity].astype(np.int64)
+        self.errors = merged_errors.reindex(self.counts.index).astype(np.int64)
+        self.total += total
+
+    def update(self, values):
+        """
+        Add values to the summary. Missing values should be dropped beforehand.
+
+        The values are counted exactly before the counts are folded in, which takes
+        memory proportional to their number of distinct values.
+
+        :param values: pandas Series of values
+        :return: the summary itself
+        """
+        counts = values.value_counts(sort=False)
+        counts = counts[counts > 0]
+        counts.index = counts.index.astype(object)
+        self._fold(counts, pd.Series(0, index=counts.index, dtype=np.int64), 0, len(values))
+        return self
+
+    @classmethod
+    def from_counts(cls, counts, total, capacity=1000):
+        """
+        Build a summary from the exact counts of the most frequent values, e.g. computed by a query engine.
+
+        :param counts: pandas Series of exact counts indexed by value, most frequent first; a value past
+            ``capacity`` bounds the count of every value not tracked
+        :param total: number of non-missing values
+        :param capacity: number of values tracked
+        :return: SpaceSaving instance whose tracked counts carry no error
+        """
+        summary = cls(capacity)
+        counts = counts.astype(np.int64)
+        counts.index = counts.index.astype(object)
+        kept = counts.iloc[:capacity]
+        summary._fold(kept, pd.Series(0, index=kept.index, dtype=np.int64), 0, total)
+        summary.floor = int(counts.iloc[capacity]) if len(counts) > capacity else 0
+        return summary
+
+    def merge(self, other):
+        """
+        Fold the summary of other values into this one.
+
+        :param other: SpaceSaving instance
+        :return: the summary itself
+        """
+        self._fold(other.counts, other.errors, other.floor, other.total)
+        return self
+
+    def top(self, k=None):
+        """
+        The most frequent values, most frequent first.
+
+        :param k: number of values, or None for all tracked values
+        :return: list of tuples (value, count, error); the true count lies between ``count - error`` and ``count``
+        """
+        counts = self.counts if k is None else self.counts.iloc[:k]
+        return [(value, int(count), int(self.errors[value])) for value, count in counts.items()]
@@ -0,0 +1,149 @@
+import io
+import time
+import pandas as pd
+from .analyzer import DatasetAnalyzer
+from .outliers import count_profiled_outliers, count_chunked_method_outliers
+from .correlation import correlate_chunks
+from .inference import head_rows
+from .categories import summarize_chunks
+from .profile import DatasetProfile
+from .sampling import sample_chunks
+
+
+class ChunkedDatasetAnalyzer(DatasetAnalyzer):
+    """
+    A DatasetAnalyzer for datasets that are read in chunks and never held in memory at once.
+
+    Per-chunk profiles are merged into one dataset profile (null counts, Welford
+    moments, min/max and HyperLogLog distinct counts), and outliers are counted in a
+    second pass over the chunks against the merged mean and standard deviation. Peak
+    memory is bounded by the chunk size rather than by the size of the dataset.
+    """
+
+    def __init__(self, chunks, distinct_error=0.01, n_jobs=1, backend='thread', instrument=None, outlier_method='zscore',
+                 correlation_method='pearson', infer_types=True):
+        """
+        Initialize the ChunkedDatasetAnalyzer with a chunk source.
+
+        :param chunks: callable returning a fresh iterable of pandas DataFrames on every call
+        :param distinct_error: relative standard error allowed for the HyperLogLog distinct counts; chunk profiles
+            are merged, so distinct values cannot be counted exactly
+        :param n_jobs: number of workers the columns of each chunk are split across; -1 uses all cores
+        :param backend: 'thread' or 'process'
+        :param instrument: True or an Instrumentation instance to record per-check timings, see DatasetAnalyzer
+        :param outlier_method: 'zscore', 'iqr', 'mad' or 'isolation'; the robust methods read quantiles from
+            sketches or a sample built in the first pass over the chunks
+        :param correlation_method: 'pearson' or 'spearman'; correlations are accumulated over all chunks,
+            and Spearman ranks are read from quantile sketches built in a first pass
+        :param infer_types: whether check_data_types infers the types of object columns from the first
+            rows of the first chunks
+        """
+        if distinct_error is None:
+            raise ValueError("ChunkedDatasetAnalyzer needs a distinct_error: distinct values are counted with "
+                             "HyperLogLog sketches merged across chunks")
+        super().__init__(None, distinct_error=distinct_error, n_jobs=n_jobs, backend=backend, instrument=instrument,
+                         outlier_method=outlier_method, correlation_method=correlation_method,
+                         infer_types=infer_types)
+        self.chunks = chunks
+
+    def _build_profile(self, on_column=None):
+        return DatasetProfile.from_chunks(self.chunks(), sketch_precision=self._sketch_precision(),
+                                          n_jobs=self.n_jobs, backend=self.backend, on_column=on_column)
+
+    def _count_outliers(self, columns):
+        counts = [0] * len(columns)
+        if columns:
+            for chunk in self.chunks():
+                chunk_counts = count_profiled_outliers(chunk, columns, n_jobs=self.n_jobs, backend=self.backend)
+                counts = [total + count for total, count in zip(counts, chunk_counts)]
+        return counts
+
+    def _count_method_outliers(self, columns):
+        counts = count_chunked_method_outliers(self.chunks, [column.name for column in columns], self.outlier_method)
+        return [counts[column.name] for column in columns]
+
+    def _inference_rows(self, names):
+        return head_rows(chunk[names] for chunk in self.chunks())
+
+    def _accumulate_snapshot(self, accumulator):
+        for chunk in self.chunks():
+            accumulator.update(chunk)
+        return accumulator
+
+    def _summarize_categories(self, columns):
+        names = [column.name for column in columns]
+        return summarize_chunks(self.chunks(), names)
+
+    def _correlate(self, numeric, categorical):
+        return correlate_chunks(self.chunks, numeric, categorical, self.correlation_method), self.profile.n_rows
+
+
+def analyze_csv(csv_path, chunksize=100000, distinct_error=0.01, sample_size=None, stratify=None,
+                random_state=None, n_jobs=1, backend='thread', instrument=None, outlier_method='zscore',
+                correlation_method='pearson', checks=None, **read_csv_kwargs):
+    """
+    Analyze a CSV file in chunks using the ChunkedDatasetAnalyzer class and print the recommendations.
+
+    With ``sample_size`` the file is streamed once to draw a reservoir sample, which is
+    then analyzed in memory with confidence intervals for the whole file.
+
+    :param csv_path: path to the CSV file
+    :param chunksize: number of rows read at a time
+    :param distinct_error: relative standard error allowed for the HyperLogLog distinct counts
+    :param sample_size: analyze a random sample of this many rows instead of the whole file
+    :param stratify: column label to stratify the sample on, or None for a uniform sample
+    :param random_state: seed or numpy Generator used for sampling
+    :param n_jobs: number of workers the columns are split across; -1 uses all cores
+    :param backend: 'thread' or 'process'
+    :param instrument: True or an Instrumentation instance to record per-check timings
+    :param outlier_method: 'zscore', 'iqr', 'mad' or 'isolation', see DatasetAnalyzer
+    :param correlation_method: 'pearson' or 'spearman', see DatasetAnalyzer
+    :param checks: names of the registered checks to run, or None for all, see DatasetAnalyzer.analyze
+    :param read_csv_kwargs: extra keyword arguments passed to pandas.read_csv
+    :return: ChunkedDatasetAnalyzer, or DatasetAnalyzer when sampling, with completed analysis
+    """
+    chunks = lambda: pd.read_csv(csv_path, chunksize=chunksize, **read_csv_kwargs)
+    if sample_size is not None:
+        sample, n_rows = sample_chunks(chunks(), sample_size, stratify=stratify, random_state=random_state)
+        analyzer = DatasetAnalyzer.from_sample(sample, n_rows, distinct_error=distinct_error,
+                                               n_jobs=n_jobs, backend=backend, instrument=instrument,
+                                               outlier_method=outlier_method, correlation_method=correlation_method)
+    else:
+        analyzer = ChunkedDatasetAnalyzer(chunks, distinct_error=distinct_error, n_jobs=n_jobs, backend=backend,
+                                          instrument=instrument, outlier_method=outlier_method,
+                                          correlation_method=correlation_method)
+    analyzer.analyze(checks)
+    analyzer.print_recommendations()
+    return analyzer
+
+
+def tail_csv(csv_path, poll_interval=1.0, idle_timeout=None, **read_csv_kwargs):
+    """
+    Yield the rows appended to a CSV file as DataFrames, like ``tail -f``.
+
+    The first batch holds the rows already in the file; after that every poll that
+    finds new complete lines yields them as one batch. This is a local stand-in for
+    a message queue feeding DatasetAnalyzer.update(). Quoted fields spanning several
+    lines are not supported.
+
+    :param csv_path: path to the CSV file, whose first line is the header
+    :param poll_interval: seconds to wait between polls when no new rows arrived
+    :param idle_timeout: stop after this many seconds without new rows, or None to follow forever
+    :param read_csv_kwargs: extra keyword arguments passed to pandas.read_csv
+    :return: generator of pandas DataFrames
+    """
+    with open(csv_path, 'r', newline='') as file:
+        header = file.readline()
+        pending = ''
+        idle = 0.0
+        while True:
+            pending += file.read()
+            complete, _, pending = pending.rpartition('\n')
+            if complete:
+                idle = 0.0
+                yield pd.read_csv(io.StringIO(header + complete + '\n'), **read_csv_kwargs)
+                continue
+            if idle_timeout is not None and idle >= idle_timeout:
+                return
+            time.sleep(poll_interval)
+            idle += poll_interval
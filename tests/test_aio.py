@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import time
+import pandas as pd
+import numpy as np
+import pytest
+from prossa.aio import AnalysisPool, CheckTimeout, analyze_dataset_async
+from prossa.analyzer import DatasetAnalyzer
+from prossa.parallel import prefetch
+from prossa.streaming import ChunkedDatasetAnalyzer
+
+@pytest.fixture
+def dataset():
+    rng = np.random.default_rng(4)
+    n = 2000
+    return pd.DataFrame({
+        'a': np.r_[rng.normal(size=n - 2), [25, -30]],
+        'b': np.where(rng.random(n) < 0.1, np.nan, rng.normal(size=n)),
+        'c': rng.choice(['x', 'y', 'z'], n),
+        'd': np.ones(n),
+    })
+
+def chunked(dataset, size=300, delay=0.0, read=None):
+    def chunks():
+        for start in range(0, len(dataset), size):
+            time.sleep(delay)
+            if read is not None:
+                read.append(start)
+            yield dataset.iloc[start:start + size]
+    return chunks
+
+def test_matches_sync_analysis(dataset, tmp_path):
+    analyzer = asyncio.run(analyze_dataset_async(dataset))
+    expected = DatasetAnalyzer(dataset)
+    expected.analyze()
+    assert analyzer.to_records() == expected.to_records()
+
+    path = tmp_path / 'data.csv'
+    dataset.to_csv(path, index=False)
+    analyzer = asyncio.run(analyze_dataset_async(str(path), chunksize=500))
+    expected = ChunkedDatasetAnalyzer(lambda: pd.read_csv(path, chunksize=500))
+    expected.analyze()
+    assert analyzer.to_records() == expected.to_records()
+
+def test_prefetch_reads_ahead():
+    read = []
+    items = prefetch(iter_with_log(range(5), read), depth=2)
+    assert next(items) == 0
+    time.sleep(0.05)
+    assert read == [0, 1, 2]
+    assert list(items) == [1, 2, 3, 4]
+
+def iter_with_log(values, log):
+    for value in values:
+        log.append(value)
+        yield value
+
+def test_check_timeout_stops_reading(dataset):
+    read = []
+
+    async def run():
+        async with AnalysisPool(max_workers=2) as pool:
+            return await pool.analyze(chunked(dataset, delay=0.05, read=read), check_timeout=0.1)
+
+    with pytest.raises(CheckTimeout) as error:
+        asyncio.run(run())
+    assert error.value.check == 'profile'
+    time.sleep(0.2)
+    assert len(read) < len(dataset) // 300
+
+def test_concurrent_analyses_do_not_block_the_loop(dataset):
+    ticks = []
+
+    async def ticker(done):
+        while not done.is_set():
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    async def run():
+        done = asyncio.Event()
+        task = asyncio.create_task(ticker(done))
+        pool = AnalysisPool(max_workers=4)
+        results = await asyncio.gather(*(pool.analyze(chunked(dataset, delay=0.02)) for _ in range(3)))
+        done.set()
+        await task
+        pool.close()
+        return results
+
+    start = time.perf_counter()
+    asyncio.run(analyze_dataset_async(chunked(dataset, delay=0.02)))
+    single = time.perf_counter() - start
+    start = time.perf_counter()
+    results = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+    assert all(result.to_records() == results[0].to_records() for result in results)
+    assert len(ticks) > 5
+    # Run one after another, the three analyses would take three times as long as one
+    assert elapsed < 2 * single
+
+def test_concurrency_limit_across_event_loops(dataset):
+    pool = AnalysisPool(max_workers=2, max_concurrent=1)
+
+    async def run():
+        return await asyncio.gather(pool.analyze(chunked(dataset)), pool.analyze(chunked(dataset)))
+
+    for _ in range(2):
+        first, second = asyncio.run(run())
+        assert first.to_records() == second.to_records()
+    pool.close()
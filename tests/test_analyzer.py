@@ -99,3 +99,120 @@ def test_print_recommendations(sample_dataset, capsys):
     assert "CATEGORICAL DATA:" in captured.out
     assert "CONSTANT COLUMNS:" in captured.out
     assert "IMPUTATION:" in captured.out
+
+def test_approximate_distinct_counts(sample_dataset):
+    analyzer = DatasetAnalyzer(sample_dataset, distinct_error=0.02)
+    analyzer.analyze()
+    assert any("Column 'B' has 3 unique categories" in rec for rec in analyzer.recommendations['Categorical Data'])
+    assert analyzer.recommendations['Constant Columns'][1:-1] == ['E']
+
+def test_downcast_advice():
+    rng = np.random.default_rng(0)
+    dataset = pd.DataFrame({
+        'small': rng.integers(0, 200, 1000),
+        'signed': rng.integers(-1000, 1000, 1000),
+        'big': rng.integers(0, 2 ** 40, 1000),
+        'half': rng.normal(size=1000).astype(np.float32).astype(np.float64),
+        'label': rng.choice(['red', 'green', 'blue'], 1000),
+        'ids': [f"id{i}" for i in range(1000)],
+    })
+    analyzer = DatasetAnalyzer(dataset)
+    analyzer.check_data_types()
+    advice = {f.column: f for f in analyzer.findings['Data Types'] if f.metric == 'downcast'}
+    assert {column: f.value for column, f in advice.items()} == {
+        'small': 'uint8', 'signed': 'int16', 'half': 'float32', 'label': 'category'}
+    assert advice['small'].detail['saved_bytes'] == 7000
+    assert advice['label'].detail['saved_bytes'] > 0
+    assert any("'small' can be stored as uint8 instead of int64" in rec for rec in analyzer.recommendations['Data Types'])
+
+    downcast = analyzer.downcast_frame()
+    assert downcast.dtypes.astype(str).tolist() == ['uint8', 'int16', 'int64', 'float32', 'category', 'object']
+    assert (downcast['small'] == dataset['small']).all()
+    assert dataset.memory_usage(deep=True).sum() - downcast.memory_usage(deep=True).sum() == \
+        sum(f.detail['saved_bytes'] for f in advice.values())
+
+def test_float64_values_are_not_narrowed():
+    dataset = pd.DataFrame({'normal': np.random.default_rng(0).normal(size=1000),
+                            'epoch': 1.7e9 + np.arange(1000) * 0.25, 'cents': 2e5 + np.arange(1000) / 100})
+    analyzer = DatasetAnalyzer(dataset)
+    analyzer.check_data_types()
+    assert not [f for f in analyzer.findings['Data Types'] if f.metric == 'downcast']
+
+def test_sampled_downcast_keeps_integer_width():
+    dataset = pd.DataFrame({'small': np.arange(1000) % 100, 'half': np.linspace(0, 1, 1000, dtype=np.float32)})
+    analyzer = DatasetAnalyzer(dataset.astype({'half': np.float64}), sample_size=100, random_state=0)
+    analyzer.check_data_types()
+    assert [f.column for f in analyzer.findings['Data Types'] if f.metric == 'downcast'] == ['half']
+
+@pytest.mark.parametrize('method', ['iqr', 'mad', 'isolation'])
+def test_outlier_methods(method):
+    rng = np.random.default_rng(2)
+    dataset = pd.DataFrame({'x': np.r_[rng.normal(size=995), [40, 50, -60, 70, 80]], 'y': rng.normal(size=1000)})
+    analyzer = DatasetAnalyzer(dataset, outlier_method=method)
+    analyzer.check_outliers()
+    findings = analyzer.findings['Outliers']
+    assert findings[0].metric == 'method' and findings[0].value == method
+    counts = {f.column: f.value for f in findings if f.metric == f"{method}_outliers"}
+    assert counts['x'] >= 5
+    assert f"Column 'x' has {counts['x']} potential outliers" in analyzer.recommendations['Outliers'][0]
+    with pytest.raises(ValueError):
+        DatasetAnalyzer(dataset, outlier_method='unknown')
+
+@pytest.mark.parametrize('method', ['iqr', 'mad', 'isolation'])
+def test_outlier_methods_without_varying_columns(method):
+    dataset = pd.DataFrame({'city': ['a', 'b', 'c'] * 10, 'empty': np.nan, 'constant': 1.0})
+    analyzer = DatasetAnalyzer(dataset, outlier_method=method)
+    analyzer.check_outliers()
+    assert not [f for f in analyzer.findings['Outliers'] if f.metric == f"{method}_outliers" and f.value]
+    streamed = DatasetAnalyzer(None, outlier_method=method)
+    streamed.update(dataset[['city']])
+    streamed.update(dataset[['city']])
+
+def test_check_correlations(sample_dataset):
+    analyzer = DatasetAnalyzer(sample_dataset)
+    analyzer.check_correlations()
+    pairs = {(f.column, f.detail['other']): f.metric for f in analyzer.findings['Correlations']}
+    assert pairs == {('A', 'C'): 'near_duplicate', ('A', 'D'): 'near_duplicate', ('C', 'D'): 'near_duplicate'}
+    assert "Columns 'A' and 'C' are near-duplicates (Pearson r = 1.000)." in analyzer.recommendations['Correlations']
+    with pytest.raises(ValueError):
+        DatasetAnalyzer(sample_dataset, correlation_method='kendall')
+
+def test_infer_object_types():
+    dataset = pd.DataFrame({
+        'price': [f"{i * 0.5}" for i in range(1000)],
+        'joined': pd.date_range('2020-01-01', periods=1000).strftime('%Y-%m-%d').tolist(),
+        'name': [f"user{i}" for i in range(1000)],
+    })
+    analyzer = DatasetAnalyzer(dataset)
+    analyzer.check_data_types()
+    conversions = {f.column: f.value for f in analyzer.findings['Data Types'] if f.metric == 'convert'}
+    assert conversions == {'price': 'float64', 'joined': 'datetime64[ns]'}
+    assert any("'price' holds numbers stored as objects" in rec for rec in analyzer.recommendations['Data Types'])
+
+    analyzer = DatasetAnalyzer(dataset, infer_types=False)
+    analyzer.check_data_types()
+    assert not any(f.metric == 'convert' for f in analyzer.findings['Data Types'])
+
+def test_grouping_advice_for_many_categories():
+    rng = np.random.default_rng(0)
+    dataset = pd.DataFrame({'city': np.where(rng.random(5000) < 0.05, [f"r{i}" for i in range(5000)],
+                                             rng.choice(['x', 'y'], 5000))})
+    analyzer = DatasetAnalyzer(dataset)
+    analyzer.check_categorical_data()
+    grouping = [f for f in analyzer.findings['Categorical Data'] if f.metric == 'grouping']
+    assert [(f.column, f.value) for f in grouping] == [('city', 2)]
+    assert any("Keep the 2 categories with at least" in rec for rec in analyzer.recommendations['Categorical Data'])
+
+    streamed = DatasetAnalyzer(None)
+    for start in range(0, 5000, 1000):
+        streamed.update(dataset.iloc[start:start + 1000])
+    assert streamed.findings['Categorical Data'][1].value == 2
+    assert streamed.findings['Categorical Data'][1].detail['kept_share'] == grouping[0].detail['kept_share']
+
+def test_no_grouping_advice_when_every_category_is_kept():
+    analyzer = DatasetAnalyzer(pd.DataFrame({'city': [f"c{i}" for i in range(16)] * 100}))
+    analyzer.check_categorical_data()
+    assert [f.value for f in analyzer.findings['Categorical Data'] if f.metric == 'grouping'] == [16]
+    lines = analyzer.recommendations['Categorical Data']
+    assert "Column 'city' has 16 unique categories." in lines
+    assert not any("Keep the" in line or "group the other" in line for line in lines)
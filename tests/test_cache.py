@@ -0,0 +1,90 @@
+import os
+import pickle
+import pandas as pd
+import numpy as np
+import pytest
+from prossa.analyzer import DatasetAnalyzer
+from prossa import analyzer as analyzer_module
+from prossa.cache import ProfileCache, column_fingerprint
+
+@pytest.fixture
+def sample_dataset():
+    return pd.DataFrame({
+        'A': [1, 2, np.nan, 4, 5],
+        'B': ['x', 'y', 'z', 'x', 'y'],
+        'C': [1.1, 2.2, 3.3, 4.4, 5.5],
+        'D': [10, 20, 30, 40, 50],
+        'E': ['a', 'a', 'a', 'a', 'a']
+    })
+
+def test_column_fingerprint():
+    series = pd.Series([1.0, 2.0, np.nan])
+    assert column_fingerprint(series) == column_fingerprint(series.copy())
+    assert column_fingerprint(series) != column_fingerprint(pd.Series([1.0, 2.5, np.nan]))
+    assert column_fingerprint(series) != column_fingerprint(series.astype('float32'))
+    assert column_fingerprint(pd.Series(['a', 'b'])) != column_fingerprint(pd.Series(['b', 'a']))
+    assert column_fingerprint(series, stamp='v1') != column_fingerprint(series, stamp='v2')
+
+def test_rerun_reuses_unchanged_columns(sample_dataset, tmp_path, monkeypatch):
+    cache = ProfileCache(tmp_path)
+    first = DatasetAnalyzer(sample_dataset, cache=cache)
+    first.analyze()
+
+    changed = sample_dataset.assign(D=[10, 20, 30, 40, 5000])
+    profiled = []
+    from prossa import profile as profile_module
+    original_from_series = profile_module.ColumnProfile.from_series.__func__
+    monkeypatch.setattr(profile_module.ColumnProfile, 'from_series', classmethod(
+        lambda cls, series, **kwargs: profiled.append(series.name) or original_from_series(cls, series, **kwargs)))
+
+    second = DatasetAnalyzer(changed, cache=str(tmp_path))
+    second.analyze()
+    assert profiled == ['D']
+    expected = DatasetAnalyzer(changed)
+    expected.analyze()
+    assert second.recommendations == expected.recommendations
+
+def test_rerun_reuses_advice_and_correlations(sample_dataset, tmp_path, monkeypatch):
+    DatasetAnalyzer(sample_dataset, cache=tmp_path).analyze()
+    expected = DatasetAnalyzer(sample_dataset)
+    expected.analyze()
+    calls = []
+
+    def record(name, function):
+        def wrapper(frame, *args, **kwargs):
+            calls.append((name, list(frame.columns)))
+            return function(frame, *args, **kwargs)
+        monkeypatch.setattr(analyzer_module, name, wrapper)
+
+    record('advise_downcast', analyzer_module.advise_downcast)
+    record('infer_types', analyzer_module.infer_types)
+    monkeypatch.setattr(analyzer_module.CorrelationAccumulator, 'update', lambda *args: calls.append('correlations'))
+    rerun = DatasetAnalyzer(sample_dataset, cache=tmp_path)
+    rerun.analyze()
+    assert calls == []
+    assert rerun.recommendations == expected.recommendations
+
+    changed = DatasetAnalyzer(sample_dataset.assign(D=[10, 20, 30, 40, 5000]), cache=tmp_path)
+    changed.check_data_types()
+    assert calls == [('advise_downcast', ['D'])]
+
+def test_stale_entries_are_ignored(tmp_path):
+    cache = ProfileCache(tmp_path)
+    cache.put_result('a', 'outliers', 3)
+    assert cache.result('a', 'outliers') == 3
+    with open(tmp_path / 'a.pkl', 'wb') as file:
+        pickle.dump({'profile': None, 'outliers': 3}, file)
+    assert cache.get('a') is None
+    assert cache.result('a', 'outliers') is None
+
+def test_lru_eviction(tmp_path):
+    cache = ProfileCache(tmp_path, max_bytes=10 ** 6)
+    for age, key in enumerate('ba'):
+        cache.put(key, {'payload': bytes(400000)})
+        os.utime(tmp_path / f"{key}.pkl", (1000 + age, 1000 + age))
+    cache.put('c', {'payload': bytes(400000)})
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c') is not None
+    cache.clear()
+    assert cache.get('c') is None
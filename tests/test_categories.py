@@ -0,0 +1,33 @@
+import pandas as pd
+import numpy as np
+import pytest
+from prossa.categories import grouping_advice, summarize_categories, summarize_chunks
+from prossa.sketches import SpaceSaving
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    n = 20000
+    common = rng.choice(['a', 'b', 'c', 'd'], n, p=[0.5, 0.25, 0.15, 0.1])
+    return pd.DataFrame({
+        'city': np.where(rng.random(n) < 0.04, [f"rare{i}" for i in rng.integers(0, 400, n)], common),
+        'id': [f"id{i}" for i in range(n)],
+    })
+
+def test_grouping_advice(frame):
+    city, ids = summarize_categories(frame, ['city', 'id'])
+    advice = grouping_advice(city)
+    assert advice['keep'] == 4 and not advice['approximate']
+    assert [value for value, _, _ in advice['top'][:4]] == ['a', 'b', 'c', 'd']
+    assert advice['tail_share'] == pytest.approx((frame['city'].str.startswith('rare')).mean())
+    assert advice['min_count'] == (frame['city'] == 'd').sum()
+    assert grouping_advice(ids)['keep'] == 0
+
+def test_summaries_merge_across_chunks(frame):
+    whole = grouping_advice(summarize_categories(frame, ['city'], capacity=50)[0])
+    chunked = summarize_chunks((frame.iloc[start:start + 3000] for start in range(0, len(frame), 3000)), ['city'],
+                               capacity=50)
+    advice = grouping_advice(chunked[0])
+    assert advice['keep'] == whole['keep'] == 4
+    assert advice['kept_share'] == pytest.approx(whole['kept_share'], abs=0.01)
+    assert chunked[0].total == len(frame)
@@ -0,0 +1,63 @@
+import pandas as pd
+import numpy as np
+import pytest
+from prossa.analyzer import DatasetAnalyzer
+from prossa.checks import REGISTRY, register_check, resolve_checks, schedule, topological_order
+from prossa.findings import RENDERERS, Finding
+from prossa.profile import NUMERIC, DatasetProfile
+
+@pytest.fixture
+def sample_dataset():
+    return pd.DataFrame({
+        'A': [1, 2, np.nan, 4, 5],
+        'B': ['x', 'y', 'z', 'x', 'y'],
+        'C': [1.1, 2.2, 3.3, 4.4, 5.5],
+        'E': ['a', 'a', 'a', 'a', 'a']
+    })
+
+@pytest.fixture
+def plugin():
+    @register_check('Skewness', needs={'moments': (NUMERIC,)},
+                    render=lambda findings: [f"{finding.column}: {finding.value:.2f}" for finding in findings])
+    def check_skewness(analyzer):
+        return [Finding('Skewness', column.name, 'mean_to_max', column.mean / column.max)
+                for column in analyzer.profile.of_kind(NUMERIC)]
+    yield check_skewness
+    del REGISTRY['check_skewness']
+    del RENDERERS['Skewness']
+
+def test_topological_order():
+    assert topological_order(['constancy']) == ['null_count', 'moments', 'constancy']
+    assert topological_order(['distinct', 'moments']) == ['distinct', 'null_count', 'moments']
+
+def test_schedule_only_missing_statistics(sample_dataset):
+    profile = DatasetProfile.skeleton(sample_dataset)
+    plan = schedule([{'moments': (NUMERIC,)}, {'null_count': None}], list(profile))
+    assert [(statistic, [column.name for column in columns]) for statistic, columns in plan] == [
+        ('null_count', ['A', 'B', 'C', 'E']), ('moments', ['A', 'C'])]
+    assert schedule([{'constancy': None}], list(DatasetProfile.from_frame(sample_dataset))) == []
+
+def test_resolve_checks():
+    assert [check.name for check in resolve_checks(['outliers', 'check_missing_values'])] == [
+        'check_missing_values', 'check_outliers']
+    with pytest.raises(ValueError):
+        resolve_checks(['spelling'])
+
+def test_selected_checks_compute_only_their_statistics(sample_dataset):
+    analyzer = DatasetAnalyzer(sample_dataset)
+    analyzer.analyze(['missing_values'])
+    assert list(analyzer.findings) == ['Missing Values']
+    assert [column.null_count for column in analyzer.profile] == [1, 0, 0, 0]
+    assert all(column.std is None and column.distinct is None and column.varies is None
+               for column in analyzer.profile)
+    analyzer.check_constant_columns()
+    assert [finding.column for finding in analyzer.findings['Constant Columns']] == ['E']
+    assert analyzer.profile['C'].std == pytest.approx(np.std([1.1, 2.2, 3.3, 4.4, 5.5]))
+
+def test_plugin_check(sample_dataset, plugin):
+    analyzer = DatasetAnalyzer(sample_dataset)
+    analyzer.analyze(['skewness'])
+    assert analyzer.recommendations['Skewness'] == ['A: 0.60', 'C: 0.60']
+    analyzer = DatasetAnalyzer(sample_dataset)
+    analyzer.analyze()
+    assert list(analyzer.findings)[-1] == 'Skewness'
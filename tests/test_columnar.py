@@ -0,0 +1,90 @@
+import pandas as pd
+import numpy as np
+import pytest
+from prossa.analyzer import DatasetAnalyzer
+from prossa.columnar import ColumnarDatasetAnalyzer, ParquetSource, open_source
+
+pytest.importorskip('pyarrow')
+
+@pytest.fixture
+def dataset():
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=1000)
+    values[:5] = 50
+    return pd.DataFrame({
+        'A': np.where(np.arange(1000) % 7 == 0, np.nan, values),
+        'B': rng.choice(['x', 'y', 'z'], 1000),
+        'C': np.arange(1000),
+        'D': [3] * 1000,
+        'E': ['a'] * 1000,
+        'F': pd.date_range('2024-01-01', periods=1000, freq='h'),
+        'G': pd.Categorical(rng.choice(['u', 'v'], 1000)),
+    })
+
+@pytest.fixture(params=['parquet', 'feather'])
+def path(request, dataset, tmp_path):
+    path = tmp_path / f"data.{request.param}"
+    if request.param == 'parquet':
+        dataset.to_parquet(path, row_group_size=300)
+    else:
+        dataset.to_feather(path, chunksize=300)
+    return path
+
+def test_matches_in_memory_analysis(dataset, path):
+    expected = DatasetAnalyzer(dataset, downcast=False)
+    expected.analyze()
+    analyzer = ColumnarDatasetAnalyzer(path)
+    analyzer.analyze()
+    assert analyzer.to_records() == expected.to_records()
+
+def test_approximate_distinct_reads_row_groups(dataset, path):
+    analyzer = ColumnarDatasetAnalyzer(path, distinct_error=0.01)
+    analyzer.analyze()
+    assert {f.column: f.value for f in analyzer.findings['Categorical Data']} == {'B': 3, 'E': 1, 'G': 2}
+    assert [f.column for f in analyzer.findings['Outliers']] == ['A']
+
+def test_metadata_answers_without_reading(dataset, tmp_path, monkeypatch):
+    path = tmp_path / 'data.parquet'
+    dataset.to_parquet(path, row_group_size=300)
+    source = ParquetSource(path)
+    read = []
+    monkeypatch.setattr(source, 'read', lambda columns: read.extend(columns) or ParquetSource.read(source, columns))
+    monkeypatch.setattr(source, 'chunks', lambda columns: read.extend(columns) or ParquetSource.chunks(source, columns))
+    analyzer = ColumnarDatasetAnalyzer(source, infer_types=False)
+    analyzer.check_missing_values()
+    analyzer.check_data_types()
+    analyzer.check_constant_columns()
+    # Only the float column is read, to count its NaN values
+    assert read == ['A']
+    assert [f.column for f in analyzer.findings['Constant Columns']] == ['D', 'E']
+    analyzer.check_outliers()
+    assert 'D' not in read and set(read) <= {'A', 'C'}
+
+def test_column_projection_and_from_file(dataset, path):
+    analyzer = DatasetAnalyzer.from_file(path, columns=['A', 'B'])
+    analyzer.analyze()
+    assert [f.column for f in analyzer.findings['Data Types']] == ['A', 'B']
+    assert open_source(path).num_rows == 1000
+    with pytest.raises(ValueError):
+        open_source(path.with_suffix('.txt'))
+
+@pytest.mark.parametrize('suffix', ['parquet', 'feather'])
+def test_nan_counts_as_missing(tmp_path, suffix):
+    import pyarrow as pa
+    import pyarrow.feather
+    import pyarrow.parquet as pq
+
+    values = np.where(np.arange(30) % 3 == 0, np.nan, np.arange(30.0))
+    table = pa.table({'x': pa.array(values, from_pandas=False), 'y': np.arange(30)})
+    path = tmp_path / f"nan.{suffix}"
+    (pq.write_table if suffix == 'parquet' else pyarrow.feather.write_feather)(table, path)
+    analyzer = ColumnarDatasetAnalyzer(path)
+    analyzer.check_missing_values()
+    assert [(f.column, f.value) for f in analyzer.findings['Missing Values']] == [('x', 10)]
+    assert analyzer.require({'moments': None})['x'].mean == pytest.approx(np.nanmean(values))
+
+def test_from_file_rejects_unsupported_options(path):
+    with pytest.raises(ValueError, match='downcast'):
+        DatasetAnalyzer.from_file(path, downcast=False)
+    with pytest.raises(ValueError, match='sample_size'):
+        DatasetAnalyzer.from_file(path.parent, sample_size=10)
@@ -0,0 +1,106 @@
+import pandas as pd
+import numpy as np
+import pytest
+from prossa.correlation import CorrelationAccumulator, approximate_ranks, correlate_chunks, cramers_v, rank_grid
+from prossa.profile import DatasetProfile, NUMERIC, CATEGORICAL
+from prossa.sketches import KLLSketch
+
+@pytest.fixture
+def dataset():
+    rng = np.random.default_rng(3)
+    n = 3000
+    a = rng.normal(size=n)
+    frame = pd.DataFrame({
+        'a': a,
+        'b': a * 2 + rng.normal(scale=0.2, size=n),
+        'c': rng.normal(size=n),
+        'd': pd.array(rng.integers(0, 10, n), dtype='Int64'),
+        'x': rng.choice(['p', 'q', 'r'], n),
+        'z': rng.choice(['u', 'v'], n),
+    })
+    frame['y'] = frame['x'].map({'p': 'P', 'q': 'Q', 'r': 'R'})
+    frame.loc[rng.random(n) < 0.1, 'b'] = np.nan
+    frame.loc[rng.random(n) < 0.1, 'd'] = pd.NA
+    frame.loc[rng.random(n) < 0.1, 'y'] = None
+    return frame
+
+def numeric_pairs(accumulator):
+    return {(column, other): value for column, other, statistic, value in accumulator.pairs(0) if statistic != 'cramers_v'}
+
+def reference(dataset, method):
+    matrix = dataset[['a', 'b', 'c', 'd']].astype(float).corr(method)
+    return {(column, other): matrix.loc[column, other]
+            for position, column in enumerate(matrix) for other in matrix.columns[position + 1:]}
+
+@pytest.mark.parametrize('method', ['pearson', 'spearman'])
+def test_matches_pandas(dataset, method):
+    profile = DatasetProfile.from_frame(dataset)
+    accumulator = CorrelationAccumulator.from_profiles(profile.of_kind(NUMERIC), method=method, block_size=3)
+    pairs = numeric_pairs(accumulator.update(dataset))
+    expected = reference(dataset, method)
+    assert pairs.keys() == expected.keys()
+    for key, value in expected.items():
+        # Spearman ranks each column once rather than the rows of each pair, which differs slightly with nulls
+        assert pairs[key] == pytest.approx(value, abs=1e-5 if method == 'pearson' else 1e-3)
+
+def test_chunks_and_merge(dataset):
+    profile = DatasetProfile.from_frame(dataset)
+    numeric, categorical = profile.of_kind(NUMERIC), profile.of_kind(CATEGORICAL)
+    whole = CorrelationAccumulator.from_profiles(numeric, categorical).update(dataset)
+    left = CorrelationAccumulator.from_profiles(numeric, categorical).update(dataset.iloc[:1000])
+    right = CorrelationAccumulator.from_profiles(numeric, categorical).update(dataset.iloc[1000:])
+    merged = dict(((column, other), value) for column, other, _, value in left.merge(right).pairs(0))
+    for column, other, _, value in whole.pairs(0):
+        assert merged[(column, other)] == pytest.approx(value, abs=1e-5)
+    chunks = lambda: (dataset.iloc[start:start + 700] for start in range(0, len(dataset), 700))
+    assert [pair[:3] for pair in correlate_chunks(chunks, numeric, categorical).pairs()] == \
+        [pair[:3] for pair in whole.pairs()] == [('x', 'y', 'cramers_v'), ('a', 'b', 'pearson')]
+
+def test_approximate_spearman(dataset):
+    profile = DatasetProfile.from_frame(dataset)
+    chunks = lambda: (dataset.iloc[start:start + 700] for start in range(0, len(dataset), 700))
+    pairs = numeric_pairs(correlate_chunks(chunks, profile.of_kind(NUMERIC), method='spearman'))
+    for key, value in reference(dataset, 'spearman').items():
+        assert pairs[key] == pytest.approx(value, abs=0.02)
+
+def test_approximate_ranks():
+    values = np.r_[np.arange(100.0), np.full(100, 50.0)]
+    grid = rank_grid(KLLSketch().update(values), points=201)
+    ranks = approximate_ranks(np.array([-1.0, 0.0, 50.0, 99.0, 1000.0, np.nan]), grid)
+    assert ranks[0] == 0 and ranks[4] == 1 and np.isnan(ranks[5])
+    assert ranks[2] == pytest.approx(0.5, abs=0.01)
+    assert ranks[1] < ranks[2] < ranks[3]
+
+def test_cramers_v():
+    assert cramers_v(np.array([[10.0, 0], [0, 5]])) == pytest.approx(1.0)
+    assert cramers_v(np.array([[10.0, 10], [5, 5]])) == pytest.approx(0.0)
+    assert cramers_v(np.array([[10.0, 0], [0, 0]])) is None
+
+def test_categories_across_blocks(dataset):
+    # Sorted so that categories of 'x' first appear after those of 'y' got their indices
+    ordered = dataset.sort_values('x', ascending=False)
+    whole = CorrelationAccumulator([], ['x', 'z', 'y'], block_size=2)
+    for start in range(0, len(ordered), 500):
+        whole.update(ordered.iloc[start:start + 500])
+    merged = CorrelationAccumulator([], ['x', 'z', 'y'], block_size=2).update(dataset.iloc[:1500])
+    merged.merge(CorrelationAccumulator([], ['x', 'z', 'y'], block_size=2).update(dataset.iloc[1500:]))
+    expected = pd.crosstab(dataset['x'], dataset['y']).to_numpy()
+    for accumulator in (whole, merged):
+        values = dict(((column, other), value) for column, other, _, value in accumulator.pairs(0))
+        assert values[('x', 'y')] == pytest.approx(cramers_v(expected.astype(float)))
+        assert values[('x', 'z')] == pytest.approx(cramers_v(pd.crosstab(dataset['x'], dataset['z']).to_numpy().astype(float)))
+
+def test_contingency_tables_per_pair(dataset):
+    dataset['w'] = dataset['x'] + dataset['z']
+    grouped = CorrelationAccumulator([], ['x', 'z', 'y', 'w'], block_size=4).update(dataset)
+    single = CorrelationAccumulator([], ['x', 'z', 'y', 'w']).update(dataset)
+    assert {pair: table.shape for pair, table in grouped.tables.items()} == {
+        (0, 1): (3, 2), (0, 2): (3, 3), (0, 3): (3, 6), (1, 2): (2, 3), (1, 3): (2, 6), (2, 3): (3, 6)}
+    assert grouped.pairs(0) == pytest.approx(single.pairs(0))
+    assert np.array_equal(grouped.tables[1, 3].sum(axis=0), dataset['w'].value_counts(sort=False).to_numpy())
+
+def test_high_cardinality_columns_are_left_out(dataset):
+    dataset['id'] = [f"id{row}" for row in range(len(dataset))]
+    accumulator = CorrelationAccumulator([], ['x', 'y', 'id'], max_categories=10).update(dataset)
+    assert accumulator.dropped == {2}
+    assert [pair[:2] for pair in accumulator.pairs()] == [('x', 'y')]
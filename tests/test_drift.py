@@ -0,0 +1,93 @@
+import time
+import pandas as pd
+import numpy as np
+import pytest
+from prossa.analyzer import DatasetAnalyzer
+from prossa.drift import DatasetSnapshot, SnapshotAccumulator, compare_snapshots, ks_statistic
+from prossa.findings import render
+from prossa.partitions import PartitionedDatasetAnalyzer
+from prossa.sketches import KLLSketch
+from prossa.streaming import ChunkedDatasetAnalyzer
+
+def make_dataset(seed, n=20000, shift=0.0, null_rate=0.01, levels=1000):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        'amount': rng.normal(shift, 1, n),
+        'city': rng.choice(['north', 'south', 'east'], n, p=[0.5, 0.3, 0.2] if not shift else [0.2, 0.3, 0.5]),
+        'code': rng.integers(0, levels, n),
+    })
+    frame.loc[rng.random(n) < null_rate, 'amount'] = np.nan
+    return frame
+
+def metrics(findings):
+    return {(f.column, f.metric): f for f in findings if f.column is not None}
+
+def test_same_distribution_does_not_drift():
+    findings = compare_snapshots(DatasetAnalyzer(make_dataset(0)).snapshot(),
+                                 DatasetAnalyzer(make_dataset(1)).snapshot())
+    assert not any(f.detail.get('drifted') for f in findings)
+    assert render('Drift', findings) == ["No column drifted beyond the thresholds."]
+
+def test_shifted_distribution_drifts(tmp_path):
+    DatasetAnalyzer(make_dataset(0)).snapshot(tmp_path / 'old.json')
+    DatasetAnalyzer(make_dataset(1, shift=0.5, null_rate=0.2, levels=3000).drop(columns='city')).snapshot(
+        tmp_path / 'new.json')
+    findings = metrics(compare_snapshots(tmp_path / 'old.json', tmp_path / 'new.json'))
+    assert findings['amount', 'null_rate_shift'].value == pytest.approx(0.19, abs=0.01)
+    assert findings['amount', 'ks'].value == pytest.approx(0.197, abs=0.02)
+    assert findings['amount', 'psi'].detail['drifted']
+    assert findings['code', 'cardinality_shift'].value == pytest.approx(2, abs=0.1)
+    assert findings['city', 'removed'].detail['drifted']
+    lines = render('Drift', list(findings.values()))
+    assert "Column 'city' (object) was removed." in lines
+
+def test_categorical_psi():
+    old = DatasetAnalyzer(make_dataset(0)).snapshot()
+    new = DatasetAnalyzer(make_dataset(1, shift=1e-9)).snapshot()
+    psi = metrics(compare_snapshots(old, new))['city', 'psi'].value
+    expected = sum((b - a) * np.log(b / a) for a, b in zip([0.5, 0.3, 0.2], [0.2, 0.3, 0.5]))
+    assert psi == pytest.approx(expected, rel=0.1)
+
+def test_replaced_category_drifts():
+    old = DatasetAnalyzer(pd.DataFrame({'city': ['a'] * 500 + ['b'] * 500})).snapshot()
+    new = DatasetAnalyzer(pd.DataFrame({'city': ['a'] * 500 + ['z'] * 500})).snapshot()
+    psi = metrics(compare_snapshots(old, new))['city', 'psi']
+    assert psi.value > 1 and psi.detail['drifted']
+
+def test_round_trip_and_size(tmp_path):
+    snapshot = DatasetAnalyzer(make_dataset(0, n=200000)).snapshot(tmp_path / 'snapshot.json')
+    loaded = DatasetSnapshot.load(tmp_path / 'snapshot.json')
+    assert (tmp_path / 'snapshot.json').stat().st_size < 40000
+    assert loaded['amount'].sketch.quantile(0.5) == snapshot['amount'].sketch.quantile(0.5)
+    assert loaded['code'].distinct == snapshot['code'].distinct
+    assert loaded['city'].top == {'north': pytest.approx(100000, rel=0.02), 'south': pytest.approx(60000, rel=0.03),
+                                  'east': pytest.approx(40000, rel=0.03)}
+    started = time.perf_counter()
+    compare_snapshots(loaded, snapshot)
+    assert time.perf_counter() - started < 0.1
+
+def test_streamed_and_partitioned_snapshots(tmp_path):
+    dataset = make_dataset(0)
+    for index in range(4):
+        dataset.iloc[index * 5000:(index + 1) * 5000].to_csv(tmp_path / f"part{index}.csv", index=False)
+    whole = DatasetAnalyzer(dataset).snapshot()
+    chunked = ChunkedDatasetAnalyzer(lambda: (dataset.iloc[start:start + 3000] for start in range(0, 20000, 3000)))
+    for snapshot in (chunked.snapshot(), PartitionedDatasetAnalyzer(tmp_path, n_jobs=2).snapshot()):
+        assert snapshot.n_rows == 20000
+        assert snapshot['city'].top == whole['city'].top
+        assert snapshot['amount'].null_count == whole['amount'].null_count
+        assert ks_statistic(snapshot['amount'].sketch, whole['amount'].sketch) < 0.03
+
+def test_category_capacity():
+    accumulator = SnapshotAccumulator(['x'], ['categorical'], capacity=10)
+    for start in range(0, 100, 20):
+        accumulator.update(pd.DataFrame({'x': ['hot'] * 50 + [f"v{i}" for i in range(start, start + 20)]}))
+    assert len(accumulator.counts[0].counts) == 10
+    assert accumulator.counts[0].top(1) == [('hot', 250, 0)]
+
+def test_ks_statistic():
+    rng = np.random.default_rng(0)
+    left = KLLSketch(random_state=0).update(rng.normal(size=50000))
+    right = KLLSketch(random_state=1).update(rng.normal(0.5, size=50000))
+    assert ks_statistic(left, right) == pytest.approx(0.197, abs=0.02)
+    assert ks_statistic(left, left) == 0
@@ -0,0 +1,80 @@
+import pandas as pd
+import numpy as np
+import pytest
+from prossa.analyzer import DatasetAnalyzer
+from prossa.engines import EngineDatasetAnalyzer, open_engine
+from prossa.sketches import SpaceSaving
+
+pytest.importorskip('pyarrow')
+
+@pytest.fixture
+def dataset():
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=1000)
+    values[:5] = 50
+    return pd.DataFrame({
+        'A': np.where(np.arange(1000) % 7 == 0, np.nan, values),
+        'B': rng.choice(['x', 'y', 'z'], 1000),
+        'C': np.arange(1000),
+        'D': [3] * 1000,
+        'E': ['a'] * 1000,
+        'F': pd.date_range('2024-01-01', periods=1000, freq='h'),
+        'I': [f"id{i}" for i in range(1000)],
+    })
+
+@pytest.fixture(params=['polars', 'duckdb'])
+def engine(request):
+    pytest.importorskip(request.param)
+    return request.param
+
+@pytest.fixture
+def path(dataset, tmp_path):
+    path = tmp_path / 'data.parquet'
+    dataset.to_parquet(path, row_group_size=300)
+    return path
+
+def test_matches_in_memory_analysis(dataset, path, engine):
+    analyzer = EngineDatasetAnalyzer(path, engine=engine)
+    analyzer.analyze()
+    expected = DatasetAnalyzer(dataset, downcast=False)
+    expected.analyze()
+    assert dict(analyzer.recommendations) == dict(expected.recommendations)
+
+def test_selected_checks_query_only_null_counts(path, engine):
+    analyzer = EngineDatasetAnalyzer(path, engine=engine, instrument=True)
+    analyzer.analyze(['missing_values'])
+    assert [record['name'] for record in analyzer.timings()] == ['profile', 'check_missing_values']
+    assert analyzer.profile['A'].null_count == 143
+    assert all(column.std is None and column.distinct is None for column in analyzer.profile)
+    analyzer.check_outliers()
+    assert analyzer.findings['Outliers'][0].value == 4
+    assert analyzer.timings()[-2]['name'] == 'query'
+
+def test_csv_source(dataset, tmp_path, engine):
+    path = tmp_path / 'data.csv'
+    dataset[['A', 'B', 'C']].to_csv(path, index=False)
+    profile = EngineDatasetAnalyzer(path, engine=engine).profile
+    assert [column.null_count for column in profile] == [143, 0, 0]
+    assert profile['C'].mean == pytest.approx(499.5)
+
+def test_open_engine_validates():
+    with pytest.raises(ValueError):
+        open_engine('data.parquet', engine='spark')
+
+def test_space_saving_from_counts():
+    counts = pd.Series([50, 30, 20, 5], index=['a', 'b', 'c', 'd'])
+    summary = SpaceSaving.from_counts(counts, total=110, capacity=3)
+    assert summary.top() == [('a', 50, 0), ('b', 30, 0), ('c', 20, 0)]
+    assert summary.floor == 5 and not summary.is_exact
+
+def test_nan_counts_as_missing(tmp_path, engine):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    values = np.where(np.arange(30) % 3 == 0, np.nan, np.arange(30.0))
+    path = tmp_path / 'nan.parquet'
+    pq.write_table(pa.table({'x': pa.array(values, from_pandas=False)}), path)
+    analyzer = EngineDatasetAnalyzer(path, engine=engine)
+    analyzer.analyze()
+    assert analyzer.profile['x'].null_count == 10
+    assert analyzer.profile['x'].mean == pytest.approx(np.nanmean(values))
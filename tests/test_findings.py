@@ -0,0 +1,58 @@
+import json
+import pandas as pd
+import numpy as np
+import pytest
+from prossa.analyzer import DatasetAnalyzer
+from prossa import findings as findings_module
+from prossa.findings import Finding
+
+@pytest.fixture
+def sample_dataset():
+    return pd.DataFrame({
+        'A': [1, 2, np.nan, 4, 5],
+        'B': ['x', 'y', 'z', 'x', 'y'],
+        'C': [1.1, 2.2, 3.3, 4.4, 5.5],
+        'D': [10, 20, 30, 40, 50],
+        'E': ['a', 'a', 'a', 'a', 'a']
+    })
+
+def test_findings_are_structured(sample_dataset):
+    analyzer = DatasetAnalyzer(sample_dataset)
+    analyzer.analyze()
+    missing = analyzer.findings['Missing Values']
+    assert [(f.column, f.metric, f.value) for f in missing] == [('A', 'null_count', 1)]
+    assert missing[0].detail['fraction'] == pytest.approx(0.2)
+    assert [f.column for f in analyzer.findings['Constant Columns']] == ['E']
+    assert {f.column: f.value for f in analyzer.findings['Categorical Data']} == {'B': 3, 'E': 1}
+    assert not hasattr(missing[0], '__dict__')
+
+def test_rendering_is_lazy(sample_dataset, monkeypatch):
+    rendered = []
+    original = findings_module.render
+    monkeypatch.setattr(findings_module, 'render', lambda category, items: rendered.append(category) or original(category, items))
+    analyzer = DatasetAnalyzer(sample_dataset)
+    analyzer.analyze()
+    assert rendered == []
+    assert "E" in analyzer.recommendations['Constant Columns']
+    analyzer.recommendations['Constant Columns']
+    assert rendered == ['Constant Columns']
+
+def test_to_json(sample_dataset, tmp_path):
+    analyzer = DatasetAnalyzer(sample_dataset)
+    analyzer.analyze()
+    path = tmp_path / 'findings.json'
+    records = json.loads(analyzer.to_json(path))
+    assert json.loads(path.read_text()) == records
+    assert {'category': 'Data Types', 'column': 'B', 'metric': 'dtype', 'value': 'object', 'detail': None} in records
+    assert len(records) == len(analyzer.to_records())
+
+def test_to_arrow(sample_dataset):
+    pytest.importorskip('pyarrow')
+    analyzer = DatasetAnalyzer(sample_dataset)
+    analyzer.analyze()
+    table = analyzer.to_arrow()
+    assert table.column_names == ['category', 'column', 'metric', 'value', 'text', 'detail']
+    assert table.num_rows == len(analyzer.to_records())
+
+def test_finding_repr():
+    assert repr(Finding('Outliers', 'A', 'zscore_outliers', 2)) == "Finding('Outliers', 'A', 'zscore_outliers', 2)"
@@ -0,0 +1,55 @@
+import pandas as pd
+import numpy as np
+import pytest
+from prossa.inference import head_rows, infer_column, infer_types
+
+@pytest.fixture
+def sample():
+    rng = np.random.default_rng(0)
+    n = 2000
+    numbers = rng.normal(size=n).round(3).astype(str)
+    numbers[rng.random(n) < 0.02] = 'N/A'
+    return pd.DataFrame({
+        'numbers': numbers,
+        'counts': rng.integers(0, 100, n).astype(str),
+        'flags': rng.choice(['Yes', 'no', 'YES'], n),
+        'iso': pd.date_range('2024-01-01', periods=n, freq='h').strftime('%Y-%m-%d %H:%M:%S'),
+        'dayfirst': pd.date_range('2024-01-13', periods=n, freq='D').strftime('%d/%m/%Y'),
+        'objects': pd.Series(rng.integers(0, 10, n), dtype=object),
+        'words': rng.choice(['red', 'green', 'blue'], n),
+        'floats': rng.normal(size=n),
+    })
+
+def test_infer_types(sample):
+    inferred = {name: (target, detail) for name, target, detail in infer_types(sample)}
+    assert {name: target for name, (target, _) in inferred.items()} == {
+        'numbers': 'float64', 'counts': 'int64', 'flags': 'bool', 'iso': 'datetime64[ns]',
+        'dayfirst': 'datetime64[ns]', 'objects': 'int64'}
+    assert inferred['numbers'][1]['kind'] == 'numeric'
+    assert 0.95 < inferred['numbers'][1]['parsed'] < 1
+    assert inferred['dayfirst'][1]['format'] == '%d/%m/%Y'
+    assert pd.to_datetime(sample['dayfirst'], format='%d/%m/%Y').is_monotonic_increasing
+    for target, detail in inferred.values():
+        assert 0 < detail['saved_bytes'] < detail['bytes']
+        assert detail['sample_rows'] == len(sample)
+        assert detail['value_bytes'] < detail['object_bytes']
+    assert infer_types(sample) == infer_types(sample)
+    assert infer_types(sample, n_rows=20000)[0][2]['bytes'] == pytest.approx(10 * inferred['numbers'][1]['bytes'], 1e-6)
+
+def test_probe_stops_early():
+    values = pd.Series(['a'] * 300 + ['1'] * 100000, dtype=object)
+    assert infer_column(values) is None
+    assert infer_column(values, probe_rows=100000)[0] == 'numeric'
+    assert infer_column(values, threshold=0.99, probe_rows=100000)[0] == 'numeric'
+    assert infer_column(pd.Series([None, None], dtype=object)) is None
+
+def test_head_rows():
+    read = []
+    def chunks():
+        for start in range(0, 1000, 100):
+            read.append(start)
+            yield pd.DataFrame({'a': range(start, start + 100)})
+    rows = head_rows(chunks(), 250)
+    assert rows['a'].tolist() == list(range(250))
+    assert read == [0, 100, 200]
+    assert head_rows(iter([])) is None
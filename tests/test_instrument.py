@@ -0,0 +1,82 @@
+import pandas as pd
+import numpy as np
+import pytest
+from prossa.analyzer import DatasetAnalyzer
+from prossa.instrument import Instrumentation
+from prossa.streaming import ChunkedDatasetAnalyzer
+
+@pytest.fixture
+def sample_dataset():
+    return pd.DataFrame({
+        'A': [1, 2, np.nan, 4, 5],
+        'B': ['x', 'y', 'z', 'x', 'y'],
+        'C': [1.1, 2.2, 3.3, 4.4, 5.5],
+        'D': [10, 20, 30, 40, 50],
+        'E': ['a', 'a', 'a', 'a', 'a']
+    })
+
+CHECKS = ['check_missing_values', 'check_outliers', 'check_data_types', 'check_scaling_encoding',
+          'check_categorical_data', 'check_constant_columns', 'check_imputation', 'check_correlations']
+
+def test_disabled_by_default(sample_dataset):
+    analyzer = DatasetAnalyzer(sample_dataset)
+    analyzer.analyze()
+    assert analyzer.instrumentation is None
+    assert analyzer.timings() == []
+
+def test_records_profile_and_checks(sample_dataset):
+    analyzer = DatasetAnalyzer(sample_dataset, instrument=True)
+    analyzer.analyze()
+    stages = {record['name']: record for record in analyzer.timings()}
+    assert list(stages) == ['profile'] + CHECKS
+    assert stages['profile']['rows'] == 5
+    assert stages['profile']['columns'] == 5
+    assert set(stages['profile']['per_column']) == set('ABCDE')
+    assert stages['profile']['per_column']['A']['rows'] == 5
+    assert stages['check_outliers']['columns'] == 3
+    assert stages['check_categorical_data']['columns'] == 2
+    assert all(record['wall_seconds'] >= 0 and record['peak_bytes'] is None for record in stages.values())
+
+def test_hooks_and_memory(sample_dataset):
+    seen = []
+    instrument = Instrumentation(trace_memory=True, hooks=[seen.append])
+    DatasetAnalyzer(sample_dataset, instrument=instrument).analyze()
+    assert [metrics.name for metrics in seen] == ['profile'] + CHECKS
+    assert all(metrics.peak_bytes >= 0 for metrics in seen)
+    assert 'check_outliers' in instrument.summary()
+
+def test_chunked_per_column_accumulates(sample_dataset):
+    chunks = lambda: (sample_dataset.iloc[start:start + 2] for start in range(0, 5, 2))
+    analyzer = ChunkedDatasetAnalyzer(chunks, instrument=True)
+    analyzer.analyze()
+    profile = analyzer.instrumentation.stages[0]
+    assert profile.name == 'profile'
+    assert profile.per_column['C']['rows'] == 5
+
+def test_update_is_measured(sample_dataset):
+    analyzer = DatasetAnalyzer(None, instrument=True)
+    analyzer.update(sample_dataset)
+    stages = analyzer.instrumentation.stages
+    assert stages[0].name == 'update'
+    assert stages[0].rows == 5
+    assert set(stages[0].per_column) == set('ABCDE')
+
+def test_nested_stage_keeps_outer_peak():
+    instrument = Instrumentation(trace_memory=True)
+    with instrument.stage('outer') as outer:
+        block = np.ones(2 ** 20)
+        del block
+        with instrument.stage('inner') as inner:
+            assert instrument.current is inner
+        assert instrument.current is outer
+    assert instrument.current is None
+    assert inner.peak_bytes < 2 ** 20 <= 8 * 2 ** 20 <= outer.peak_bytes
+
+def test_check_loops_are_broken_out_per_column(sample_dataset):
+    analyzer = DatasetAnalyzer(sample_dataset, instrument=True)
+    analyzer.analyze()
+    stages = {record['name']: record for record in analyzer.timings()}
+    assert set(stages['check_data_types']['per_column']) == set('ABCDE')
+    # Object columns are examined twice: for downcasting and for type inference
+    assert stages['check_data_types']['per_column']['A']['rows'] == 5
+    assert stages['check_data_types']['per_column']['B']['rows'] == 10
@@ -0,0 +1,89 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+import prossa
+from prossa.__main__ import main
+
+SRC = str(Path(__file__).resolve().parent.parent / 'src')
+
+def loaded_modules(code):
+    env = dict(os.environ, PYTHONPATH=SRC)
+    result = subprocess.run([sys.executable, '-c', f"{code}\nimport sys; print(' '.join(sys.modules))"],
+                            capture_output=True, text=True, env=env, check=True)
+    return set(result.stdout.split())
+
+def test_import_is_lazy():
+    modules = loaded_modules('import prossa')
+    assert 'pandas' not in modules and 'prossa.analyzer' not in modules
+
+def test_help_does_not_import_pandas():
+    modules = loaded_modules("from prossa.__main__ import main\ntry:\n    main(['--help'])\nexcept SystemExit:\n    pass")
+    assert 'pandas' not in modules
+
+def test_lazy_exports():
+    from prossa.analyzer import DatasetAnalyzer
+    assert prossa.DatasetAnalyzer is DatasetAnalyzer
+    assert set(prossa.__all__) <= set(dir(prossa))
+    with pytest.raises(AttributeError):
+        prossa.missing_name
+
+def test_small_file(tmp_path, capsys):
+    path = tmp_path / 'small.csv'
+    path.write_text('a,b\n1,x\n2,y\n,x\n')
+    main([str(path)])
+    assert 'MISSING VALUES' in capsys.readouterr().out.upper()
+
+def test_snapshot_and_compare(tmp_path, capsys):
+    old, new = tmp_path / 'old.csv', tmp_path / 'new.csv'
+    old.write_text('a,b\n' + ''.join(f"{i},x\n" for i in range(200)))
+    new.write_text('a,b\n' + ''.join(f"{i % 10},\n" for i in range(200)))
+    main([str(old), '--snapshot', str(tmp_path / 'old.json')])
+    capsys.readouterr()
+    main(['compare', str(tmp_path / 'old.json'), str(new), '--output', str(tmp_path / 'drift.json')])
+    out = capsys.readouterr().out
+    assert 'DRIFT' in out and "Column 'b' null rate changed from 0.00% to 100.00%." in out
+    assert (tmp_path / 'drift.json').exists()
+
+def test_compare_with_zero_thresholds(tmp_path, capsys):
+    old, new = tmp_path / 'old.csv', tmp_path / 'new.csv'
+    old.write_text('a\n' + ''.join(f"{i}\n" for i in range(200)))
+    new.write_text('a\n' + ''.join(f"{i + 3}\n" for i in range(200)))
+    main(['compare', str(old), str(new)])
+    assert 'distribution shifted' not in capsys.readouterr().out
+    main(['compare', str(old), str(new), '--psi-threshold', '0', '--ks-threshold', '0'])
+    out = capsys.readouterr().out
+    assert 'population stability index' in out and 'Kolmogorov-Smirnov' in out
+
+def test_selected_checks(tmp_path, capsys):
+    path = tmp_path / 'small.csv'
+    path.write_text('a,b\n1,x\n2,y\n,x\n')
+    main([str(path), '--checks', 'missing_values,constant_columns'])
+    out = capsys.readouterr().out.upper()
+    assert 'MISSING VALUES' in out and 'CONSTANT COLUMNS' in out and 'OUTLIERS' not in out
+
+@pytest.mark.parametrize('arguments, message', [
+    (['--sample', '10', '--engine', 'polars'], '--sample cannot be combined with --engine'),
+    (['--stratify', 'b'], '--stratify needs --sample'),
+    (['--cache', 'cache', '--chunksize', '10'], '--cache cannot be combined with --chunksize'),
+    (['--cache', 'cache', '--sample', '10'], '--cache cannot be combined with --sample'),
+    (['--chunksize', '10', '--engine', 'polars'], '--chunksize cannot be combined with --engine'),
+    (['--jobs', '2', '--engine', 'duckdb'], '--jobs cannot be combined with --engine'),
+    (['--backend', 'process', '--engine', 'duckdb'], '--backend cannot be combined with --engine'),
+    (['--partitions'], '--partitions needs a directory or glob pattern'),
+])
+def test_rejects_ignored_options(tmp_path, capsys, arguments, message):
+    path = tmp_path / 'small.csv'
+    path.write_text('a,b\n1,x\n2,y\n,x\n')
+    with pytest.raises(SystemExit):
+        main([str(path)] + arguments)
+    assert message in capsys.readouterr().err
+
+@pytest.mark.parametrize('option', [['--sample', '10'], ['--cache', 'cache'], ['--chunksize', '10']])
+def test_rejects_sampling_and_cache_for_whole_file_modes(tmp_path, capsys, option):
+    (tmp_path / 'parts').mkdir()
+    for path in (tmp_path / 'parts', tmp_path / 'data.parquet'):
+        with pytest.raises(SystemExit):
+            main([str(path)] + option)
+        assert f"{option[0]} cannot be combined with a directory" in capsys.readouterr().err
@@ -0,0 +1,102 @@
+import pandas as pd
+import numpy as np
+import pytest
+from prossa.outliers import (ZScoreOutliers, IsolationOutliers, count_profiled_outliers, count_method_outliers,
+                             count_chunked_method_outliers, make_detector)
+from prossa.profile import DatasetProfile
+
+@pytest.fixture
+def numeric_dataset():
+    rng = np.random.default_rng(1)
+    n = 2000
+    return pd.DataFrame({
+        'A': np.r_[rng.normal(size=n - 3), [15, -20, 30]],
+        'B': np.where(rng.random(n) < 0.2, np.nan, rng.standard_cauchy(n)),
+        'C': pd.array(np.where(rng.random(n) < 0.1, None, rng.integers(0, 10, n)), dtype='Int64'),
+        'D': np.ones(n),
+    })
+
+def expected_counts(dataset):
+    counts = {}
+    for column in dataset:
+        values = dataset[column].dropna().astype(float)
+        counts[column] = int(np.sum(np.abs((values - values.mean()) / values.std(ddof=0)) > 3)) if values.std() > 0 else 0
+    return counts
+
+def test_moments_match_numpy(numeric_dataset):
+    detector = ZScoreOutliers(numeric_dataset.columns, block_size=300).update_moments(numeric_dataset)
+    values = numeric_dataset['B'].dropna()
+    assert detector.count[1] == len(values)
+    assert detector.mean[1] == pytest.approx(values.mean())
+    assert detector.std[1] == pytest.approx(values.std(ddof=0))
+
+def test_counts_match_reference(numeric_dataset):
+    detector = ZScoreOutliers(numeric_dataset.columns, block_size=300)
+    detector.update_moments(numeric_dataset).update_counts(numeric_dataset)
+    assert dict(zip(detector.names, detector.counts())) == expected_counts(numeric_dataset)
+
+def test_from_profiles(numeric_dataset):
+    profile = DatasetProfile.from_frame(numeric_dataset)
+    detector = ZScoreOutliers.from_profiles(list(profile)).update_counts(numeric_dataset)
+    assert dict(zip(detector.names, detector.counts())) == expected_counts(numeric_dataset)
+
+def test_two_pass_over_chunks(numeric_dataset):
+    chunks = lambda: (numeric_dataset.iloc[start:start + 450] for start in range(0, len(numeric_dataset), 450))
+    profile = DatasetProfile.from_chunks(chunks())
+    counts = np.sum([count_profiled_outliers(chunk, list(profile)) for chunk in chunks()], axis=0)
+    assert dict(zip(numeric_dataset.columns, counts.tolist())) == expected_counts(numeric_dataset)
+
+@pytest.mark.parametrize('n_jobs', [1, 2])
+def test_profiled_counts_match_reference(numeric_dataset, n_jobs):
+    profile = DatasetProfile.from_frame(numeric_dataset)
+    counts = count_profiled_outliers(numeric_dataset, list(profile), n_jobs=n_jobs)
+    assert dict(zip(numeric_dataset.columns, counts)) == expected_counts(numeric_dataset)
+
+def _reference(values, method):
+    values = values.dropna().astype(float)
+    if method == 'iqr':
+        q1, q3 = values.quantile([0.25, 0.75])
+        return int(((values < q1 - 1.5 * (q3 - q1)) | (values > q3 + 1.5 * (q3 - q1))).sum())
+    median = values.median()
+    mad = (values - median).abs().median()
+    return int((0.6745 * (values - median).abs() / mad > 3.5).sum()) if mad > 0 else 0
+
+@pytest.mark.parametrize('method', ['iqr', 'mad'])
+def test_fence_methods_match_reference(numeric_dataset, method):
+    counts = count_method_outliers(numeric_dataset, list(numeric_dataset), method)
+    assert counts == [_reference(numeric_dataset[column], method) for column in numeric_dataset]
+
+@pytest.mark.parametrize('method', ['iqr', 'mad'])
+def test_fence_sketches_approximate_exact(numeric_dataset, method):
+    exact = count_method_outliers(numeric_dataset, list(numeric_dataset), method)
+    chunks = lambda: (numeric_dataset.iloc[start:start + 150] for start in range(0, len(numeric_dataset), 150))
+    sketched = count_chunked_method_outliers(chunks, list(numeric_dataset), method)
+    assert list(sketched) == list(numeric_dataset)
+    for column, count in zip(numeric_dataset, exact):
+        assert sketched[column] == pytest.approx(count, rel=0.2, abs=3)
+
+def test_isolation_flags_extremes(numeric_dataset):
+    detector = IsolationOutliers(['A', 'D'], random_state=0).update(numeric_dataset).fit()
+    counts = detector.update_counts(numeric_dataset).counts()
+    assert 3 <= counts[0] <= 40
+    assert counts[1] == 0
+    extremes = IsolationOutliers(['A'], random_state=0).update(numeric_dataset).fit()
+    assert extremes.update_counts(numeric_dataset.iloc[-3:]).counts() == [3]
+    bounds, flagged = extremes.tables
+    assert bounds.shape == (1, flagged.shape[1] - 1) and (flagged[0, 1:] != flagged[0, :-1]).all()
+
+def test_isolation_without_varying_columns(numeric_dataset):
+    assert IsolationOutliers([]).update(numeric_dataset[[]]).fit().update_counts(numeric_dataset[[]]).counts() == []
+    empty = pd.DataFrame({'A': np.full(10, np.nan), 'D': np.ones(10)})
+    assert IsolationOutliers(['A', 'D']).update(empty).fit().update_counts(empty).counts() == [0, 0]
+
+def test_isolation_merge_keeps_uniform_reservoir(numeric_dataset):
+    first = IsolationOutliers(['A'], reservoir_size=100, random_state=1).update(numeric_dataset.iloc[:1000])
+    second = IsolationOutliers(['A'], reservoir_size=100, random_state=2).update(numeric_dataset.iloc[1000:])
+    first.merge(second)
+    assert first.sample.shape == (100, 1)
+    assert np.isin(first.sample[:, 0], numeric_dataset['A'].to_numpy()).all()
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        make_detector('dbscan', ['A'])
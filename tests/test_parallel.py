@@ -0,0 +1,42 @@
+import pandas as pd
+import numpy as np
+import pytest
+from prossa.analyzer import DatasetAnalyzer
+from prossa.parallel import effective_n_jobs, map_columns
+
+@pytest.fixture
+def wide_dataset():
+    rng = np.random.default_rng(3)
+    n = 500
+    columns = {}
+    for i in range(12):
+        columns[f'num{i}'] = np.where(rng.random(n) < 0.05, np.nan, rng.standard_cauchy(n))
+        columns[f'cat{i}'] = rng.choice(list('abcdefghijklm'[:i + 1]), n)
+    columns['when'] = pd.date_range('2024-01-01', periods=n)
+    columns['const'] = np.zeros(n)
+    return pd.DataFrame(columns)
+
+def _names(columns, items, suffix=''):
+    return [f"{series.name}{suffix}" for series in columns]
+
+def test_effective_n_jobs():
+    assert effective_n_jobs(None) == 1
+    assert effective_n_jobs(4) == 4
+    assert effective_n_jobs(-1) >= 1
+
+@pytest.mark.parametrize('backend', ['thread', 'process'])
+def test_map_columns_keeps_column_order(wide_dataset, backend):
+    result = map_columns(_names, wide_dataset, range(wide_dataset.shape[1]), n_jobs=3, backend=backend, suffix='!')
+    assert result == [f"{name}!" for name in wide_dataset.columns]
+
+def test_map_columns_rejects_unknown_backend(wide_dataset):
+    with pytest.raises(ValueError):
+        map_columns(_names, wide_dataset, [0], n_jobs=2, backend='gpu')
+
+@pytest.mark.parametrize('backend', ['thread', 'process'])
+def test_parallel_analysis_matches_serial(wide_dataset, backend):
+    expected = DatasetAnalyzer(wide_dataset)
+    expected.analyze()
+    analyzer = DatasetAnalyzer(wide_dataset, n_jobs=4, backend=backend)
+    analyzer.analyze()
+    assert analyzer.recommendations == expected.recommendations
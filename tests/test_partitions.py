@@ -0,0 +1,71 @@
+import pandas as pd
+import numpy as np
+import pytest
+from prossa.analyzer import DatasetAnalyzer
+from prossa.parallel import map_items
+from prossa.partitions import PartitionedDatasetAnalyzer, expand_paths, is_partitioned
+from prossa.streaming import ChunkedDatasetAnalyzer
+
+@pytest.fixture
+def dataset():
+    rng = np.random.default_rng(1)
+    values = rng.normal(size=900)
+    values[::97] = 40
+    return pd.DataFrame({
+        'A': np.where(np.arange(900) % 11 == 0, np.nan, values),
+        'B': rng.choice(['x', 'y', 'z', 'w'], 900),
+        'C': np.arange(900),
+        'D': [7] * 900,
+    })
+
+@pytest.fixture
+def directory(dataset, tmp_path):
+    for index, start in enumerate(range(0, 900, 300)):
+        dataset.iloc[start:start + 300].to_csv(tmp_path / f"part-{index}.csv", index=False)
+    (tmp_path / '_SUCCESS').write_text('')
+    return tmp_path
+
+def _square(value, offset=0):
+    return value * value + offset
+
+@pytest.mark.parametrize('backend', ['thread', 'process'])
+def test_map_items_keeps_order(backend):
+    assert map_items(_square, range(6), n_jobs=3, backend=backend, offset=1) == [1, 2, 5, 10, 17, 26]
+
+def test_expand_paths(directory):
+    assert [path.rsplit('/', 1)[1] for path in expand_paths(str(directory))] == ['part-0.csv', 'part-1.csv', 'part-2.csv']
+    assert len(expand_paths(str(directory / 'part-[01].csv'))) == 2
+    assert is_partitioned(str(directory)) and not is_partitioned(str(directory / 'part-0.csv'))
+    with pytest.raises(FileNotFoundError):
+        expand_paths(str(directory / '*.parquet'))
+
+@pytest.mark.parametrize('n_jobs', [1, 2])
+def test_matches_chunked_analysis(dataset, directory, n_jobs):
+    chunks = lambda: (dataset.iloc[start:start + 300].reset_index(drop=True) for start in range(0, 900, 300))
+    expected = ChunkedDatasetAnalyzer(chunks)
+    expected.analyze()
+    analyzer = PartitionedDatasetAnalyzer(str(directory), n_jobs=n_jobs)
+    analyzer.analyze()
+    assert analyzer.to_records() == expected.to_records()
+
+def test_partition_breakdown(dataset, directory):
+    frame = dataset.iloc[300:600].copy()
+    frame['C'] = 'broken'
+    frame.to_csv(directory / 'part-1.csv', index=False)
+    analyzer = DatasetAnalyzer.from_file(str(directory))
+    analyzer.analyze()
+    records = pd.DataFrame(analyzer.partition_records())
+    assert len(records) == 3 * 4
+    assert records[records['dtype_mismatch']][['partition', 'column']].values.tolist() == [
+        [str(directory / 'part-1.csv'), 'C']]
+    assert records.groupby('column')['null_count'].sum()['A'] == dataset['A'].isna().sum()
+    assert records.groupby('column')['outliers'].sum()['A'] == analyzer.findings['Outliers'][0].value
+
+def test_mismatched_columns(dataset, directory):
+    dataset.iloc[:10, :2].to_csv(directory / 'part-3.csv', index=False)
+    with pytest.raises(ValueError, match='part-3.csv'):
+        PartitionedDatasetAnalyzer(str(directory)).analyze()
+
+def test_requires_distinct_error(directory):
+    with pytest.raises(ValueError, match='distinct_error'):
+        PartitionedDatasetAnalyzer(str(directory), distinct_error=None)
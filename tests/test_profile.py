@@ -0,0 +1,56 @@
+import pandas as pd
+import numpy as np
+import pytest
+from prossa.profile import DatasetProfile, NUMERIC, CATEGORICAL, OTHER, first_and_varies
+
+@pytest.fixture
+def sample_dataset():
+    return pd.DataFrame({
+        'A': [1, 2, np.nan, 4, 5],
+        'B': ['x', 'y', 'z', 'x', 'y'],
+        'C': [1.1, 2.2, 3.3, 4.4, 5.5],
+        'D': [10, 20, 30, 40, 50],
+        'E': ['a', 'a', 'a', 'a', 'a']
+    })
+
+def test_from_frame_kinds(sample_dataset):
+    profile = DatasetProfile.from_frame(sample_dataset)
+    assert profile.n_rows == 5
+    assert [column.name for column in profile.of_kind(NUMERIC)] == ['A', 'C', 'D']
+    assert [column.name for column in profile.of_kind(CATEGORICAL)] == ['B', 'E']
+
+def test_from_frame_statistics(sample_dataset):
+    profile = DatasetProfile.from_frame(sample_dataset)
+    column = profile['A']
+    assert column.null_count == 1
+    assert column.count == 4
+    assert column.min == 1 and column.max == 5
+    assert column.mean == pytest.approx(3.0)
+    assert column.std == pytest.approx(np.std([1, 2, 4, 5]))
+    assert profile['B'].distinct == 3
+    assert profile.null_count == 1
+
+def test_is_constant():
+    dataset = pd.DataFrame({
+        'num': [7.0, 7.0, np.nan],
+        'empty': [np.nan, np.nan, np.nan],
+        'flag': [True, True, True],
+        'varied': [1, 2, 3],
+    })
+    profile = DatasetProfile.from_frame(dataset)
+    assert profile['flag'].kind == OTHER
+    assert [column.name for column in profile if column.is_constant] == ['num', 'empty', 'flag']
+
+def test_constancy_without_distinct_counts():
+    dataset = pd.DataFrame({'city': ['x', 'y'] * 50, 'code': ['z'] * 100})
+    profile = DatasetProfile.skeleton(dataset)
+    profile.compute(dataset, list(profile), ['constancy'])
+    assert [(column.varies, column.distinct) for column in profile] == [(True, None), (False, None)]
+    profile.compute(dataset, list(profile), ['distinct'])
+    assert [column.distinct for column in profile] == [2, 1]
+
+def test_first_and_varies_stops_early():
+    values = pd.Series(['a', 'b'] + [None] * 10)
+    assert first_and_varies(values, block_size=2) == ('a', True)
+    assert first_and_varies(pd.Series([None, 'z', None, 'z', 'z']), block_size=1) == ('z', False)
+    assert first_and_varies(pd.Series([None, None], dtype=object)) == (None, False)
@@ -0,0 +1,56 @@
+import pandas as pd
+import numpy as np
+import pytest
+from prossa.analyzer import DatasetAnalyzer
+from prossa.sampling import sample_frame, sample_chunks, proportion_interval
+
+@pytest.fixture
+def large_dataset():
+    rng = np.random.default_rng(2)
+    n = 20000
+    return pd.DataFrame({
+        'A': np.where(rng.random(n) < 0.25, np.nan, rng.normal(size=n)),
+        'G': rng.choice(['a', 'b', 'c'], n, p=[0.7, 0.2, 0.1]),
+    })
+
+def chunks_of(dataset, size):
+    return (dataset.iloc[start:start + size] for start in range(0, len(dataset), size))
+
+def test_sample_frame_uniform(large_dataset):
+    sample = sample_frame(large_dataset, 500, random_state=0)
+    assert len(sample) == 500
+    assert sample.index.is_monotonic_increasing
+    assert sample_frame(large_dataset, len(large_dataset) + 1) is large_dataset
+
+def test_sample_frame_stratified(large_dataset):
+    sample = sample_frame(large_dataset, 1000, stratify='G', random_state=0)
+    expected = large_dataset['G'].value_counts(normalize=True) * 1000
+    assert len(sample) == 1000
+    assert (sample['G'].value_counts() - expected).abs().max() <= 1
+
+def test_sample_chunks(large_dataset):
+    sample, n_rows = sample_chunks(chunks_of(large_dataset, 3000), 800, random_state=0)
+    assert n_rows == len(large_dataset)
+    assert len(sample) == 800
+    assert sample['A'].isna().mean() == pytest.approx(large_dataset['A'].isna().mean(), abs=0.06)
+
+def test_sample_chunks_stratified(large_dataset):
+    sample, _ = sample_chunks(chunks_of(large_dataset, 3000), 1000, stratify='G', random_state=0)
+    expected = large_dataset['G'].value_counts(normalize=True) * 1000
+    assert len(sample) == 1000
+    assert (sample['G'].value_counts() - expected).abs().max() <= 1
+
+def test_proportion_interval():
+    low, high = proportion_interval(25, 100)
+    assert low < 0.25 < high
+    narrow_low, narrow_high = proportion_interval(25, 100, population_size=120)
+    assert high - low > narrow_high - narrow_low
+    assert proportion_interval(0, 100)[0] == 0.0
+
+def test_sampled_analyzer_reports_intervals(large_dataset):
+    analyzer = DatasetAnalyzer(large_dataset, sample_size=2000, random_state=0)
+    analyzer.analyze()
+    assert analyzer.population_rows == len(large_dataset)
+    assert len(analyzer.dataset) == 2000
+    line = next(rec for rec in analyzer.recommendations['Missing Values'] if rec.startswith("Column 'A'"))
+    assert "CI" in line and "missing values" in line
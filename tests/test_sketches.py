@@ -0,0 +1,76 @@
+import pandas as pd
+import numpy as np
+import pytest
+from prossa.sketches import HyperLogLog, KLLSketch, SpaceSaving, update_sketches
+
+def test_hyperloglog_small_counts_are_exact():
+    for n in [0, 1, 2, 10]:
+        assert HyperLogLog().update(pd.Series(np.arange(n))).count() == n
+
+def test_hyperloglog_error_bound():
+    sketch = HyperLogLog(12).update(pd.Series([f"id{i}" for i in range(100000)]))
+    assert sketch.estimate() == pytest.approx(100000, rel=4 * 1.04 / 64)
+
+def test_hyperloglog_merge():
+    left = HyperLogLog().update(pd.Series(np.arange(0, 30000)))
+    right = HyperLogLog().update(pd.Series(np.arange(20000, 50000)))
+    assert left.merge(right).estimate() == pytest.approx(50000, rel=0.03)
+    with pytest.raises(ValueError):
+        left.merge(HyperLogLog(10))
+
+def test_precision_for_error():
+    assert HyperLogLog.precision_for_error(0.01) == 14
+    assert HyperLogLog.precision_for_error(0.5) == 4
+    with pytest.raises(ValueError):
+        HyperLogLog.precision_for_error(0.0001)
+
+def test_kll_quantiles_and_merge():
+    rng = np.random.default_rng(5)
+    values = rng.lognormal(size=200000)
+    whole = KLLSketch(random_state=0)
+    for chunk in np.array_split(values, 13):
+        whole.update(chunk)
+    parts = [KLLSketch(random_state=seed).update(chunk) for seed, chunk in enumerate(np.array_split(values, 4))]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    median = np.median(values)
+    for sketch in (whole, merged):
+        assert sketch.count == len(values)
+        assert sum(len(level) for level in sketch.levels) < 1000
+        ranks = [np.mean(values <= q) for q in sketch.quantile([0.1, 0.25, 0.5, 0.75, 0.9])]
+        assert ranks == pytest.approx([0.1, 0.25, 0.5, 0.75, 0.9], abs=0.02)
+        assert sketch.mad(median) == pytest.approx(np.median(np.abs(values - median)), rel=0.05)
+    assert np.isnan(KLLSketch().update([np.nan]).quantile(0.5))
+
+def test_update_sketches_per_column():
+    rng = np.random.default_rng(6)
+    block = np.column_stack([rng.normal(size=100000), rng.lognormal(size=100000), np.full(100000, np.nan)])
+    block[rng.random(100000) < 0.3, 1] = np.nan
+    sketches = [KLLSketch(random_state=0) for _ in range(3)]
+    for rows in np.array_split(block, 7):
+        update_sketches(sketches, rows)
+    for sketch, values in zip(sketches[:2], block.T):
+        values = values[~np.isnan(values)]
+        assert sketch.count == len(values)
+        assert sum(len(level) for level in sketch.levels) < 1000
+        ranks = [np.mean(values <= q) for q in sketch.quantile([0.1, 0.5, 0.9])]
+        assert ranks == pytest.approx([0.1, 0.5, 0.9], abs=0.02)
+    assert sketches[2].count == 0
+
+def test_space_saving_bounds_and_merge():
+    rng = np.random.default_rng(0)
+    values = pd.Series(rng.zipf(1.3, 100000))
+    exact = values.value_counts()
+    chunked = SpaceSaving(100)
+    for start in range(0, len(values), 10000):
+        chunked.update(values.iloc[start:start + 10000])
+    parts = [SpaceSaving(100).update(values.iloc[start:start + 40000]) for start in (0, 40000, 80000)]
+    merged = parts[0].merge(parts[1]).merge(parts[2])
+    for summary in (chunked, merged):
+        assert summary.total == len(values) and not summary.is_exact
+        assert all(count - error <= exact[value] <= count for value, count, error in summary.top())
+        assert summary.floor <= len(values) / 100
+        assert [value for value, _, _ in summary.top(10)] == exact.index[:10].tolist()
+    small = SpaceSaving(10).update(pd.Series(['a', 'b', 'a']))
+    assert small.is_exact and small.top() == [('a', 2, 0), ('b', 1, 0)]
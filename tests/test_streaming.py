@@ -0,0 +1,97 @@
+import pandas as pd
+import numpy as np
+import pytest
+from prossa.analyzer import DatasetAnalyzer
+from prossa.streaming import ChunkedDatasetAnalyzer, analyze_csv, tail_csv
+
+@pytest.fixture
+def csv_path(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 1000
+    dataset = pd.DataFrame({
+        'A': np.where(rng.random(n) < 0.1, np.nan, rng.normal(size=n)),
+        'B': rng.choice(list('abcdefghijklmnop'), n),
+        'C': np.r_[rng.normal(size=n - 5), [50, 60, 70, 80, 90]],
+        'D': rng.integers(0, 100, n),
+        'E': ['a'] * n,
+    })
+    path = tmp_path / 'data.csv'
+    dataset.to_csv(path, index=False)
+    return path
+
+def test_chunked_matches_in_memory(csv_path):
+    expected = DatasetAnalyzer(pd.read_csv(csv_path), downcast=False)
+    expected.analyze()
+    analyzer = ChunkedDatasetAnalyzer(lambda: pd.read_csv(csv_path, chunksize=128))
+    analyzer.analyze()
+    assert list(analyzer.recommendations) == list(expected.recommendations)
+    for category in ['Missing Values', 'Outliers', 'Data Types', 'Constant Columns', 'Imputation']:
+        assert analyzer.recommendations[category] == expected.recommendations[category]
+    assert "Column 'B' has 16 unique categories." in analyzer.recommendations['Categorical Data']
+
+def test_chunked_merges_moments(csv_path):
+    dataset = pd.read_csv(csv_path)
+    analyzer = ChunkedDatasetAnalyzer(lambda: pd.read_csv(csv_path, chunksize=100))
+    column = analyzer.profile['A']
+    assert analyzer.profile.n_rows == len(dataset)
+    assert column.null_count == dataset['A'].isna().sum()
+    assert column.mean == pytest.approx(dataset['A'].mean())
+    assert column.std == pytest.approx(dataset['A'].std(ddof=0))
+    assert column.min == dataset['A'].min()
+
+def test_chunk_dtype_mismatch():
+    chunks = [
+        pd.DataFrame({'x': [np.nan, np.nan], 'y': [1, 2]}),
+        pd.DataFrame({'x': ['u', 'v'], 'y': [3.5, np.nan]}),
+    ]
+    analyzer = ChunkedDatasetAnalyzer(lambda: iter(chunks))
+    assert analyzer.profile['x'].dtype == np.dtype('O')
+    assert analyzer.profile['x'].distinct == 2
+    assert analyzer.profile['y'].dtype == np.dtype('float64')
+    assert analyzer.profile['y'].null_count == 1
+
+def test_requires_distinct_error():
+    with pytest.raises(ValueError, match='distinct_error'):
+        ChunkedDatasetAnalyzer(lambda: iter([]), distinct_error=None)
+
+def test_analyze_csv(csv_path, capsys):
+    analyze_csv(csv_path, chunksize=256)
+    captured = capsys.readouterr()
+    assert "OUTLIERS:" in captured.out
+    assert "CONSTANT COLUMNS:" in captured.out
+
+def test_update_matches_full_statistics(csv_path):
+    dataset = pd.read_csv(csv_path)
+    analyzer = DatasetAnalyzer(dataset.iloc[:300])
+    analyzer.analyze()
+    for start in range(300, len(dataset), 250):
+        analyzer.update(dataset.iloc[start:start + 250])
+    expected = DatasetAnalyzer(dataset, downcast=False)
+    expected.analyze()
+    assert analyzer.dataset is None
+    assert analyzer.profile.n_rows == len(dataset)
+    assert analyzer.profile['A'].mean == pytest.approx(expected.profile['A'].mean)
+    for category in ['Missing Values', 'Data Types', 'Constant Columns', 'Imputation']:
+        assert analyzer.recommendations[category] == expected.recommendations[category]
+    assert "Column 'B' has 16 unique categories." in analyzer.recommendations['Categorical Data']
+    assert any("Column 'C'" in rec for rec in analyzer.recommendations['Outliers'])
+
+def test_update_from_empty_analyzer():
+    analyzer = DatasetAnalyzer(None)
+    analyzer.update(pd.DataFrame({'x': ['a', 'a'], 'y': [1.0, np.nan]}))
+    assert analyzer.recommendations['Constant Columns'][1:-1] == ['x', 'y']
+    analyzer.update(pd.DataFrame({'x': ['b', 'a'], 'y': [1.0, 2.0]}))
+    assert analyzer.recommendations['Constant Columns'] == ["No constant columns found in the dataset."]
+    assert analyzer.profile['y'].null_count == 1
+
+def test_tail_csv(tmp_path):
+    path = tmp_path / 'growing.csv'
+    path.write_text("a,b\n1,x\n2,y\n3,")
+    batches = tail_csv(path, poll_interval=0.01, idle_timeout=0.05)
+    first = next(batches)
+    assert list(first['a']) == [1, 2]
+    with open(path, 'a') as file:
+        file.write("z\n4,w\n")
+    second = next(batches)
+    assert list(second['a']) == [3, 4] and list(second['b']) == ['z', 'w']
+    assert list(batches) == []